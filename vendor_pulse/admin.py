@@ -4,6 +4,9 @@ from .models import (
     Vendor,
     PurchaseOrder,
     HistoricalPerformance,
+    HistoricalPerformanceRollup,
+    VendorPerformanceCounter,
+    VendorMetricsJob,
 )
 
 
@@ -44,3 +47,37 @@ class HistoricalPerformanceAdmin(admin.ModelAdmin):
         "average_response_time",
         "fulfillment_rate"
     )
+
+
+@admin.register(HistoricalPerformanceRollup)
+class HistoricalPerformanceRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "vendor",
+        "resolution",
+        "period_start",
+        "last_date",
+        "count"
+    )
+    list_filter = ("resolution", )
+
+
+@admin.register(VendorPerformanceCounter)
+class VendorPerformanceCounterAdmin(admin.ModelAdmin):
+    list_display = (
+        "vendor",
+        "total_count",
+        "completed_count",
+        "on_time_count",
+        "quality_rating_count",
+        "response_time_count"
+    )
+
+
+@admin.register(VendorMetricsJob)
+class VendorMetricsJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "vendor",
+        "created_at",
+        "marked_at",
+        "mark_count"
+    )
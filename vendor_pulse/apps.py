@@ -6,4 +6,4 @@ class VendorPulseConfig(AppConfig):
     name = "vendor_pulse"
 
     def ready(self):
-        from . import signals # noqa
\ No newline at end of file
+        from . import signals, instrumentation # noqa
\ No newline at end of file
@@ -0,0 +1,261 @@
+from asgiref.sync import sync_to_async
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.utils import timezone
+from django.views import View
+
+from rest_framework.exceptions import (
+    AuthenticationFailed,
+    NotAuthenticated,
+    ValidationError,
+)
+from rest_framework.fields import DateTimeField
+from rest_framework.generics import get_object_or_404
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from .authentication import CustomTokenAuthentication
+from .cache import get_response_cache, VENDOR, PURCHASE_ORDER, PERFORMANCE
+from .conf import get_setting
+from .fast_serializers import FastJSONRenderer, get_field_plan
+from .filters import VendorFilterBackend, PurchaseOrderFilterBackend
+from .models import Vendor, PurchaseOrder
+from .pagination import IdCursorPagination
+from .serializers import (
+    VendorSerializer,
+    PurchaseOrderSerializer,
+    VendorPerformanceSerializer,
+)
+from .views import (
+    get_cache_dependencies,
+    get_cache_headers,
+    get_cache_pk,
+    get_conditional_cached_response,
+    get_performance_etag,
+    read_from_replica,
+)
+
+
+class AsyncAPIView(View):
+    '''
+        Base of the native async read views served under ASGI. Requests are
+        authenticated with the bearer token, query parameters are read
+        through a DRF request, errors are handled by the DRF exception
+        handler and responses are rendered with FastJSONRenderer, without
+        leaving the event loop.
+    '''
+    authentication_class = CustomTokenAuthentication
+    renderer_class = FastJSONRenderer
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.request = Request(request, authenticators=())
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            credentials = await self.authentication_class().aauthenticate(
+                request
+            )
+            if credentials is None:
+                raise NotAuthenticated()
+            self.request.user, self.request.auth = credentials
+            return await super().dispatch(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            exc.auth_header = self.authentication_class().authenticate_header(
+                self.request
+            )
+
+        response = exception_handler(exc, {"view": self})
+        if response is None:
+            raise exc
+
+        headers = {
+            header: value for header, value in response.items()
+            if header.lower() != "content-type"
+        }
+        return self.render(response.data, response.status_code, headers)
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(
+            self.renderer_class().render(data),
+            status=status,
+            headers=headers,
+            content_type=self.renderer_class.media_type,
+        )
+
+    def get_cached_response(self, entry, hit):
+        return get_conditional_cached_response(
+            self.request,
+            entry,
+            self.render(entry["data"], headers=get_cache_headers(entry, hit)),
+        )
+
+
+class AsyncReadView(AsyncAPIView):
+    '''
+        Reads `model` rows with `.values()` through the FieldPlan of
+        `serializer_class`, filtered by `filter_backends`.
+    '''
+    model = None
+    serializer_class = None
+    filter_backends = []
+
+    def get_plan(self, serializer_class=None):
+        return get_field_plan(
+            self.model, serializer_class or self.serializer_class
+        )
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def get_queryset(self):
+        return self.filter_queryset(self.model.objects.all())
+
+    async def get_row(self, plan, pk):
+        try:
+            row = await plan.values(
+                self.get_queryset().filter(pk=pk)
+            ).afirst()
+        except (TypeError, ValueError, DjangoValidationError):
+            row = None
+        if row is None:
+            raise Http404
+        return row
+
+
+class AsyncListView(AsyncReadView):
+    pagination_class = IdCursorPagination
+
+    async def get(self, request):
+        plan = self.get_plan()
+        rows = plan.values(self.get_queryset())
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(rows, self.request, self)
+        if page is None:
+            return self.render(plan.many([row async for row in rows]))
+        return self.render(paginator.get_paginated_data(plan.many(page)))
+
+
+class AsyncRetrieveView(AsyncReadView):
+    '''
+        Serves the row from the response cache under `cache_namespace`,
+        shared with the sync viewsets.
+    '''
+    cache_namespace = None
+    cache_dependencies = ()
+
+    async def get(self, request, pk):
+        plan = self.get_plan()
+        cache_pk = get_cache_pk(pk, self.request.query_params)
+        if cache_pk is None:
+            row = await self.get_row(plan, pk)
+            return self.render(plan.to_representation(row))
+
+        response_cache = get_response_cache()
+        entry = await response_cache.aget(self.cache_namespace, cache_pk)
+        if entry is not None:
+            return self.get_cached_response(entry, hit=True)
+
+        read_versions = await response_cache.aread_versions(
+            self.cache_namespace,
+            cache_pk,
+            [namespace for namespace, _ in self.cache_dependencies],
+        )
+        row = await self.get_row(plan, pk)
+        data = plan.to_representation(row)
+        entry = await response_cache.aset(
+            self.cache_namespace,
+            cache_pk,
+            data,
+            read_versions,
+            depends_on=get_cache_dependencies(self.cache_dependencies, data),
+            store=not read_from_replica(request),
+        )
+        return self.get_cached_response(entry, hit=False)
+
+
+class AsyncVendorListView(AsyncListView):
+    model = Vendor
+    serializer_class = VendorSerializer
+    filter_backends = [VendorFilterBackend]
+
+
+class AsyncVendorRetrieveView(AsyncRetrieveView):
+    model = Vendor
+    serializer_class = VendorSerializer
+    filter_backends = [VendorFilterBackend]
+    cache_namespace = VENDOR
+
+
+class AsyncVendorPerformanceView(AsyncReadView):
+    '''
+        Recalculating the metrics runs the sync write path in a thread.
+    '''
+    model = Vendor
+    serializer_class = VendorPerformanceSerializer
+    filter_backends = [VendorFilterBackend]
+
+    def recalculate_performance_metrics(self, pk):
+        with transaction.atomic():
+            vendor = get_object_or_404(self.get_queryset(), pk=pk)
+            vendor.recalculate_performance_metrics()
+
+    async def get(self, request, pk):
+        recalculate = self.request.query_params.get("recalculate", "0")
+        if recalculate not in ("0", "1"):
+            raise ValidationError({"recalculate": ["Must be 0 or 1."]})
+
+        response_cache = get_response_cache()
+        cache_pk = get_cache_pk(
+            pk, self.request.query_params, cache_query_params=["recalculate"]
+        )
+        if recalculate == "0" and cache_pk is not None:
+            entry = await response_cache.aget(PERFORMANCE, cache_pk)
+            if entry is not None:
+                return self.get_cached_response(entry, hit=True)
+
+        read_versions = (
+            await response_cache.aread_versions(PERFORMANCE, cache_pk)
+            if cache_pk is not None else None
+        )
+        if recalculate == "1":
+            await sync_to_async(self.recalculate_performance_metrics)(pk)
+
+        computed_at = timezone.now()
+        plan = self.get_plan()
+        row = await self.get_row(plan, pk)
+        performance = plan.to_representation(
+            row, computed_at=DateTimeField().to_representation(computed_at)
+        )
+        entry = await response_cache.aset(
+            PERFORMANCE,
+            row["id"],
+            performance,
+            read_versions,
+            timeout=get_setting("PERFORMANCE_CACHE_TIMEOUT"),
+            etag=get_performance_etag(performance),
+            store=cache_pk is not None and not read_from_replica(request),
+        )
+        return self.get_cached_response(entry, hit=False)
+
+
+class AsyncPurchaseOrderListView(AsyncListView):
+    model = PurchaseOrder
+    serializer_class = PurchaseOrderSerializer
+    filter_backends = [PurchaseOrderFilterBackend]
+
+
+class AsyncPurchaseOrderRetrieveView(AsyncRetrieveView):
+    model = PurchaseOrder
+    serializer_class = PurchaseOrderSerializer
+    filter_backends = [PurchaseOrderFilterBackend]
+    cache_namespace = PURCHASE_ORDER
+    cache_dependencies = ((VENDOR, "vendor"), )
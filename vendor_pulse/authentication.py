@@ -1,5 +1,27 @@
+from asgiref.sync import sync_to_async
+
+from django.db import DEFAULT_DB_ALIAS
+
 from rest_framework.authentication import TokenAuthentication
 
+from .cache import get_token_cache
+from .conf import get_setting
+
+
+def get_field_values(instance):
+    return tuple(
+        getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+    )
+
+
+def from_field_values(model, values):
+    return model.from_db(
+        DEFAULT_DB_ALIAS,
+        [field.attname for field in model._meta.concrete_fields],
+        values
+    )
+
 
 class CustomTokenAuthentication(TokenAuthentication):
     '''
@@ -8,3 +30,69 @@ class CustomTokenAuthentication(TokenAuthentication):
         ref: https://github.com/tfranzel/drf-spectacular/issues/205
     '''
     keyword = "Bearer"
+
+    def get_cached_credentials(self, key):
+        '''
+            Returns a new `(user, token)` pair built from the field values
+            cached for `key`, so requests never share, or change, the same
+            instances, or None.
+        '''
+        values = get_token_cache().get(key)
+        if values is None:
+            return None
+
+        user_values, token_values = values
+        model = self.get_model()
+        user = from_field_values(
+            model._meta.get_field("user").related_model, user_values
+        )
+        token = from_field_values(model, token_values)
+        token.user = user
+        return user, token
+
+    def cache_credentials(self, key, credentials):
+        user, token = credentials
+        get_token_cache().set(
+            key,
+            (get_field_values(user), get_field_values(token)),
+            get_setting("TOKEN_CACHE_TIMEOUT")
+        )
+
+    def authenticate_credentials(self, key):
+        '''
+            Looks the token up in the in-process token cache before querying
+            the database. Failed lookups are not cached.
+        '''
+        credentials = self.get_cached_credentials(key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            self.cache_credentials(key, credentials)
+        return credentials
+
+    async def aauthenticate(self, request):
+        '''
+            Async version of `authenticate` for native async views, which
+            take a Django request. The header is parsed by
+            `TokenAuthentication.authenticate`; only a token missing from
+            the token cache is looked up in a thread.
+        '''
+        key = TokenKeyParser().authenticate(request)
+        if key is None:
+            return None
+
+        credentials = self.get_cached_credentials(key)
+        if credentials is None:
+            credentials = await sync_to_async(self.authenticate_credentials)(
+                key
+            )
+        return credentials
+
+
+class TokenKeyParser(CustomTokenAuthentication):
+    '''
+        Parses and validates the Authorization header like
+        CustomTokenAuthentication, but returns the token key instead of
+        looking it up.
+    '''
+    def authenticate_credentials(self, key):
+        return key
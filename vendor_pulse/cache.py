@@ -0,0 +1,360 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .conf import get_setting
+
+VENDOR = "vendor"
+PURCHASE_ORDER = "purchase_order"
+PERFORMANCE = "performance"
+
+NAMESPACES = (VENDOR, PURCHASE_ORDER, PERFORMANCE)
+
+RESPONSE_CACHE_KEY = "vendor_pulse:{namespace}:{pk}"
+RESPONSE_CACHE_VERSION_KEY = "vendor_pulse:{namespace}:{pk}:version"
+RESPONSE_CACHE_NAMESPACE_VERSION_KEY = "vendor_pulse:{namespace}:version"
+
+
+class LocalMemoryBackend:
+    '''
+        Least recently used cache kept in the memory of the current process.
+        Entries are invalidated only in the process that saved the model, so
+        deployments running several processes should use DjangoCacheBackend
+        with a shared cache instead.
+    '''
+    def __init__(self, max_entries=None):
+        self.max_entries = (
+            max_entries or get_setting("RESPONSE_CACHE_MAX_ENTRIES")
+        )
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    async def aget(self, key):
+        return self.get(key)
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def aset(self, key, value, timeout):
+        self.set(key, value, timeout)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoCacheBackend:
+    '''
+        Stores entries in the Django cache named by the
+        `RESPONSE_CACHE_ALIAS` setting.
+    '''
+    def __init__(self, alias=None):
+        self.cache = caches[alias or get_setting("RESPONSE_CACHE_ALIAS")]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    async def aget(self, key):
+        return await self.cache.aget(key)
+
+    def set(self, key, value, timeout):
+        self.cache.set(key, value, timeout)
+
+    async def aset(self, key, value, timeout):
+        await self.cache.aset(key, value, timeout)
+
+    def delete_many(self, keys):
+        self.cache.delete_many(keys)
+
+    def clear(self):
+        self.cache.clear()
+
+
+def get_etag(data):
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return '"{}"'.format(hashlib.md5(content.encode()).hexdigest())
+
+
+class ResponseCache:
+    '''
+        Caches serialized responses by namespace and primary key, with the
+        ETag used for conditional requests, and counts hits and misses per
+        namespace.
+
+        An entry records the version of its object and of the objects it
+        depends on, e.g. a purchase order on its vendor. Invalidating an
+        object drops its version along with its own entry, so the entries
+        that depend on it are stale without having to be looked up.
+
+        A response is only stored if no write to what it depends on
+        committed while it was read: `read_versions` is called before the
+        read, and `set` skips the store if any of those versions changed.
+    '''
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = Counter()
+        self.misses = Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(namespace, pk):
+        return RESPONSE_CACHE_KEY.format(namespace=namespace, pk=pk)
+
+    @staticmethod
+    def get_version_key(namespace, pk):
+        return RESPONSE_CACHE_VERSION_KEY.format(namespace=namespace, pk=pk)
+
+    @staticmethod
+    def get_read_version_keys(namespace, pk, dependency_namespaces=()):
+        '''
+            The version keys of the object, and of every object in
+            `dependency_namespaces`, as the pk of a dependency is only known
+            once read.
+        '''
+        return [
+            RESPONSE_CACHE_VERSION_KEY.format(namespace=namespace, pk=pk),
+            *(
+                RESPONSE_CACHE_NAMESPACE_VERSION_KEY.format(
+                    namespace=dependency_namespace
+                )
+                for dependency_namespace in dependency_namespaces
+            ),
+        ]
+
+    def get_version(self, key):
+        version = self.backend.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            self.backend.set(
+                key, version, get_setting("RESPONSE_CACHE_TIMEOUT")
+            )
+        return version
+
+    async def aget_version(self, key):
+        version = await self.backend.aget(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            await self.backend.aset(
+                key, version, get_setting("RESPONSE_CACHE_TIMEOUT")
+            )
+        return version
+
+    def read_versions(self, namespace, pk, dependency_namespaces=()):
+        '''
+            Returns the versions to pass to `set`. Call it before reading
+            the response.
+        '''
+        return {
+            key: self.get_version(key)
+            for key in self.get_read_version_keys(
+                namespace, pk, dependency_namespaces
+            )
+        }
+
+    async def aread_versions(self, namespace, pk, dependency_namespaces=()):
+        return {
+            key: await self.aget_version(key)
+            for key in self.get_read_version_keys(
+                namespace, pk, dependency_namespaces
+            )
+        }
+
+    def count(self, namespace, entry):
+        with self._lock:
+            if entry is None:
+                self.misses[namespace] += 1
+            else:
+                self.hits[namespace] += 1
+        return entry
+
+    def get(self, namespace, pk):
+        entry = self.backend.get(self.get_key(namespace, pk))
+        if entry is not None and any(
+            self.backend.get(key) != version
+            for key, version in entry.get("versions", {}).items()
+        ):
+            entry = None
+        return self.count(namespace, entry)
+
+    async def aget(self, namespace, pk):
+        entry = await self.backend.aget(self.get_key(namespace, pk))
+        if entry is not None:
+            for key, version in entry.get("versions", {}).items():
+                if await self.backend.aget(key) != version:
+                    entry = None
+                    break
+        return self.count(namespace, entry)
+
+    @staticmethod
+    def build_entry(data, etag=None):
+        return {"data": data, "etag": etag or get_etag(data), "versions": {}}
+
+    def set(
+        self, namespace, pk, data, read_versions, timeout=None, etag=None,
+        depends_on=(), store=True
+    ):
+        '''
+            Caches `data`, read after `read_versions`, until it expires or is
+            invalidated along with any of the `(namespace, pk)` objects in
+            `depends_on`. The entry is only built, not stored, if a write
+            committed since `read_versions` or with `store` off, e.g. for
+            data read from a replica that may lag behind the primary.
+        '''
+        entry = self.build_entry(data, etag)
+        if not store:
+            return entry
+
+        versions = {}
+        for dependency in depends_on:
+            key = self.get_version_key(*dependency)
+            versions[key] = self.get_version(key)
+        if any(
+            self.backend.get(key) != version
+            for key, version in read_versions.items()
+        ):
+            return entry
+
+        key = self.get_version_key(namespace, pk)
+        entry["versions"] = {**versions, key: read_versions[key]}
+        self.backend.set(
+            self.get_key(namespace, pk),
+            entry,
+            timeout or get_setting("RESPONSE_CACHE_TIMEOUT")
+        )
+        return entry
+
+    async def aset(
+        self, namespace, pk, data, read_versions, timeout=None, etag=None,
+        depends_on=(), store=True
+    ):
+        entry = self.build_entry(data, etag)
+        if not store:
+            return entry
+
+        versions = {}
+        for dependency in depends_on:
+            key = self.get_version_key(*dependency)
+            versions[key] = await self.aget_version(key)
+        for key, version in read_versions.items():
+            if await self.backend.aget(key) != version:
+                return entry
+
+        key = self.get_version_key(namespace, pk)
+        entry["versions"] = {**versions, key: read_versions[key]}
+        await self.backend.aset(
+            self.get_key(namespace, pk),
+            entry,
+            timeout or get_setting("RESPONSE_CACHE_TIMEOUT")
+        )
+        return entry
+
+    def invalidate(self, namespace, *pks):
+        '''
+            Drops the entries of `pks` and of everything depending on them
+            once the current transaction commits, so a request reading in
+            the meantime cannot cache the data being replaced again.
+        '''
+        if not pks:
+            return
+
+        keys = [
+            RESPONSE_CACHE_NAMESPACE_VERSION_KEY.format(namespace=namespace)
+        ]
+        for pk in pks:
+            keys += [
+                self.get_key(namespace, pk),
+                self.get_version_key(namespace, pk),
+            ]
+        transaction.on_commit(lambda: self.backend.delete_many(keys))
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        stats = []
+        with self._lock:
+            for namespace in NAMESPACES:
+                hits = self.hits[namespace]
+                misses = self.misses[namespace]
+                stats.append({
+                    "namespace": namespace,
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": hits / (hits + misses) if hits else 0.0,
+                })
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+_response_cache = None
+_token_cache = None
+
+
+def get_response_cache():
+    global _response_cache
+    if _response_cache is None:
+        backend = import_string(get_setting("RESPONSE_CACHE_BACKEND"))
+        _response_cache = ResponseCache(backend())
+    return _response_cache
+
+
+def get_token_cache():
+    '''
+        Returns the in-process cache of authentication token key to the
+        field values of its `(user, token)`.
+    '''
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = LocalMemoryBackend(
+            get_setting("TOKEN_CACHE_MAX_ENTRIES")
+        )
+    return _token_cache
+
+
+@receiver(setting_changed)
+def reset_response_cache(setting, **kwargs):
+    global _response_cache, _token_cache
+    if setting == "VENDOR_PULSE":
+        _response_cache = None
+        _token_cache = None
+
+
+def invalidate_cached_performance(*vendor_ids):
+    get_response_cache().invalidate(PERFORMANCE, *vendor_ids)
@@ -0,0 +1,36 @@
+from django.conf import settings
+
+METRICS_MODE_SYNC = "sync"
+METRICS_MODE_DEFERRED = "deferred"
+
+DEFAULTS = {
+    "METRICS_MODE": METRICS_MODE_SYNC,
+    "METRICS_DEBOUNCE_SECONDS": 5,
+    "METRICS_MAX_DELAY_SECONDS": 60,
+    "BULK_BATCH_SIZE": 500,
+    "EXPORT_CHUNK_SIZE": 2000,
+    "FAST_READ_SERIALIZERS": False,
+    "PERFORMANCE_CACHE_TIMEOUT": 30,
+    "RESPONSE_CACHE_BACKEND": "vendor_pulse.cache.LocalMemoryBackend",
+    "RESPONSE_CACHE_ALIAS": "default",
+    "RESPONSE_CACHE_TIMEOUT": 300,
+    "RESPONSE_CACHE_MAX_ENTRIES": 10000,
+    "TOKEN_CACHE_TIMEOUT": 60,
+    "TOKEN_CACHE_MAX_ENTRIES": 1000,
+    "HISTORY_RAW_RETENTION_DAYS": 30,
+    "HISTORY_DAILY_RETENTION_DAYS": 180,
+    "SERVER_TIMING_HEADER": True,
+    "REQUEST_METRICS_DURATION_BUCKETS": (
+        .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10
+    ),
+    "REQUEST_METRICS_QUERY_BUCKETS": (1, 2, 5, 10, 20, 50, 100),
+    "HOT_PATH_PROFILING": False,
+}
+
+
+def get_setting(name):
+    '''
+        Reads a vendor_pulse setting from the `VENDOR_PULSE` dict in the
+        project settings, falling back to the defaults above.
+    '''
+    return getattr(settings, "VENDOR_PULSE", {}).get(name, DEFAULTS[name])
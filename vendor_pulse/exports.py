@@ -0,0 +1,185 @@
+import csv
+import datetime
+import heapq
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from rest_framework import serializers
+
+from .conf import get_setting
+from .models import Vendor
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+EXPORT_FORMATS = (CSV, NDJSON)
+
+CONTENT_TYPES = {
+    CSV: "text/csv",
+    NDJSON: "application/x-ndjson",
+}
+
+PURCHASE_ORDER_COLUMNS = {
+    "id": "id",
+    "po_number": "po_number",
+    "vendor": "vendor_id",
+    "vendor_code": "vendor__vendor_code",
+    "order_date": "order_date",
+    "delivery_date": "delivery_date",
+    "items": "items",
+    "quantity": "quantity",
+    "status": "status",
+    "quality_rating": "quality_rating",
+    "issue_date": "issue_date",
+    "acknowledgment_date": "acknowledgment_date",
+}
+
+HISTORICAL_PERFORMANCE_COLUMNS = {
+    "vendor": "vendor_id",
+    "vendor_code": "vendor__vendor_code",
+    "date": "date",
+    "on_time_delivery_rate": "on_time_delivery_rate",
+    "quality_rating_avg": "quality_rating_avg",
+    "average_response_time": "average_response_time",
+    "fulfillment_rate": "fulfillment_rate",
+}
+
+HISTORICAL_PERFORMANCE_ROLLUP_COLUMNS = {
+    "vendor": "vendor_id",
+    "vendor_code": "vendor__vendor_code",
+    "date": "period_start",
+    "resolution": "resolution",
+    "count": "count",
+    "metrics": "metrics",
+}
+
+PERFORMANCE_HISTORY_COLUMNS = (
+    *HISTORICAL_PERFORMANCE_COLUMNS, "resolution", "count"
+)
+
+RAW = "raw"
+
+datetime_field = serializers.DateTimeField()
+
+
+class Echo:
+    '''
+        File-like object handing what csv.writer writes straight back, so
+        rows can be streamed instead of buffered.
+    '''
+    def write(self, value):
+        return value
+
+
+def to_representation(value):
+    '''
+        Formats datetimes the way the API serializers do.
+    '''
+    if isinstance(value, datetime.datetime):
+        return datetime_field.to_representation(value)
+    return value
+
+
+def to_csv_value(value):
+    value = to_representation(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    return value
+
+
+def iter_csv(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([to_csv_value(value) for value in row])
+
+
+def iter_ndjson(columns, rows):
+    for row in rows:
+        yield json.dumps(
+            dict(zip(columns, map(to_representation, row))),
+            cls=DjangoJSONEncoder
+        ) + "\n"
+
+
+def iter_chunks(lines, chunk_size):
+    '''
+        Joins `lines` into chunks of up to `chunk_size` lines, so each write
+        to the client carries many rows.
+    '''
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def iter_performance_history(snapshots, rollups):
+    '''
+        Merges the raw `snapshots` and compacted `rollups`, both ordered by
+        vendor and date, into the rows of PERFORMANCE_HISTORY_COLUMNS. A
+        roll-up is dated by the start of its period and reports the average
+        of each metric over its `count` snapshots.
+    '''
+    chunk_size = get_setting("EXPORT_CHUNK_SIZE")
+    snapshot_rows = (
+        (*row, RAW, 1)
+        for row in snapshots.values_list(
+            *HISTORICAL_PERFORMANCE_COLUMNS.values()
+        ).iterator(chunk_size=chunk_size)
+    )
+    rollup_rows = (
+        (
+            vendor_id,
+            vendor_code,
+            period_start,
+            *(
+                rollup_metrics[metric]["avg"]
+                for metric in Vendor.PERFORMANCE_METRICS
+            ),
+            resolution,
+            count,
+        )
+        for vendor_id, vendor_code, period_start, resolution, count,
+        rollup_metrics in rollups.values_list(
+            *HISTORICAL_PERFORMANCE_ROLLUP_COLUMNS.values()
+        ).iterator(chunk_size=chunk_size)
+    )
+    return heapq.merge(
+        snapshot_rows, rollup_rows, key=lambda row: (row[0], row[2])
+    )
+
+
+def export_response(queryset, columns, export_format, filename):
+    '''
+        Streams `queryset` as CSV or NDJSON. `columns` maps each output
+        column to the field it is read from. Rows are fetched with
+        `values_list().iterator()` in chunks of `EXPORT_CHUNK_SIZE`, so
+        memory use does not grow with the size of the export.
+    '''
+    rows = queryset.values_list(*columns.values()).iterator(
+        chunk_size=get_setting("EXPORT_CHUNK_SIZE")
+    )
+    return export_rows(rows, list(columns), export_format, filename)
+
+
+def export_rows(rows, columns, export_format, filename):
+    '''
+        Streams `rows`, tuples of the values of `columns`, as CSV or
+        NDJSON.
+    '''
+    chunk_size = get_setting("EXPORT_CHUNK_SIZE")
+    iter_lines = iter_csv if export_format == CSV else iter_ndjson
+    response = StreamingHttpResponse(
+        iter_chunks(iter_lines(columns, rows), chunk_size),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
@@ -1,7 +1,7 @@
 from django.contrib.auth.models import User
 from django.utils import timezone
 
-from factory import LazyAttribute
+from factory import LazyAttribute, SubFactory
 from factory.django import DjangoModelFactory
 from factory.faker import Faker
 
@@ -40,7 +40,7 @@ class PurchaseOrderFactory(DjangoModelFactory):
         model = PurchaseOrder
 
     po_number = Faker("uuid4")
-    vendor = VendorFactory()
+    vendor = SubFactory(VendorFactory)
     order_date = LazyAttribute(
         lambda o: timezone.now() - timezone.timedelta(days=5))
     delivery_date = LazyAttribute(
@@ -0,0 +1,158 @@
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import PurchaseOrder
+
+
+def parse_datetime_param(value):
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError("Enter a valid ISO 8601 date/time.")
+    return parsed
+
+
+def parse_status_param(value):
+    if value not in dict(PurchaseOrder.status_choices):
+        raise ValueError(f"\"{value}\" is not a valid status.")
+    return value
+
+
+class QueryParamFilterBackend(BaseFilterBackend):
+    '''
+        Filters the queryset by the query parameters listed in `params`,
+        a mapping of parameter name to (ORM lookup, parser, description).
+    '''
+    params = {}
+
+    def filter_queryset(self, request, queryset, view):
+        filters = {}
+        errors = {}
+        for name, (lookup, parser, _) in self.params.items():
+            value = request.query_params.get(name)
+            if value in (None, ""):
+                continue
+            try:
+                filters[lookup] = parser(value)
+            except ValueError as error:
+                errors[name] = [str(error)]
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**filters)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": description,
+                "schema": {
+                    "type": "string",
+                    **(
+                        {"format": "date-time"}
+                        if parser is parse_datetime_param else {}
+                    ),
+                },
+            }
+            for name, (_, parser, description) in self.params.items()
+        ]
+
+
+class VendorFilterBackend(QueryParamFilterBackend):
+    params = {
+        "vendor_code": (
+            "vendor_code", str, "Only the vendor with this vendor code."
+        ),
+    }
+
+
+class PurchaseOrderFilterBackend(QueryParamFilterBackend):
+    params = {
+        "vendor_code": (
+            "vendor__vendor_code",
+            str,
+            "Only purchase orders of the vendor with this vendor code."
+        ),
+        "status": (
+            "status",
+            parse_status_param,
+            "Only purchase orders with this status."
+        ),
+        "order_date_after": (
+            "order_date__gte",
+            parse_datetime_param,
+            "Only purchase orders ordered at or after this time."
+        ),
+        "order_date_before": (
+            "order_date__lte",
+            parse_datetime_param,
+            "Only purchase orders ordered at or before this time."
+        ),
+        "delivery_date_after": (
+            "delivery_date__gte",
+            parse_datetime_param,
+            "Only purchase orders delivered at or after this time."
+        ),
+        "delivery_date_before": (
+            "delivery_date__lte",
+            parse_datetime_param,
+            "Only purchase orders delivered at or before this time."
+        ),
+        "issue_date_after": (
+            "issue_date__gte",
+            parse_datetime_param,
+            "Only purchase orders issued at or after this time."
+        ),
+        "issue_date_before": (
+            "issue_date__lte",
+            parse_datetime_param,
+            "Only purchase orders issued at or before this time."
+        ),
+    }
+
+
+class HistoricalPerformanceFilterBackend(QueryParamFilterBackend):
+    params = {
+        "vendor_code": (
+            "vendor__vendor_code",
+            str,
+            "Only the performance history of the vendor with this vendor "
+            "code."
+        ),
+        "date_after": (
+            "date__gte",
+            parse_datetime_param,
+            "Only snapshots taken at or after this time."
+        ),
+        "date_before": (
+            "date__lte",
+            parse_datetime_param,
+            "Only snapshots taken at or before this time."
+        ),
+    }
+
+
+class HistoricalPerformanceRollupFilterBackend(
+    HistoricalPerformanceFilterBackend
+):
+    '''
+        Applies the performance history filters to roll-up rows, by the
+        start of their period, as the history endpoint does.
+    '''
+    params = {
+        **HistoricalPerformanceFilterBackend.params,
+        "date_after": (
+            "period_start__gte",
+            *HistoricalPerformanceFilterBackend.params["date_after"][1:]
+        ),
+        "date_before": (
+            "period_start__lte",
+            *HistoricalPerformanceFilterBackend.params["date_before"][1:]
+        ),
+    }
@@ -0,0 +1,282 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.core.signals import setting_changed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .cache import get_response_cache
+from .conf import get_setting
+from .profiling import get_profiler
+
+_timing = ContextVar("request_timing", default=None)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RequestTiming:
+    '''
+        SQL queries run, and the seconds they took, in the current request.
+    '''
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    '''
+        Database execute wrapper adding each query to the RequestTiming of
+        the current request, if any.
+    '''
+    timing = _timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.queries += 1
+        timing.sql_time += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class Histogram:
+    '''
+        Prometheus histogram: the number of observations at or below each
+        bucket bound, their sum and count.
+    '''
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            yield bound, cumulative
+
+
+class RequestMetrics:
+    '''
+        In-process histograms of the duration, SQL time and SQL queries of
+        the requests to each view, by view name and method, and the number
+        of responses by status code. Methods outside `METHODS` are recorded
+        as "other", so clients cannot add label values at will.
+    '''
+    METHODS = frozenset((
+        "GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE",
+        "CONNECT",
+    ))
+    HISTOGRAMS = (
+        (
+            "vms_http_request_duration_seconds",
+            "Time spent handling the request.",
+            "REQUEST_METRICS_DURATION_BUCKETS",
+        ),
+        (
+            "vms_http_request_db_duration_seconds",
+            "Time spent running SQL queries during the request.",
+            "REQUEST_METRICS_DURATION_BUCKETS",
+        ),
+        (
+            "vms_http_request_db_queries",
+            "SQL queries run during the request.",
+            "REQUEST_METRICS_QUERY_BUCKETS",
+        ),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {name: {} for name, *_ in self.HISTOGRAMS}
+        self.buckets = {
+            name: tuple(get_setting(setting))
+            for name, _, setting in self.HISTOGRAMS
+        }
+        self.responses = {}
+
+    def observe(self, view, method, status, duration, timing):
+        if method not in self.METHODS:
+            method = "other"
+        labels = (view, method)
+        values = zip(
+            self.histograms, (duration, timing.sql_time, timing.queries)
+        )
+        with self._lock:
+            for name, value in values:
+                histograms = self.histograms[name]
+                if labels not in histograms:
+                    histograms[labels] = Histogram(self.buckets[name])
+                histograms[labels].observe(value)
+            key = (view, method, status)
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            for histograms in self.histograms.values():
+                histograms.clear()
+            self.responses.clear()
+
+    def render(self):
+        '''
+            Returns the metrics, with the response cache statistics, in the
+            Prometheus text format.
+        '''
+        lines = []
+        with self._lock:
+            for name, help_text, _ in self.HISTOGRAMS:
+                lines += [
+                    f"# HELP {name} {help_text}",
+                    f"# TYPE {name} histogram",
+                ]
+                for (view, method), histogram in sorted(
+                    self.histograms[name].items()
+                ):
+                    labels = f'view="{escape(view)}",method="{method}"'
+                    for bound, count in histogram.samples():
+                        lines.append(
+                            f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+                        )
+                    lines += [
+                        f"{name}_sum{{{labels}}} {histogram.sum}",
+                        f"{name}_count{{{labels}}} {histogram.count}",
+                    ]
+
+            name = "vms_http_responses_total"
+            lines += [
+                f"# HELP {name} Responses by view, method and status code.",
+                f"# TYPE {name} counter",
+            ]
+            for (view, method, status), count in sorted(
+                self.responses.items()
+            ):
+                lines.append(
+                    f'{name}{{view="{escape(view)}",method="{method}",'
+                    f'status="{status}"}} {count}'
+                )
+
+        stats = get_response_cache().stats()
+        for field in ("hits", "misses"):
+            name = f"vms_response_cache_{field}_total"
+            lines += [
+                f"# HELP {name} Response cache {field} by namespace.",
+                f"# TYPE {name} counter",
+            ]
+            for namespace_stats in stats:
+                lines.append(
+                    f'{name}{{namespace="{namespace_stats["namespace"]}"}} '
+                    f"{namespace_stats[field]}"
+                )
+
+        hot_paths = get_profiler().stats()
+        for field, help_text in (
+            ("calls", "Calls"),
+            ("seconds", "Cumulative seconds spent in"),
+            ("queries", "SQL queries run by"),
+            ("snapshots", "Performance snapshots written by"),
+        ):
+            name = f"vms_hot_path_{field}_total"
+            lines += [
+                f"# HELP {name} {help_text} each profiled hot path.",
+                f"# TYPE {name} counter",
+            ]
+            for path, stats in hot_paths.items():
+                lines.append(f'{name}{{path="{path}"}} {stats[field]}')
+        return "\n".join(lines) + "\n"
+
+
+def escape(label):
+    return (
+        label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+_request_metrics = None
+
+
+def get_request_metrics():
+    global _request_metrics
+    if _request_metrics is None:
+        _request_metrics = RequestMetrics()
+    return _request_metrics
+
+
+@receiver(setting_changed)
+def reset_request_metrics(setting, **kwargs):
+    global _request_metrics
+    if setting == "VENDOR_PULSE":
+        _request_metrics = None
+
+
+class RequestMetricsMiddleware:
+    '''
+        Records the total time, SQL time and SQL queries of each request by
+        view name in the RequestMetrics served at `/api/metrics/`, and adds
+        them to the response in a `Server-Timing` header. The time spent
+        streaming a response body is not included.
+    '''
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timing = RequestTiming()
+        token = _timing.set(timing)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timing.reset(token)
+        return self.record(request, response, timing, start)
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _timing.set(timing)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timing.reset(token)
+        return self.record(request, response, timing, start)
+
+    def record(self, request, response, timing, start):
+        duration = time.perf_counter() - start
+        resolver_match = request.resolver_match
+        get_request_metrics().observe(
+            resolver_match.view_name if resolver_match else "unmatched",
+            request.method,
+            response.status_code,
+            duration,
+            timing,
+        )
+        if get_setting("SERVER_TIMING_HEADER"):
+            response["Server-Timing"] = (
+                f'db;dur={timing.sql_time * 1000:.1f};'
+                f'desc="{timing.queries} queries", '
+                f"app;dur={(duration - timing.sql_time) * 1000:.1f}, "
+                f"total;dur={duration * 1000:.1f}"
+            )
+        return response
@@ -0,0 +1,369 @@
+import json
+import queue
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from vendor_pulse.cache import get_response_cache
+from vendor_pulse.conf import DEFAULTS, get_setting
+from vendor_pulse.models import Vendor, PurchaseOrder
+from vendor_pulse.seeding import Seeder
+
+
+def get_percentiles(values):
+    '''
+        Returns the 50th, 95th and 99th percentiles of `values`.
+    '''
+    if len(values) == 1:
+        return values * 3
+    percentiles = statistics.quantiles(values, n=100, method="inclusive")
+    return [percentiles[49], percentiles[94], percentiles[98]]
+
+
+@contextmanager
+def scratch_database(directory):
+    '''
+        Runs the block against a freshly migrated copy of the default
+        database, which is destroyed afterwards. SQLite databases are
+        created as a file in `directory`, so every thread shares it.
+    '''
+    connection = connections[DEFAULT_DB_ALIAS]
+    test_settings = connection.settings_dict["TEST"]
+    test_name = test_settings["NAME"]
+    setup_test_environment(debug=False)
+    try:
+        if connection.vendor == "sqlite":
+            test_settings["NAME"] = str(Path(directory) / "benchmark.sqlite3")
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            with override_settings(DATABASE_REPLICAS=[]):
+                yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    finally:
+        test_settings["NAME"] = test_name
+        teardown_test_environment()
+
+
+class Scenarios:
+    '''
+        The requests of each benchmark scenario. Each method takes the
+        index of the request and returns its method, path and JSON body.
+    '''
+    names = (
+        "create_purchase_order",
+        "update_purchase_order",
+        "acknowledge_purchase_order",
+        "list_vendors",
+        "list_purchase_orders",
+        "vendor_performance",
+    )
+
+    def __init__(self, vendor_ids, pending_ids):
+        self.vendor_ids = vendor_ids
+        # Updates and acknowledgements use different pending orders.
+        half = len(pending_ids) // 2
+        self.update_ids = pending_ids[:half] or pending_ids
+        self.acknowledge_ids = pending_ids[half:]
+
+    def create_purchase_order(self, index):
+        current_time = timezone.now()
+        return "post", "/api/purchase_orders/", {
+            "po_number": f"BENCHMARK-{index}-{time.monotonic_ns()}",
+            "vendor": self.vendor_ids[index % len(self.vendor_ids)],
+            "order_date": current_time,
+            "delivery_date": current_time + timezone.timedelta(days=3),
+            "items": [{"name": "Item", "price": 9.99, "quantity": 2}],
+            "quantity": 2,
+            "status": PurchaseOrder.PENDING,
+        }
+
+    def update_purchase_order(self, index):
+        pk = self.update_ids[index % len(self.update_ids)]
+        return "patch", f"/api/purchase_orders/{pk}/", {
+            "status": PurchaseOrder.COMPLETED,
+            "quality_rating": 4.0,
+        }
+
+    def acknowledge_purchase_order(self, index):
+        pk = self.acknowledge_ids[index % len(self.acknowledge_ids)]
+        return "post", f"/api/purchase_orders/{pk}/acknowledge/", None
+
+    def list_vendors(self, index):
+        return "get", "/api/vendors/?page_size=100", None
+
+    def list_purchase_orders(self, index):
+        return "get", "/api/purchase_orders/?page_size=100", None
+
+    def vendor_performance(self, index):
+        pk = self.vendor_ids[index % len(self.vendor_ids)]
+        return "get", f"/api/vendors/{pk}/performance/", None
+
+
+class Worker(threading.Thread):
+    '''
+        Sends the requests whose indexes it takes from `indexes` with its
+        own test client and database connection.
+    '''
+    def __init__(self, scenario, indexes, token):
+        super().__init__(daemon=True)
+        self.scenario = scenario
+        self.indexes = indexes
+        self.token = token
+        self.latencies = []
+        self.queries = []
+        self.rows = 0
+        self.errors = 0
+
+    def run(self):
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        connection = connections[DEFAULT_DB_ALIAS]
+        try:
+            while True:
+                try:
+                    index = self.indexes.get_nowait()
+                except queue.Empty:
+                    break
+                self.request(client, connection, index)
+        finally:
+            connections.close_all()
+
+    def request(self, client, connection, index):
+        method, path, data = self.scenario(index)
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = getattr(client, method)(
+                path,
+                json.dumps(data, cls=DjangoJSONEncoder) if data else None,
+                content_type="application/json",
+            )
+            self.latencies.append(time.perf_counter() - start)
+        self.queries.append(len(context.captured_queries))
+
+        if response.status_code >= 400:
+            self.errors += 1
+        elif method == "get" and "results" in response.json():
+            self.rows += len(response.json()["results"])
+        else:
+            self.rows += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a scratch database and measures the latency, queries per "
+        "request and rows per second of the vendor_pulse API endpoints "
+        "under concurrent requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--vendors", type=int, default=100)
+        parser.add_argument("--purchase-orders", type=int, default=10000)
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Measured requests per scenario."
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=10,
+            help="Unmeasured requests sent before each scenario."
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Threads sending requests at the same time."
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            choices=Scenarios.names,
+            help="Scenario to run, repeatable. Defaults to all of them."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            default="benchmark_api.json",
+            help="JSON file the results are written to."
+        )
+        parser.add_argument(
+            "--compare",
+            help="JSON results of an earlier run to compare against."
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError(
+                "--requests and --concurrency must be at least 1."
+            )
+
+        previous = None
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as results_file:
+                    previous = json.load(results_file)
+            except (OSError, ValueError) as error:
+                raise CommandError(
+                    f"Cannot read {options['compare']}: {error}"
+                )
+
+        with tempfile.TemporaryDirectory() as directory:
+            results = self.run_in_scratch_database(directory, options)
+
+        with open(options["output"], "w") as results_file:
+            json.dump(results, results_file, indent=2, cls=DjangoJSONEncoder)
+        self.stdout.write(f"Results written to {options['output']}.")
+
+        if previous is not None:
+            self.compare(previous, results)
+
+    def run_in_scratch_database(self, directory, options):
+        with scratch_database(directory):
+            return self.run(options)
+
+    def run(self, options):
+        start = time.perf_counter()
+        vendor_ids, pending_ids = self.seed(options)
+        self.stdout.write(
+            f"Seeded {options['vendors']} vendors and "
+            f"{options['purchase_orders']} purchase orders in "
+            f"{time.perf_counter() - start:.1f}s."
+        )
+
+        user = User.objects.create_user("benchmark", is_staff=True)
+        token = Token.objects.create(user=user).key
+        scenarios = Scenarios(vendor_ids, pending_ids)
+        get_response_cache().clear()
+        get_response_cache().reset_stats()
+
+        results = {
+            "created_at": timezone.now(),
+            "database": connections[DEFAULT_DB_ALIAS].settings_dict["ENGINE"],
+            "options": {
+                name: options[name] for name in (
+                    "vendors",
+                    "purchase_orders",
+                    "requests",
+                    "warmup",
+                    "concurrency",
+                    "seed",
+                )
+            },
+            "vendor_pulse": {name: get_setting(name) for name in DEFAULTS},
+            "scenarios": {},
+        }
+        for name in options["scenarios"] or Scenarios.names:
+            scenario = getattr(scenarios, name)
+            self.run_scenario(scenario, token, options["warmup"], options)
+            result = self.run_scenario(
+                scenario,
+                token,
+                options["requests"],
+                options,
+                offset=options["warmup"],
+            )
+            results["scenarios"][name] = result
+            self.stdout.write(
+                f"{name}: p50 {result['p50_ms']:.1f}ms, "
+                f"p95 {result['p95_ms']:.1f}ms, "
+                f"p99 {result['p99_ms']:.1f}ms, "
+                f"{result['requests_per_second']:.0f} requests/s, "
+                f"{result['rows_per_second']:.0f} rows/s, "
+                f"{result['queries_per_request']:.1f} queries/request, "
+                f"{result['errors']} errors"
+            )
+        results["response_cache"] = get_response_cache().stats()
+        return results
+
+    def seed(self, options):
+        Seeder(seed=options["seed"], prefix="BENCHMARK").seed(
+            options["vendors"], options["purchase_orders"]
+        )
+        return (
+            list(Vendor.objects.filter(
+                vendor_code__startswith="BENCHMARK-V"
+            ).order_by("pk").values_list("pk", flat=True)),
+            list(PurchaseOrder.objects.filter(
+                status=PurchaseOrder.PENDING
+            ).values_list("pk", flat=True)),
+        )
+
+    def run_scenario(self, scenario, token, requests, options, offset=0):
+        indexes = queue.SimpleQueue()
+        for index in range(offset, offset + requests):
+            indexes.put(index)
+
+        workers = [
+            Worker(scenario, indexes, token)
+            for _ in range(options["concurrency"])
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        duration = time.perf_counter() - start
+
+        latencies = sorted(
+            latency * 1000 for worker in workers
+            for latency in worker.latencies
+        )
+        queries = [count for worker in workers for count in worker.queries]
+        if not latencies:
+            return None
+
+        p50, p95, p99 = get_percentiles(latencies)
+        return {
+            "requests": len(latencies),
+            "errors": sum(worker.errors for worker in workers),
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "mean_ms": statistics.mean(latencies),
+            "requests_per_second": len(latencies) / duration,
+            "rows_per_second": (
+                sum(worker.rows for worker in workers) / duration
+            ),
+            "queries_per_request": statistics.mean(queries),
+        }
+
+    def compare(self, previous, results):
+        self.stdout.write(f"Compared with {previous['created_at']}:")
+        for name, result in results["scenarios"].items():
+            previous_result = previous["scenarios"].get(name)
+            if not previous_result:
+                continue
+            changes = [
+                f"{label} {result[key]:.1f} "
+                f"({(result[key] / previous_result[key] - 1) * 100:+.0f}%)"
+                for label, key in (
+                    ("p95 ms", "p95_ms"),
+                    ("requests/s", "requests_per_second"),
+                    ("queries/request", "queries_per_request"),
+                )
+                if previous_result[key]
+            ]
+            self.stdout.write(f"{name}: {', '.join(changes)}")
@@ -0,0 +1,144 @@
+import json
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from rest_framework.fields import DateTimeField
+from rest_framework.renderers import JSONRenderer
+
+from vendor_pulse.fast_serializers import FastJSONRenderer, get_field_plan
+from vendor_pulse.models import Vendor, PurchaseOrder
+from vendor_pulse.serializers import (
+    VendorSerializer,
+    PurchaseOrderSerializer,
+    VendorPerformanceSerializer,
+)
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the rows per second of the regular and fast read paths of "
+        "the vendor and purchase order serializers on generated data, which "
+        "is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=5000,
+            help="Vendors and purchase orders to generate."
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs of each path; the fastest one is reported."
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            vendors, purchase_orders = self.seed(options["rows"])
+            computed_at = timezone.now()
+            benchmarks = [
+                (VendorSerializer, vendors, {}),
+                (
+                    PurchaseOrderSerializer,
+                    purchase_orders.select_related("vendor"),
+                    {},
+                ),
+                (
+                    VendorPerformanceSerializer,
+                    vendors,
+                    {"computed_at": computed_at},
+                ),
+            ]
+            for serializer_class, queryset, context in benchmarks:
+                self.benchmark(
+                    serializer_class, queryset, context, options["repeat"]
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        prefix = uuid.uuid4().hex
+        vendors = Vendor.objects.bulk_create(
+            Vendor(
+                name=f"Vendor {index}",
+                contact_details="0123456789",
+                address=f"{index} Benchmark Street",
+                vendor_code=f"{prefix}-{index}",
+            )
+            for index in range(rows)
+        )
+        current_time = timezone.now()
+        PurchaseOrder.objects.bulk_create(
+            (
+                PurchaseOrder(
+                    po_number=f"{prefix}-{index}",
+                    vendor=vendors[index % len(vendors)],
+                    order_date=current_time - timezone.timedelta(days=5),
+                    delivery_date=current_time - timezone.timedelta(days=2),
+                    items=[
+                        {"name": f"Item {item}", "price": 9.99, "quantity": 2}
+                        for item in range(5)
+                    ],
+                    quantity=10,
+                    status=PurchaseOrder.COMPLETED,
+                    quality_rating=4.5,
+                    issue_date=current_time - timezone.timedelta(days=5),
+                    acknowledgment_date=current_time,
+                    completed_at=current_time,
+                )
+                for index in range(rows)
+            ),
+            batch_size=500,
+        )
+        return (
+            Vendor.objects.filter(vendor_code__startswith=prefix),
+            PurchaseOrder.objects.filter(po_number__startswith=prefix),
+        )
+
+    def benchmark(self, serializer_class, queryset, context, repeat):
+        queryset = queryset.order_by("pk")
+        plan = get_field_plan(queryset.model, serializer_class)
+        method_values = {
+            name: DateTimeField().to_representation(value)
+            for name, value in context.items()
+        }
+
+        def regular():
+            return JSONRenderer().render(
+                serializer_class(queryset, many=True, context=context).data
+            )
+
+        def fast():
+            return FastJSONRenderer().render(
+                plan.many(plan.values(queryset), **method_values)
+            )
+
+        rows = queryset.count()
+        regular_time, regular_content = best_time(regular, repeat)
+        fast_time, fast_content = best_time(fast, repeat)
+        self.stdout.write(
+            f"{serializer_class.__name__}: {rows} rows, "
+            f"regular {rows / regular_time:.0f} rows/s, "
+            f"fast {rows / fast_time:.0f} rows/s "
+            f"({regular_time / fast_time:.1f}x)"
+        )
+        if json.loads(regular_content) != json.loads(fast_content):
+            self.stderr.write(
+                f"{serializer_class.__name__}: the fast path output differs "
+                "from the serializer output."
+            )
@@ -0,0 +1,123 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from vendor_pulse.conf import get_setting
+from vendor_pulse.models import (
+    Vendor,
+    HistoricalPerformanceRollup,
+    truncate_date,
+)
+
+
+def get_database_pages():
+    '''
+        Returns the SQLite page size, page count and free page count, or None
+        for other databases.
+    '''
+    if connection.vendor != "sqlite":
+        return None
+    with connection.cursor() as cursor:
+        pages = []
+        for pragma in ("page_size", "page_count", "freelist_count"):
+            cursor.execute(f"PRAGMA {pragma}")
+            pages.append(cursor.fetchone()[0])
+    return pages
+
+
+class Command(BaseCommand):
+    help = (
+        "Rolls old HistoricalPerformance snapshots into daily roll-ups and "
+        "old daily roll-ups into weekly ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--raw-days",
+            type=int,
+            default=None,
+            help=(
+                "Days of raw snapshots to keep. Defaults to "
+                "HISTORY_RAW_RETENTION_DAYS."
+            )
+        )
+        parser.add_argument(
+            "--daily-days",
+            type=int,
+            default=None,
+            help=(
+                "Days of daily roll-ups to keep. Defaults to "
+                "HISTORY_DAILY_RETENTION_DAYS."
+            )
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Vendors whose history is compacted together."
+        )
+        parser.add_argument(
+            "--vacuum",
+            action="store_true",
+            help="VACUUM the SQLite database afterwards to shrink the file."
+        )
+
+    def handle(self, *args, **options):
+        raw_days = options["raw_days"]
+        if raw_days is None:
+            raw_days = get_setting("HISTORY_RAW_RETENTION_DAYS")
+        daily_days = options["daily_days"]
+        if daily_days is None:
+            daily_days = get_setting("HISTORY_DAILY_RETENTION_DAYS")
+
+        # Only whole days and weeks are rolled up, so a period is never
+        # split between a roll-up and newer rows.
+        current_time = timezone.now()
+        raw_before = truncate_date(
+            current_time - timezone.timedelta(days=raw_days), "day"
+        )
+        daily_before = truncate_date(
+            current_time - timezone.timedelta(days=daily_days), "week"
+        )
+
+        pages_before = get_database_pages()
+        removed = 0
+        written = 0
+        vendor_ids = Vendor.objects.order_by("pk").values_list(
+            "pk", flat=True
+        ).iterator(chunk_size=options["chunk_size"])
+        while chunk := list(islice(vendor_ids, options["chunk_size"])):
+            # One day or week of the chunk per transaction, oldest first.
+            while True:
+                chunk_removed, chunk_written = (
+                    HistoricalPerformanceRollup.compact(
+                        chunk, raw_before, daily_before
+                    )
+                )
+                if not chunk_removed:
+                    break
+                removed += chunk_removed
+                written += chunk_written
+
+        if options["vacuum"] and pages_before:
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM")
+
+        self.stdout.write(
+            f"Removed {removed} rows, wrote {written} roll-up rows."
+        )
+        pages_after = get_database_pages()
+        if pages_before:
+            page_size, page_count, freelist_count = pages_before
+            _, page_count_after, freelist_count_after = pages_after
+            reclaimed = (
+                (page_count - freelist_count)
+                - (page_count_after - freelist_count_after)
+            ) * page_size
+            shrunk = (page_count - page_count_after) * page_size
+            self.stdout.write(
+                f"Reclaimed {reclaimed} bytes, "
+                f"database file shrank by {shrunk} bytes."
+            )
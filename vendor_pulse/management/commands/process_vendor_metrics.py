@@ -0,0 +1,89 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from vendor_pulse.conf import get_setting
+from vendor_pulse.models import VendorMetricsJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculates the performance metrics of vendors queued while "
+        "VENDOR_PULSE['METRICS_MODE'] is 'deferred'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit instead of polling."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep between polls when the queue is empty."
+        )
+        parser.add_argument(
+            "--debounce",
+            type=float,
+            default=None,
+            help=(
+                "Only process vendors that have not been marked for this "
+                "many seconds. Defaults to METRICS_DEBOUNCE_SECONDS."
+            )
+        )
+        parser.add_argument(
+            "--max-delay",
+            type=float,
+            default=None,
+            help=(
+                "Process vendors first marked this many seconds ago even if "
+                "they are still being marked. Defaults to "
+                "METRICS_MAX_DELAY_SECONDS."
+            )
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of jobs to read per poll."
+        )
+
+    def handle(self, *args, **options):
+        debounce = options["debounce"]
+        if debounce is None:
+            debounce = get_setting("METRICS_DEBOUNCE_SECONDS")
+        max_delay = options["max_delay"]
+        if max_delay is None:
+            max_delay = get_setting("METRICS_MAX_DELAY_SECONDS")
+
+        while True:
+            processed = self.drain(debounce, max_delay, options["batch_size"])
+            if options["once"]:
+                return
+            if not processed:
+                time.sleep(options["interval"])
+
+    def drain(self, debounce, max_delay, batch_size):
+        processed = 0
+        while True:
+            jobs = list(
+                VendorMetricsJob.pending(debounce, max_delay).select_related(
+                    "vendor"
+                )[:batch_size]
+            )
+            if not jobs:
+                return processed
+
+            batch_processed = 0
+            for job in jobs:
+                if job.process(max_delay):
+                    batch_processed += 1
+                    self.stdout.write(
+                        f"Recalculated {job.vendor} "
+                        f"({job.mark_count} marks)"
+                    )
+            if not batch_processed:
+                return processed
+            processed += batch_processed
@@ -0,0 +1,204 @@
+import json
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from vendor_pulse.conf import get_setting
+from vendor_pulse.models import Vendor, PurchaseOrder
+from vendor_pulse.profiling import get_profiler
+from vendor_pulse.seeding import Seeder
+
+from .benchmark_api import scratch_database
+
+
+class Edits:
+    '''
+        The purchase order edits profiled, in the order they run. Each
+        method takes the index of the edit and the purchase order created
+        by the first one.
+    '''
+    names = ("create", "acknowledge", "complete", "reassign", "delete")
+
+    def __init__(self, vendors):
+        self.vendors = vendors
+
+    def create(self, index, purchase_order):
+        current_time = timezone.now()
+        return PurchaseOrder.objects.create(
+            po_number=f"PROFILE-{index}",
+            vendor=self.vendors[index % len(self.vendors)],
+            order_date=current_time,
+            delivery_date=current_time + timezone.timedelta(days=3),
+            items=[{"name": "Item", "price": 9.99, "quantity": 2}],
+            quantity=2,
+            status=PurchaseOrder.PENDING,
+        )
+
+    def acknowledge(self, index, purchase_order):
+        purchase_order.acknowledge()
+
+    def complete(self, index, purchase_order):
+        purchase_order.status = PurchaseOrder.COMPLETED
+        purchase_order.quality_rating = 4.0
+        purchase_order.save()
+
+    def reassign(self, index, purchase_order):
+        purchase_order.vendor = self.vendors[(index + 1) % len(self.vendors)]
+        purchase_order.save()
+
+    def delete(self, index, purchase_order):
+        purchase_order.delete()
+
+
+class Command(BaseCommand):
+    help = (
+        "Profiles the metric signal receivers and Vendor calculate/update "
+        "methods during a fixed set of purchase order edits on a seeded "
+        "scratch database, and reports their calls, time, queries and "
+        "snapshots per edit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--vendors", type=int, default=20)
+        parser.add_argument("--purchase-orders", type=int, default=10000)
+        parser.add_argument(
+            "--edits",
+            type=int,
+            default=100,
+            help="Purchase orders each edit is applied to."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            default="profile_hot_paths.json",
+            help="JSON file the results are written to."
+        )
+        parser.add_argument(
+            "--compare",
+            help="JSON results of an earlier run to compare against."
+        )
+
+    def handle(self, *args, **options):
+        if options["vendors"] < 2 or options["edits"] < 1:
+            raise CommandError(
+                "--vendors must be at least 2 and --edits at least 1."
+            )
+
+        previous = None
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as results_file:
+                    previous = json.load(results_file)
+            except (OSError, ValueError) as error:
+                raise CommandError(
+                    f"Cannot read {options['compare']}: {error}"
+                )
+
+        with tempfile.TemporaryDirectory() as directory:
+            with scratch_database(directory):
+                results = self.run(options)
+
+        with open(options["output"], "w") as results_file:
+            json.dump(results, results_file, indent=2, cls=DjangoJSONEncoder)
+        self.stdout.write(f"Results written to {options['output']}.")
+
+        if previous is not None:
+            self.compare(previous, results)
+
+    def run(self, options):
+        Seeder(seed=options["seed"]).seed(
+            options["vendors"], options["purchase_orders"], defer_indexes=True
+        )
+        edits = Edits(list(Vendor.objects.order_by("pk")))
+        results = {
+            "created_at": timezone.now(),
+            "database": connections[DEFAULT_DB_ALIAS].settings_dict["ENGINE"],
+            "options": {
+                name: options[name] for name in (
+                    "vendors", "purchase_orders", "edits", "seed"
+                )
+            },
+            "metrics_mode": get_setting("METRICS_MODE"),
+            "edits": {},
+        }
+
+        purchase_orders = [None] * options["edits"]
+        with override_settings(VENDOR_PULSE={
+            **getattr(settings, "VENDOR_PULSE", {}),
+            "HOT_PATH_PROFILING": True,
+        }):
+            for name in Edits.names:
+                result = self.profile(
+                    getattr(edits, name), purchase_orders
+                )
+                results["edits"][name] = result
+                self.report(name, result)
+        return results
+
+    def profile(self, edit, purchase_orders):
+        '''
+            Applies `edit` to each purchase order and returns its time and
+            queries, and the stats of each hot path, per edit.
+        '''
+        profiler = get_profiler()
+        profiler.reset()
+        connection = connections[DEFAULT_DB_ALIAS]
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            for index, purchase_order in enumerate(purchase_orders):
+                purchase_order = edit(index, purchase_order)
+                if purchase_order is not None:
+                    purchase_orders[index] = purchase_order
+            duration = time.perf_counter() - start
+
+        count = len(purchase_orders)
+        return {
+            "ms_per_edit": duration * 1000 / count,
+            "queries_per_edit": len(context.captured_queries) / count,
+            "hot_paths": {
+                path: {
+                    "calls": stats["calls"] / count,
+                    "ms": stats["seconds"] * 1000 / count,
+                    "queries": stats["queries"] / count,
+                    "snapshots": stats["snapshots"] / count,
+                }
+                for path, stats in profiler.stats().items()
+            },
+        }
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name}: {result['ms_per_edit']:.2f}ms, "
+            f"{result['queries_per_edit']:.1f} queries per edit"
+        )
+        for path, stats in sorted(
+            result["hot_paths"].items(), key=lambda item: -item[1]["ms"]
+        ):
+            self.stdout.write(
+                f"  {path}: {stats['calls']:.1f} calls, "
+                f"{stats['ms']:.2f}ms, {stats['queries']:.1f} queries, "
+                f"{stats['snapshots']:.1f} snapshots"
+            )
+
+    def compare(self, previous, results):
+        self.stdout.write(f"Compared with {previous['created_at']}:")
+        for name, result in results["edits"].items():
+            previous_result = previous["edits"].get(name)
+            if not previous_result:
+                continue
+            changes = [
+                f"{label} {result[key]:.2f} "
+                f"({(result[key] / previous_result[key] - 1) * 100:+.0f}%)"
+                for label, key in (
+                    ("ms/edit", "ms_per_edit"),
+                    ("queries/edit", "queries_per_edit"),
+                )
+                if previous_result[key]
+            ]
+            self.stdout.write(f"{name}: {', '.join(changes)}")
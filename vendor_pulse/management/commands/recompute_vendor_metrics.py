@@ -0,0 +1,164 @@
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from vendor_pulse.conf import get_setting
+from vendor_pulse.models import Vendor, VendorPerformanceCounter
+
+
+def init_worker():
+    django.setup()
+    connections.close_all()
+
+
+def compute_chunk(vendor_ids):
+    '''
+        Computes the performance totals of one chunk of vendors and the
+        metrics that differ from the stored ones. It only reads, so chunks can
+        be computed in parallel pool workers while the command process does
+        all the writes; SQLite allows a single writer at a time.
+    '''
+    vendors = Vendor.objects.filter(pk__in=vendor_ids).only(
+        "vendor_code", *Vendor.PERFORMANCE_METRICS
+    )
+    totals = vendors.performance_totals()
+    diffs = []
+    for vendor in vendors:
+        metrics = VendorPerformanceCounter(
+            **totals[vendor.pk]
+        ).performance_metrics
+        changed = {
+            metric: (getattr(vendor, metric), value)
+            for metric, value in metrics.items()
+            if getattr(vendor, metric) != value
+        }
+        if changed:
+            diffs.append((vendor.vendor_code, changed))
+    return totals, diffs
+
+
+def map_bounded(executor, func, items, window):
+    '''
+        Like `executor.map`, in order, but with at most `window` items
+        submitted ahead of the results consumed, so the items are read, and
+        the results held, a window at a time instead of all at once.
+    '''
+    futures = deque()
+    try:
+        for item in items:
+            if len(futures) == window:
+                yield futures.popleft().result()
+            futures.append(executor.submit(func, item))
+        while futures:
+            yield futures.popleft().result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the stored performance metrics of every vendor, or of a "
+        "range of vendors, from their purchase orders."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Vendors per chunk. Defaults to BULK_BATCH_SIZE."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes recomputing chunks."
+        )
+        parser.add_argument(
+            "--snapshots",
+            action="store_true",
+            help="Write a HistoricalPerformance snapshot for every vendor."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the metrics that would change."
+        )
+        parser.add_argument("--id-from", type=int, help="Lowest vendor id.")
+        parser.add_argument("--id-to", type=int, help="Highest vendor id.")
+        parser.add_argument(
+            "--vendor-code-from", help="Lowest vendor code."
+        )
+        parser.add_argument(
+            "--vendor-code-to", help="Highest vendor code."
+        )
+
+    def get_vendor_ids(self, options):
+        filters = {
+            "pk__gte": options["id_from"],
+            "pk__lte": options["id_to"],
+            "vendor_code__gte": options["vendor_code_from"],
+            "vendor_code__lte": options["vendor_code_to"],
+        }
+        return Vendor.objects.filter(**{
+            lookup: value for lookup, value in filters.items()
+            if value is not None
+        }).order_by("pk").values_list("pk", flat=True)
+
+    def get_chunks(self, options):
+        chunk_size = options["chunk_size"] or get_setting("BULK_BATCH_SIZE")
+        vendor_ids = self.get_vendor_ids(options).iterator(
+            chunk_size=chunk_size
+        )
+        while chunk := list(islice(vendor_ids, chunk_size)):
+            yield chunk
+
+    def handle(self, *args, **options):
+        chunks = self.get_chunks(options)
+        if options["workers"] > 1:
+            # Forked workers must open their own database connections.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options["workers"], initializer=init_worker
+            ) as executor:
+                self.save(map_bounded(
+                    executor, compute_chunk, chunks, options["workers"] * 2
+                ), options)
+        else:
+            self.save(map(compute_chunk, chunks), options)
+
+    def save(self, results, options):
+        started_at = time.monotonic()
+        processed = 0
+        changed = 0
+        for totals, diffs in results:
+            if not options["dry_run"]:
+                Vendor.objects.filter(pk__in=totals).save_performance_totals(
+                    totals, snapshots=options["snapshots"]
+                )
+
+            processed += len(totals)
+            changed += len(diffs)
+            if options["dry_run"]:
+                for vendor_code, metrics in diffs:
+                    for metric, (stored, calculated) in metrics.items():
+                        self.stdout.write(
+                            f"{vendor_code} {metric}: {stored} -> {calculated}"
+                        )
+
+            elapsed = time.monotonic() - started_at
+            self.stdout.write(
+                f"Processed {processed} vendors "
+                f"({processed / elapsed if elapsed else 0:.0f} vendors/s)"
+            )
+
+        action = "would change" if options["dry_run"] else "changed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{processed} vendors recomputed, {changed} {action}."
+        ))
@@ -0,0 +1,141 @@
+import datetime
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from vendor_pulse.models import Vendor, PurchaseOrder, HistoricalPerformance
+from vendor_pulse.seeding import Seeder
+
+# A larger page cache while seeding. The durability settings of the
+# database are left alone, as it may be serving other connections.
+SEED_PRAGMAS = {"cache_size": -256 * 1024}
+
+
+@contextmanager
+def seed_pragmas():
+    if connection.vendor != "sqlite":
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        previous = {}
+        for pragma, value in SEED_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma}")
+            previous[pragma] = cursor.fetchone()[0]
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for pragma, value in previous.items():
+                cursor.execute(f"PRAGMA {pragma} = {int(value)}")
+
+
+def parse_date(value):
+    try:
+        date = datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"{value!r} is not a YYYY-MM-DD date.")
+    return timezone.make_aware(
+        datetime.datetime.combine(date, datetime.time()),
+        datetime.timezone.utc
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates deterministic synthetic vendors, purchase orders and "
+        "performance history with chunked bulk inserts that skip the "
+        "metric signals, then recalculates the vendor metrics once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--vendors", type=int, default=1000)
+        parser.add_argument("--purchase-orders", type=int, default=100000)
+        parser.add_argument(
+            "--history-days",
+            type=int,
+            default=30,
+            help="Daily performance snapshots generated per vendor."
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Days before --until the purchase orders are spread over."
+        )
+        parser.add_argument(
+            "--until",
+            help=(
+                "Date (YYYY-MM-DD, UTC) the generated data ends at. Defaults "
+                "to today; pass it to get the same rows on another day."
+            )
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix",
+            default="SEED",
+            help="Prefix of the generated vendor codes and PO numbers."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=50000,
+            help="Rows generated and inserted per transaction."
+        )
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help=(
+                "Drop the purchase order and history indexes while "
+                "inserting and rebuild them at the end. Only allowed while "
+                "both tables are empty, as queries meanwhile cannot use "
+                "them."
+            )
+        )
+
+    def handle(self, *args, **options):
+        if options["vendors"] < 1:
+            raise CommandError("--vendors must be at least 1.")
+        if Vendor.objects.filter(
+            vendor_code__startswith=f"{options['prefix']}-V"
+        ).exists():
+            raise CommandError(
+                f"Data with the prefix {options['prefix']!r} already "
+                "exists; pass another --prefix."
+            )
+        if options["defer_indexes"] and (
+            PurchaseOrder.objects.exists()
+            or HistoricalPerformance.objects.exists()
+        ):
+            raise CommandError(
+                "--defer-indexes needs empty purchase order and performance "
+                "history tables."
+            )
+
+        seeder = Seeder(
+            seed=options["seed"],
+            prefix=options["prefix"],
+            until=options["until"] and parse_date(options["until"]),
+            days=options["days"],
+        )
+        start = time.perf_counter()
+        with seed_pragmas():
+            vendors, purchase_orders, snapshots = seeder.seed(
+                options["vendors"],
+                options["purchase_orders"],
+                history_days=options["history_days"],
+                chunk_size=options["chunk_size"],
+                defer_indexes=options["defer_indexes"],
+            )
+        duration = time.perf_counter() - start
+
+        rows = vendors + purchase_orders + snapshots
+        self.stdout.write(
+            f"Seeded {vendors} vendors, {purchase_orders} purchase orders "
+            f"and {snapshots} performance snapshots in {duration:.1f}s "
+            f"({rows / duration * 60:.0f} rows/min)."
+        )
@@ -0,0 +1,197 @@
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db import transaction
+from django.db.utils import ConnectionHandler
+
+from vendor_pulse.models import Vendor, PurchaseOrder
+from vendor_pulse.seeding import Seeder
+
+
+@contextmanager
+def bound_database(handler):
+    '''
+        Points the default database of the current thread at the one of
+        `handler` for the block, so the models, their signals and atomic
+        blocks all run against it. Other threads keep their own database.
+    '''
+    connection = handler.create_connection(DEFAULT_DB_ALIAS)
+    connections[DEFAULT_DB_ALIAS] = connection
+    try:
+        yield connection
+    finally:
+        connection.close()
+        del connections[DEFAULT_DB_ALIAS]
+
+
+class Worker(threading.Thread):
+    '''
+        Runs `operation` against the database of `handler` until
+        `deadline`, counting completed operations and "database is
+        locked" failures.
+    '''
+    def __init__(self, handler, operation, deadline, vendor_ids, order_ids):
+        super().__init__(daemon=True)
+        self.handler = handler
+        self.operation = operation
+        self.deadline = deadline
+        self.vendor_ids = vendor_ids
+        self.order_ids = order_ids
+        self.completed = 0
+        self.locked = 0
+
+    def run(self):
+        with bound_database(self.handler):
+            while time.monotonic() < self.deadline:
+                try:
+                    self.operation(self)
+                    self.completed += 1
+                except OperationalError:
+                    self.locked += 1
+
+
+def read(worker):
+    '''
+        A vendor retrieve and a page of its purchase orders.
+    '''
+    vendor = Vendor.objects.get(pk=random.choice(worker.vendor_ids))
+    list(vendor.purchase_orders.order_by("id")[:100])
+
+
+def write(worker):
+    '''
+        A purchase order completion or rating change saved through the
+        model, with the metric recalculation its signals run, in one
+        transaction that reads before it writes.
+    '''
+    with transaction.atomic():
+        purchase_order = PurchaseOrder.objects.get(
+            pk=random.choice(worker.order_ids)
+        )
+        purchase_order.status = PurchaseOrder.COMPLETED
+        purchase_order.quality_rating = round(random.uniform(1, 5), 1)
+        purchase_order.save()
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs concurrent readers and writers against a scratch SQLite "
+        "database with the development and the production database "
+        "profile, and reports the throughput and lock failures of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=5,
+            help="Seconds each profile is run for."
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=8,
+            help="Reading threads."
+        )
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=4,
+            help="Writing threads."
+        )
+        parser.add_argument(
+            "--vendors",
+            type=int,
+            default=100,
+        )
+        parser.add_argument(
+            "--purchase-orders",
+            type=int,
+            default=10000,
+        )
+
+    def handle(self, *args, **options):
+        profiles = {
+            "development": ("django.db.backends.sqlite3", {}),
+            "production": ("vms.sqlite3", settings.SQLITE_PRODUCTION_OPTIONS),
+        }
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name, (engine, database_options) in profiles.items():
+                handler = ConnectionHandler({
+                    DEFAULT_DB_ALIAS: {
+                        "ENGINE": engine,
+                        "NAME": str(Path(directory) / f"{name}.sqlite3"),
+                        "OPTIONS": database_options,
+                    }
+                })
+                # The main thread keeps its database, so the scratch one is
+                # prepared in a thread of its own like the workers.
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    vendor_ids, order_ids = executor.submit(
+                        self.seed, handler, options
+                    ).result()
+                results[name] = self.stress(
+                    handler, options, vendor_ids, order_ids
+                )
+                self.stdout.write(
+                    f"{name}: {results[name]['reads']:.0f} reads/s, "
+                    f"{results[name]['writes']:.0f} writes/s, "
+                    f"{results[name]['locked']} lock failures"
+                )
+
+        development = results["development"]
+        production = results["production"]
+        if development["reads"] and development["writes"]:
+            self.stdout.write(
+                "production/development: "
+                f"{production['reads'] / development['reads']:.1f}x reads, "
+                f"{production['writes'] / development['writes']:.1f}x writes"
+            )
+
+    def seed(self, handler, options):
+        with bound_database(handler):
+            call_command("migrate", verbosity=0, interactive=False)
+            Seeder(prefix="STRESS").seed(
+                options["vendors"], options["purchase_orders"]
+            )
+            return (
+                list(Vendor.objects.values_list("pk", flat=True)),
+                list(PurchaseOrder.objects.values_list("pk", flat=True)),
+            )
+
+    def stress(self, handler, options, vendor_ids, order_ids):
+        deadline = time.monotonic() + options["duration"]
+        workers = [
+            Worker(handler, operation, deadline, vendor_ids, order_ids)
+            for operation, count in (
+                (read, options["readers"]),
+                (write, options["writers"]),
+            )
+            for _ in range(count)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return {
+            "reads": sum(
+                worker.completed for worker in workers
+                if worker.operation is read
+            ) / options["duration"],
+            "writes": sum(
+                worker.completed for worker in workers
+                if worker.operation is write
+            ) / options["duration"],
+            "locked": sum(worker.locked for worker in workers),
+        }
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def copy_database(source, target, pages=-1):
+    '''
+        Copies the SQLite database of the `source` connection over the one
+        of `target` with the SQLite online backup API, `pages` pages at a
+        time, so the source stays readable and writable during the copy.
+    '''
+    for connection in (source, target):
+        if connection.vendor != "sqlite":
+            raise CommandError(
+                f"{connection.alias} is not a SQLite database."
+            )
+        connection.ensure_connection()
+    source.connection.backup(target.connection, pages=pages)
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the primary SQLite database to the DATABASE_REPLICAS "
+        "aliases."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            action="append",
+            dest="databases",
+            help="Replica alias to refresh. Defaults to every replica."
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=1024,
+            help="Pages copied per step; -1 copies the database in one step."
+        )
+
+    def handle(self, *args, **options):
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        databases = options["databases"] or replicas
+        if not databases:
+            raise CommandError("No DATABASE_REPLICAS are configured.")
+
+        unknown = set(databases) - set(replicas)
+        if unknown:
+            raise CommandError(
+                f"Not in DATABASE_REPLICAS: {', '.join(sorted(unknown))}."
+            )
+
+        for alias in databases:
+            copy_database(
+                connections[DEFAULT_DB_ALIAS],
+                connections[alias],
+                options["pages"],
+            )
+            self.stdout.write(f"Copied {DEFAULT_DB_ALIAS} to {alias}.")
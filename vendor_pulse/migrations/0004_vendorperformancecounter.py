@@ -0,0 +1,97 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:45
+
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill_counters(apps, schema_editor):
+    '''
+        Counts the existing purchase orders of every vendor, so the deltas
+        applied from now on start from their totals. Completed orders are on
+        time if their delivery date has passed, as the metrics judged them.
+    '''
+    Vendor = apps.get_model("vendor_pulse", "Vendor")
+    PurchaseOrder = apps.get_model("vendor_pulse", "PurchaseOrder")
+    VendorPerformanceCounter = apps.get_model(
+        "vendor_pulse", "VendorPerformanceCounter"
+    )
+    completed = Q(status="completed")
+    rated = completed & Q(quality_rating__isnull=False)
+    acknowledged = Q(acknowledgment_date__isnull=False)
+    totals = {
+        row.pop("vendor_id"): row
+        for row in PurchaseOrder.objects.order_by().values(
+            "vendor_id"
+        ).annotate(
+            total_count=Count("id"),
+            completed_count=Count("id", filter=completed),
+            on_time_count=Count(
+                "id",
+                filter=completed & Q(delivery_date__lte=timezone.now())
+            ),
+            quality_rating_sum=Sum(
+                "quality_rating", filter=rated, default=0.0
+            ),
+            quality_rating_count=Count("id", filter=rated),
+            response_time_sum=Sum(
+                F("acknowledgment_date") - F("issue_date"),
+                filter=acknowledged
+            ),
+            response_time_count=Count("id", filter=acknowledged),
+        )
+    }
+    counters = []
+    for vendor_id in Vendor.objects.values_list("pk", flat=True).iterator():
+        vendor_totals = totals.get(vendor_id, {})
+        response_time_sum = vendor_totals.pop("response_time_sum", None)
+        counters.append(VendorPerformanceCounter(
+            vendor_id=vendor_id,
+            response_time_sum=(
+                response_time_sum.total_seconds() if response_time_sum
+                else 0.0
+            ),
+            **vendor_totals,
+        ))
+    VendorPerformanceCounter.objects.bulk_create(counters, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendor_pulse", "0003_alter_historicalperformance_date_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VendorPerformanceCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_count", models.PositiveIntegerField(default=0)),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                ("on_time_count", models.PositiveIntegerField(default=0)),
+                ("quality_rating_sum", models.FloatField(default=0.0)),
+                ("quality_rating_count", models.PositiveIntegerField(default=0)),
+                ("response_time_sum", models.FloatField(default=0.0)),
+                ("response_time_count", models.PositiveIntegerField(default=0)),
+                (
+                    "vendor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="performance_counter",
+                        to="vendor_pulse.vendor",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
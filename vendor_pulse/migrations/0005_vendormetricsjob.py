@@ -0,0 +1,39 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendor_pulse", "0004_vendorperformancecounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VendorMetricsJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("marked_at", models.DateTimeField()),
+                ("mark_count", models.PositiveIntegerField(default=1)),
+                (
+                    "vendor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="metrics_job",
+                        to="vendor_pulse.vendor",
+                    ),
+                ),
+            ],
+        ),
+    ]
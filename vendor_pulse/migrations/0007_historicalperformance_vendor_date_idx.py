@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendor_pulse", "0006_purchaseorder_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="historicalperformance",
+            index=models.Index(fields=["vendor", "date"], name="hp_vendor_date_idx"),
+        ),
+    ]
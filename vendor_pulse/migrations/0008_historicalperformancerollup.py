@@ -0,0 +1,61 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendor_pulse", "0007_historicalperformance_vendor_date_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HistoricalPerformanceRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[("day", "Day"), ("week", "Week")], max_length=10
+                    ),
+                ),
+                ("period_start", models.DateTimeField()),
+                ("last_date", models.DateTimeField()),
+                ("count", models.PositiveIntegerField()),
+                ("metrics", models.JSONField()),
+                (
+                    "vendor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="historical_performance_rollups",
+                        to="vendor_pulse.vendor",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["vendor", "period_start"],
+                        name="hpr_vendor_period_start_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="historicalperformancerollup",
+            constraint=models.UniqueConstraint(
+                fields=("vendor", "resolution", "period_start"),
+                name="hpr_vendor_resolution_period_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:47
+
+from django.db import migrations, models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def backfill_completed_at(apps, schema_editor):
+    '''
+        Existing completed purchase orders are taken as completed now, and
+        the on-time counts recounted against that time.
+    '''
+    PurchaseOrder = apps.get_model("vendor_pulse", "PurchaseOrder")
+    VendorPerformanceCounter = apps.get_model(
+        "vendor_pulse", "VendorPerformanceCounter"
+    )
+    PurchaseOrder.objects.filter(status="completed").update(
+        completed_at=timezone.now()
+    )
+    on_time = PurchaseOrder.objects.filter(
+        vendor=OuterRef("vendor"),
+        status="completed",
+        delivery_date__lte=F("completed_at"),
+    ).values("vendor").annotate(count=Count("id")).values("count")
+    VendorPerformanceCounter.objects.update(on_time_count=Coalesce(
+        Subquery(on_time, output_field=IntegerField()), 0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendor_pulse", "0009_vendor_metric_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="purchaseorder",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(
+            backfill_completed_at, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.11 on 2026-10-18 21:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vendor_pulse", "0010_purchaseorder_completed_at"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="purchaseorder",
+            name="po_vendor_status_delivery_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="purchaseorder",
+            name="po_status_idx",
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=["vendor", "status", "id"], name="po_vendor_status_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(fields=["vendor", "id"], name="po_vendor_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(fields=["status", "id"], name="po_status_id_idx"),
+        ),
+    ]
@@ -1,9 +1,134 @@
-from django.db import models
-from django.db.models import Avg, F
+from django.db import IntegrityError, models, transaction
+from django.db.models import Avg, Count, F, Max, Min, Q, Sum
+from django.db.models.functions import Coalesce, Trunc
 from django.utils import timezone
 
+from .cache import (
+    get_response_cache,
+    invalidate_cached_performance,
+    PURCHASE_ORDER,
+)
+from .conf import get_setting, METRICS_MODE_DEFERRED
+from .profiling import profiled, record_snapshots
+
+
+class VendorQuerySet(models.QuerySet):
+    @profiled
+    def calculate_performance_metrics(self):
+        '''
+            Calculates the performance metrics of every vendor in the queryset
+            with one GROUP BY query per batch of vendors.
+            Returns a mapping of vendor id to its metrics.
+        '''
+        return {
+            vendor_id: VendorPerformanceCounter(**totals).performance_metrics
+            for vendor_id, totals in self.performance_totals().items()
+        }
+
+    def performance_totals(self):
+        batch_size = get_setting("BULK_BATCH_SIZE")
+        vendor_ids = list(self.values_list("pk", flat=True))
+        totals = {}
+        for start in range(0, len(vendor_ids), batch_size):
+            batch = vendor_ids[start:start + batch_size]
+            totals.update(dict.fromkeys(batch))
+            totals.update(PurchaseOrder.objects.filter(
+                vendor_id__in=batch
+            ).performance_totals_by_vendor())
+        return {
+            vendor_id: vendor_totals or VendorPerformanceCounter.zero_totals()
+            for vendor_id, vendor_totals in totals.items()
+        }
+
+    @profiled
+    def recalculate_performance_metrics(self, snapshots=True):
+        '''
+            Rebuilds the performance counters of every vendor in the queryset
+            and saves their metrics with batched UPDATEs and snapshot INSERTs
+            instead of one of each per vendor. Pass `snapshots=False` to skip
+            the historical performance snapshots.
+        '''
+        return self.save_performance_totals(
+            self.performance_totals(), snapshots=snapshots
+        )
+
+    def save_performance_totals(self, totals, snapshots=True):
+        '''
+            Saves `totals`, a mapping of vendor id to performance counter
+            values, as the counters and metrics of the vendors in the
+            queryset.
+        '''
+        batch_size = get_setting("BULK_BATCH_SIZE")
+        vendors = list(self)
+        counters = []
+        for vendor in vendors:
+            counter = VendorPerformanceCounter(
+                vendor=vendor, **totals[vendor.pk]
+            )
+            for metric, value in counter.performance_metrics.items():
+                setattr(vendor, metric, value)
+            counters.append(counter)
+
+        with transaction.atomic():
+            VendorPerformanceCounter.objects.bulk_create(
+                counters,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["vendor"],
+                update_fields=VendorPerformanceCounter.COUNTER_FIELDS,
+            )
+            Vendor.objects.bulk_update(
+                vendors, Vendor.PERFORMANCE_METRICS, batch_size=batch_size
+            )
+            invalidate_cached_performance(*totals)
+            if snapshots:
+                HistoricalPerformance.objects.bulk_create(
+                    [
+                        vendor.build_historical_performance()
+                        for vendor in vendors
+                    ],
+                    batch_size=batch_size
+                )
+                record_snapshots(len(vendors))
+        return vendors
+
+    def ranked(self, metric, descending=True, min_orders=0):
+        '''
+            Orders the vendors by `metric`, breaking ties by id, so the
+            database can walk the metric's index and stop after the first
+            rows. Vendors are annotated with their `total_orders`.
+        '''
+        queryset = self.annotate(
+            total_orders=Coalesce("performance_counter__total_count", 0)
+        )
+        if min_orders:
+            queryset = queryset.filter(
+                performance_counter__total_count__gte=min_orders
+            )
+        if descending:
+            return queryset.order_by(f"-{metric}", "-id")
+        return queryset.order_by(metric, "id")
+
+    def refresh_performance_metrics(self):
+        '''
+            Recalculates the metrics of every vendor in the queryset, or
+            queues them when metrics are deferred.
+        '''
+        if get_setting("METRICS_MODE") == METRICS_MODE_DEFERRED:
+            for vendor in self:
+                VendorMetricsJob.mark_dirty(vendor)
+            return
+        self.recalculate_performance_metrics()
+
 
 class Vendor(models.Model):
+    PERFORMANCE_METRICS = (
+        "on_time_delivery_rate",
+        "quality_rating_avg",
+        "average_response_time",
+        "fulfillment_rate",
+    )
+
     name = models.CharField(max_length=200)
     contact_details = models.TextField()
     address = models.TextField()
@@ -13,11 +138,33 @@ class Vendor(models.Model):
     average_response_time = models.FloatField(default=0.0)
     fulfillment_rate = models.FloatField(default=0.0)
 
+    objects = VendorQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["on_time_delivery_rate"],
+                name="vendor_on_time_rate_idx"
+            ),
+            models.Index(
+                fields=["quality_rating_avg"],
+                name="vendor_quality_rating_idx"
+            ),
+            models.Index(
+                fields=["average_response_time"],
+                name="vendor_response_time_idx"
+            ),
+            models.Index(
+                fields=["fulfillment_rate"],
+                name="vendor_fulfillment_rate_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.vendor_code
 
+    @profiled
     def calculate_on_time_delivery_rate(self):
-        current_time = timezone.now()
         completed_orders = self.purchase_orders.filter(
             status=PurchaseOrder.COMPLETED
         )
@@ -25,24 +172,32 @@ class Vendor(models.Model):
         if completed_count == 0:
             return 0
         on_time_count = completed_orders.filter(
-            delivery_date__lte=current_time
+            delivery_date__lte=F("completed_at")
         ).count()
         return on_time_count / completed_count
 
+    def get_performance_counter(self):
+        try:
+            return self.performance_counter
+        except VendorPerformanceCounter.DoesNotExist:
+            return VendorPerformanceCounter.rebuild(self)
+
+    @profiled
     def update_on_time_delivery_rate(self):
-        self.on_time_delivery_rate = self.calculate_on_time_delivery_rate()
-        self.save(update_fields=["on_time_delivery_rate"])
+        self.update_performance_metrics(["on_time_delivery_rate"])
 
+    @profiled
     def calculate_quality_rating_avg(self):
         return self.purchase_orders.filter(
             status=PurchaseOrder.COMPLETED,
             quality_rating__isnull=False
         ).aggregate(Avg("quality_rating", default=0.0))["quality_rating__avg"]
 
+    @profiled
     def update_quality_rating_avg(self):
-        self.quality_rating_avg = self.calculate_quality_rating_avg()
-        self.save(update_fields=["quality_rating_avg"])
+        self.update_performance_metrics(["quality_rating_avg"])
 
+    @profiled
     def calculate_average_response_time(self):
         average_response_time = self.purchase_orders.annotate(
             response_time_diff=F("acknowledgment_date") - F("issue_date"),
@@ -55,10 +210,11 @@ class Vendor(models.Model):
 
         return average_response_time.total_seconds()
 
+    @profiled
     def update_average_response_time(self):
-        self.average_response_time = self.calculate_average_response_time()
-        self.save(update_fields=["average_response_time"])
+        self.update_performance_metrics(["average_response_time"])
 
+    @profiled
     def calculate_fulfillment_rate(self):
         total_orders = self.purchase_orders.count()
         completed_count = self.purchase_orders.filter(
@@ -68,12 +224,73 @@ class Vendor(models.Model):
             return 0
         return completed_count / total_orders
 
+    @profiled
     def update_fulfillment_rate(self):
-        self.fulfillment_rate = self.calculate_fulfillment_rate()
-        self.save(update_fields=["fulfillment_rate"])
+        self.update_performance_metrics(["fulfillment_rate"])
+
+    @profiled
+    def update_performance_metrics(
+        self, metrics=PERFORMANCE_METRICS, changed_metrics=None
+    ):
+        '''
+            Refreshes `metrics` from the performance counter and persists them
+            in a single UPDATE, which records a single historical performance
+            snapshot. Pass the `changed_metrics` whose value the update
+            changes, if known: when there are none, the cached performance
+            response is kept.
+        '''
+        counter = self.get_performance_counter()
+        for metric in metrics:
+            setattr(self, metric, getattr(counter, metric))
+        self._changed_metrics = changed_metrics
+        try:
+            self.save(update_fields=list(metrics))
+        finally:
+            self._changed_metrics = None
+
+    @profiled
+    def calculate_performance_metrics(self):
+        '''
+            Calculates all four performance metrics with a single query.
+        '''
+        return VendorPerformanceCounter(
+            **self.purchase_orders.performance_totals()
+        ).performance_metrics
+
+    @profiled
+    def recalculate_performance_metrics(self):
+        VendorPerformanceCounter.rebuild(self)
+        self.update_performance_metrics()
+
+    def get_performance_history(self, start, end, bucket):
+        '''
+            Buckets the vendor's performance history between `start` and
+            `end`, reading both the raw snapshots and the compacted roll-ups.
+        '''
+        buckets = self.historical_performances.filter(
+            date__gte=start, date__lte=end
+        ).bucketed(bucket) + self.historical_performance_rollups.filter(
+            period_start__gte=start, period_start__lte=end
+        ).bucketed(bucket)
+
+        grouped_buckets = {}
+        for history_bucket in buckets:
+            grouped_buckets.setdefault(
+                history_bucket["bucket"], []
+            ).append(history_bucket)
+        return [
+            merge_performance_buckets(grouped_buckets[period])
+            for period in sorted(grouped_buckets)
+        ]
 
     def create_historical_performance(self):
-        return HistoricalPerformance.objects.create(
+        historical_performance = self.build_historical_performance()
+        historical_performance.save()
+        record_snapshots()
+        return historical_performance
+
+    def build_historical_performance(self):
+        return HistoricalPerformance(
             vendor=self,
             date=timezone.now(),
             on_time_delivery_rate=self.on_time_delivery_rate,
@@ -83,6 +300,149 @@ class Vendor(models.Model):
         )
 
 
+class PurchaseOrderQuerySet(models.QuerySet):
+    def performance_aggregates(self):
+        '''
+            Conditional aggregates computing every performance counter in one
+            pass over the purchase orders.
+        '''
+        completed = Q(status=PurchaseOrder.COMPLETED)
+        rated = completed & Q(quality_rating__isnull=False)
+        acknowledged = Q(acknowledgment_date__isnull=False)
+        return {
+            "total_count": Count("id"),
+            "completed_count": Count("id", filter=completed),
+            "on_time_count": Count(
+                "id",
+                filter=completed & Q(delivery_date__lte=F("completed_at"))
+            ),
+            "quality_rating_sum": Sum(
+                "quality_rating", filter=rated, default=0.0
+            ),
+            "quality_rating_count": Count("id", filter=rated),
+            "response_time_sum": Sum(
+                F("acknowledgment_date") - F("issue_date"),
+                filter=acknowledged
+            ),
+            "response_time_count": Count("id", filter=acknowledged),
+        }
+
+    @staticmethod
+    def normalize_performance_totals(totals):
+        response_time_sum = totals.pop("response_time_sum")
+        totals["response_time_sum"] = (
+            response_time_sum.total_seconds() if response_time_sum else 0.0
+        )
+        return totals
+
+    def performance_totals(self):
+        return self.normalize_performance_totals(
+            self.aggregate(**self.performance_aggregates())
+        )
+
+    def performance_totals_by_vendor(self):
+        return {
+            totals.pop("vendor_id"): self.normalize_performance_totals(totals)
+            for totals in self.order_by().values("vendor_id").annotate(
+                **self.performance_aggregates()
+            )
+        }
+
+    def bulk_upsert(self, purchase_orders, batch_size=None):
+        '''
+            Inserts `purchase_orders`, updating existing rows with the same
+            `po_number`, without sending per-row signals. The metrics of every
+            affected vendor, including vendors purchase orders moved away
+            from, are recalculated once afterwards.
+            Returns the number of created and updated purchase orders.
+        '''
+        batch_size = batch_size or get_setting("BULK_BATCH_SIZE")
+        update_fields = [
+            field.name for field in PurchaseOrder._meta.concrete_fields
+            if field.name not in ("id", "po_number", "issue_date")
+        ]
+        vendor_ids = set()
+        updated_ids = set()
+        current_time = timezone.now()
+        with transaction.atomic():
+            for start in range(0, len(purchase_orders), batch_size):
+                batch = purchase_orders[start:start + batch_size]
+                existing = {
+                    po_number: (pk, vendor_id, completed_at)
+                    for pk, po_number, vendor_id, completed_at
+                    in self.filter(po_number__in=[
+                        purchase_order.po_number for purchase_order in batch
+                    ]).values_list(
+                        "pk", "po_number", "vendor_id", "completed_at"
+                    )
+                }
+                for pk, vendor_id, _ in existing.values():
+                    vendor_ids.add(vendor_id)
+                    updated_ids.add(pk)
+                for purchase_order in batch:
+                    vendor_ids.add(purchase_order.vendor_id)
+                    # Orders that stay completed keep their completion time.
+                    if purchase_order.po_number in existing:
+                        purchase_order.completed_at = existing[
+                            purchase_order.po_number
+                        ][2]
+                    purchase_order.set_completed_at(current_time)
+                self.bulk_create(
+                    batch,
+                    update_conflicts=True,
+                    unique_fields=["po_number"],
+                    update_fields=update_fields,
+                )
+            Vendor.objects.filter(
+                pk__in=vendor_ids
+            ).refresh_performance_metrics()
+        get_response_cache().invalidate(PURCHASE_ORDER, *updated_ids)
+        return len(purchase_orders) - len(updated_ids), len(updated_ids)
+
+    def bulk_transition(self, changes, batch_size=None):
+        '''
+            Applies `changes`, a mapping of `po_number` to the new `status`,
+            `quality_rating` and/or `acknowledgment_date`, with batched
+            UPDATEs in one transaction and recalculates the metrics of each
+            affected vendor once. Returns the updated purchase orders.
+        '''
+        batch_size = batch_size or get_setting("BULK_BATCH_SIZE")
+        po_numbers = list(changes)
+        with transaction.atomic():
+            purchase_orders = []
+            for start in range(0, len(po_numbers), batch_size):
+                purchase_orders.extend(self.filter(
+                    po_number__in=po_numbers[start:start + batch_size]
+                ))
+
+            update_fields = set()
+            current_time = timezone.now()
+            for purchase_order in purchase_orders:
+                for field, value in changes[purchase_order.po_number].items():
+                    setattr(purchase_order, field, value)
+                    update_fields.add(field)
+                purchase_order.set_completed_at(current_time)
+            if "status" in update_fields:
+                update_fields.add("completed_at")
+
+            if update_fields:
+                self.bulk_update(
+                    purchase_orders,
+                    sorted(update_fields),
+                    batch_size=batch_size
+                )
+            Vendor.objects.filter(pk__in={
+                purchase_order.vendor_id for purchase_order in purchase_orders
+            }).refresh_performance_metrics()
+
+        for purchase_order in purchase_orders:
+            purchase_order.capture_original_values()
+        get_response_cache().invalidate(PURCHASE_ORDER, *(
+            purchase_order.pk for purchase_order in purchase_orders
+        ))
+        return purchase_orders
+
+
 class PurchaseOrder(models.Model):
     PENDING = "pending"
     COMPLETED = "completed"
@@ -105,16 +465,247 @@ class PurchaseOrder(models.Model):
     quality_rating = models.FloatField(null=True, blank=True)
     issue_date = models.DateTimeField(auto_now_add=True)
     acknowledgment_date = models.DateTimeField(null=True, blank=True)
+    # When the purchase order was last completed. Whether it was on time
+    # is decided against this time, so what it adds to the vendor's
+    # counters does not change as time passes.
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = PurchaseOrderQuerySet.as_manager()
+
+    class Meta:
+        # Lists are paginated by id, so the status and vendor filters use
+        # indexes ending with it: the matching rows come in page order and
+        # are read a page at a time, whatever else is filtered.
+        indexes = [
+            models.Index(
+                fields=["vendor", "status", "id"],
+                name="po_vendor_status_id_idx"
+            ),
+            models.Index(fields=["vendor", "id"], name="po_vendor_id_idx"),
+            models.Index(fields=["status", "id"], name="po_status_id_idx"),
+            models.Index(fields=["order_date"], name="po_order_date_idx"),
+            models.Index(
+                fields=["delivery_date"], name="po_delivery_date_idx"
+            ),
+            models.Index(fields=["issue_date"], name="po_issue_date_idx"),
+        ]
+
+    PERFORMANCE_FIELDS = (
+        "vendor_id",
+        "status",
+        "delivery_date",
+        "quality_rating",
+        "issue_date",
+        "acknowledgment_date",
+        "completed_at",
+    )
 
     def __str__(self) -> str:
         return self.po_number
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.capture_original_values()
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "status" in update_fields:
+            self.set_completed_at()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "completed_at"}
+        # Fields never loaded have their originals fetched while the row
+        # still holds them.
+        self.get_original_values()
+        super().save(*args, **kwargs)
+        self.capture_original_values(kwargs.get("update_fields"))
+
+    def set_completed_at(self, current_time=None):
+        if self.status != PurchaseOrder.COMPLETED:
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = current_time or timezone.now()
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.capture_original_values(fields)
+
+    def get_saved_fields(self, update_fields=None):
+        '''
+            Performance fields written by a save with `update_fields`, which
+            may name fields or their attnames.
+        '''
+        if update_fields is None:
+            return self.PERFORMANCE_FIELDS
+        attnames = {
+            self._meta.get_field(field).attname for field in update_fields
+        }
+        return tuple(
+            field for field in self.PERFORMANCE_FIELDS if field in attnames
+        )
+
+    def capture_original_values(self, fields=None):
+        '''
+            Remembers the loaded value of each performance field, or only of
+            those in `fields` when just they were saved or refreshed, so
+            changes can be detected on save without re-fetching the row.
+            Deferred fields are left out until they are loaded.
+        '''
+        self._original_values = {
+            **getattr(self, "_original_values", {}),
+            **{
+                field: self.__dict__[field]
+                for field in self.get_saved_fields(fields)
+                if field in self.__dict__
+            },
+        }
+
+    def get_original_values(self):
+        '''
+            Returns the original value of every performance field, fetching
+            those never loaded from the database.
+        '''
+        original_values = getattr(self, "_original_values", {})
+        missing_fields = [
+            field for field in self.PERFORMANCE_FIELDS
+            if field not in original_values
+        ]
+        if missing_fields and self.pk is not None and not self._state.adding:
+            self._original_values = original_values = {
+                **PurchaseOrder.objects.filter(pk=self.pk).values(
+                    *missing_fields
+                ).get(),
+                **original_values,
+            }
+        return dict(original_values)
+
+    def get_dirty_fields(self, update_fields=None):
+        '''
+            Returns the original value of every performance field that has
+            changed since the purchase order was loaded or last saved, among
+            those a save with `update_fields` writes.
+        '''
+        original_values = self.get_original_values()
+        return {
+            field: original_values[field]
+            for field in self.get_saved_fields(update_fields)
+            if field in original_values
+            and getattr(self, field) != original_values[field]
+        }
+
+    def has_changed(self, field):
+        return field in self.get_dirty_fields()
+
     def acknowledge(self):
         self.acknowledgment_date = timezone.now()
         self.save(update_fields=["acknowledgment_date"])
 
 
+def truncate_date(date, bucket):
+    '''
+        Python equivalent of `Trunc(date, bucket)` in the current timezone.
+    '''
+    date = timezone.localtime(date).replace(minute=0, second=0, microsecond=0)
+    if bucket == "hour":
+        return date
+    date = date.replace(hour=0)
+    if bucket == "week":
+        return date - timezone.timedelta(days=date.weekday())
+    if bucket == "month":
+        return date.replace(day=1)
+    return date
+
+
+def merge_performance_buckets(buckets):
+    '''
+        Combines buckets of the same vendor and period, as returned by
+        `bucketed`, into one. Averages are weighted by the snapshot count.
+    '''
+    if len(buckets) == 1:
+        return buckets[0]
+
+    count = sum(bucket["count"] for bucket in buckets)
+    last_bucket = max(buckets, key=lambda bucket: bucket["last_date"])
+    return {
+        "vendor_id": last_bucket["vendor_id"],
+        "bucket": last_bucket["bucket"],
+        "count": count,
+        "last_date": last_bucket["last_date"],
+        **{
+            metric: {
+                "min": min(bucket[metric]["min"] for bucket in buckets),
+                "max": max(bucket[metric]["max"] for bucket in buckets),
+                "avg": sum(
+                    bucket[metric]["avg"] * bucket["count"]
+                    for bucket in buckets
+                ) / count,
+                "last": last_bucket[metric]["last"],
+            }
+            for metric in Vendor.PERFORMANCE_METRICS
+        },
+    }
+
+
+class HistoricalPerformanceQuerySet(models.QuerySet):
+    def bucketed(self, bucket):
+        '''
+            Groups the snapshots of each vendor into `bucket` sized periods
+            and returns, per period, the number of snapshots and the
+            min/max/avg/last value of each metric. The aggregation runs in the
+            database; the last values take one more query.
+        '''
+        aggregates = {"count": Count("id"), "last_date": Max("date")}
+        for metric in Vendor.PERFORMANCE_METRICS:
+            aggregates[f"{metric}_min"] = Min(metric)
+            aggregates[f"{metric}_max"] = Max(metric)
+            aggregates[f"{metric}_avg"] = Avg(metric)
+
+        buckets = list(self.annotate(
+            bucket=Trunc("date", bucket)
+        ).order_by().values("vendor_id", "bucket").annotate(
+            **aggregates
+        ).order_by("vendor_id", "bucket"))
+
+        last_snapshots = {}
+        last_dates = list({bucket_row["last_date"] for bucket_row in buckets})
+        batch_size = get_setting("BULK_BATCH_SIZE")
+        for start in range(0, len(last_dates), batch_size):
+            snapshots = self.filter(
+                date__in=last_dates[start:start + batch_size]
+            ).order_by("date", "id").values(
+                "vendor_id", "date", *Vendor.PERFORMANCE_METRICS
+            )
+            for snapshot in snapshots:
+                last_snapshots[
+                    snapshot.pop("vendor_id"), snapshot.pop("date")
+                ] = snapshot
+
+        return [
+            {
+                "vendor_id": bucket_row["vendor_id"],
+                "bucket": bucket_row["bucket"],
+                "count": bucket_row["count"],
+                "last_date": bucket_row["last_date"],
+                **{
+                    metric: {
+                        "min": bucket_row[f"{metric}_min"],
+                        "max": bucket_row[f"{metric}_max"],
+                        "avg": bucket_row[f"{metric}_avg"],
+                        "last": last_snapshots[
+                            bucket_row["vendor_id"], bucket_row["last_date"]
+                        ][metric],
+                    }
+                    for metric in Vendor.PERFORMANCE_METRICS
+                },
+            }
+            for bucket_row in buckets
+        ]
+
+
 class HistoricalPerformance(models.Model):
+    BUCKETS = ("hour", "day", "week", "month")
+
     vendor = models.ForeignKey(
         Vendor,
         related_name="historical_performances",
@@ -126,5 +717,426 @@ class HistoricalPerformance(models.Model):
     average_response_time = models.FloatField()
     fulfillment_rate = models.FloatField()
 
+    objects = HistoricalPerformanceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["vendor", "date"], name="hp_vendor_date_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.vendor} - {self.date}"
+
+
+class HistoricalPerformanceRollupQuerySet(models.QuerySet):
+    def bucketed(self, bucket):
+        '''
+            Same as `HistoricalPerformanceQuerySet.bucketed` for roll-up rows.
+            They are few, so they are grouped in Python.
+        '''
+        buckets = {}
+        for rollup in self.order_by("vendor_id", "period_start"):
+            rollup_bucket = {
+                "vendor_id": rollup.vendor_id,
+                "bucket": truncate_date(rollup.period_start, bucket),
+                "count": rollup.count,
+                "last_date": rollup.last_date,
+                **rollup.metrics,
+            }
+            key = rollup.vendor_id, rollup_bucket["bucket"]
+            buckets[key] = merge_performance_buckets(
+                [rollup_bucket, buckets[key]] if key in buckets
+                else [rollup_bucket]
+            )
+        return list(buckets.values())
+
+
+class HistoricalPerformanceRollup(models.Model):
+    '''
+        Historical performance snapshots of a vendor compacted into one row
+        per day or week by `compact_performance_history`. `metrics` holds the
+        min/max/avg/last value of every metric over the period.
+    '''
+    DAY = "day"
+    WEEK = "week"
+
+    resolution_choices = (
+        (DAY, "Day"),
+        (WEEK, "Week")
+    )
+
+    vendor = models.ForeignKey(
+        Vendor,
+        related_name="historical_performance_rollups",
+        on_delete=models.CASCADE
+    )
+    resolution = models.CharField(choices=resolution_choices, max_length=10)
+    period_start = models.DateTimeField()
+    last_date = models.DateTimeField()
+    count = models.PositiveIntegerField()
+    metrics = models.JSONField()
+
+    objects = HistoricalPerformanceRollupQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "resolution", "period_start"],
+                name="hpr_vendor_resolution_period_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["vendor", "period_start"],
+                name="hpr_vendor_period_start_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.vendor} - {self.resolution} {self.period_start}"
+
+    def as_bucket(self):
+        return {
+            "vendor_id": self.vendor_id,
+            "bucket": self.period_start,
+            "count": self.count,
+            "last_date": self.last_date,
+            **self.metrics,
+        }
+
+    @classmethod
+    def save_buckets(cls, resolution, buckets):
+        '''
+            Stores `buckets` as roll-up rows, merging them into any existing
+            row of the same vendor and period.
+        '''
+        existing = {
+            (rollup.vendor_id, rollup.period_start): rollup.as_bucket()
+            for rollup in cls.objects.filter(
+                resolution=resolution,
+                vendor_id__in={bucket["vendor_id"] for bucket in buckets},
+                period_start__in={bucket["bucket"] for bucket in buckets},
+            )
+        }
+        rollups = []
+        for bucket in buckets:
+            key = bucket["vendor_id"], bucket["bucket"]
+            if key in existing:
+                bucket = merge_performance_buckets([existing[key], bucket])
+            rollups.append(cls(
+                vendor_id=bucket["vendor_id"],
+                resolution=resolution,
+                period_start=bucket["bucket"],
+                last_date=bucket["last_date"],
+                count=bucket["count"],
+                metrics={
+                    metric: bucket[metric]
+                    for metric in Vendor.PERFORMANCE_METRICS
+                },
+            ))
+        cls.objects.bulk_create(
+            rollups,
+            batch_size=get_setting("BULK_BATCH_SIZE"),
+            update_conflicts=True,
+            unique_fields=["vendor", "resolution", "period_start"],
+            update_fields=["last_date", "count", "metrics"],
+        )
+        return len(rollups)
+
+    @classmethod
+    def compact(cls, vendor_ids, raw_before, daily_before):
+        '''
+            Rolls the oldest day of the vendors' raw snapshots older than
+            `raw_before` into daily rows or, once there are none, the oldest
+            week of their daily rows older than `daily_before` into weekly
+            rows. Each call is one short transaction, so API writers do not
+            wait long for the lock; call it until it removes nothing.
+            Returns the number of rows removed and roll-up rows written.
+        '''
+        snapshots = HistoricalPerformance.objects.filter(
+            vendor_id__in=vendor_ids, date__lt=raw_before
+        )
+        oldest = snapshots.aggregate(oldest=Min("date"))["oldest"]
+        if oldest is not None:
+            snapshots = snapshots.filter(
+                date__lt=truncate_date(oldest, "day")
+                + timezone.timedelta(days=1)
+            )
+            with transaction.atomic():
+                written = cls.save_buckets(cls.DAY, snapshots.bucketed("day"))
+                removed, _ = snapshots.delete()
+            return removed, written
+
+        daily_rollups = cls.objects.filter(
+            vendor_id__in=vendor_ids,
+            resolution=cls.DAY,
+            period_start__lt=daily_before
+        )
+        oldest = daily_rollups.aggregate(
+            oldest=Min("period_start")
+        )["oldest"]
+        if oldest is None:
+            return 0, 0
+
+        daily_rollups = daily_rollups.filter(
+            period_start__lt=truncate_date(oldest, "week")
+            + timezone.timedelta(weeks=1)
+        )
+        with transaction.atomic():
+            weekly_buckets = daily_rollups.bucketed("week")
+            removed, _ = daily_rollups.delete()
+            written = cls.save_buckets(cls.WEEK, weekly_buckets)
+        return removed, written
+
+
+class VendorPerformanceCounter(models.Model):
+    '''
+        Running aggregates of a vendor's purchase orders. They are adjusted by
+        deltas on every purchase order create/update/delete so the performance
+        metrics can be derived without scanning the purchase orders table.
+        `rebuild` recomputes them from scratch for repair.
+    '''
+    COUNTER_FIELDS = (
+        "total_count",
+        "completed_count",
+        "on_time_count",
+        "quality_rating_sum",
+        "quality_rating_count",
+        "response_time_sum",
+        "response_time_count",
+    )
+    METRIC_COUNTER_FIELDS = {
+        "on_time_delivery_rate": ("completed_count", "on_time_count"),
+        "quality_rating_avg": ("quality_rating_sum", "quality_rating_count"),
+        "average_response_time": (
+            "response_time_sum", "response_time_count"
+        ),
+        "fulfillment_rate": ("total_count", "completed_count"),
+    }
+
+    vendor = models.OneToOneField(
+        Vendor,
+        related_name="performance_counter",
+        on_delete=models.CASCADE
+    )
+    total_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    on_time_count = models.PositiveIntegerField(default=0)
+    quality_rating_sum = models.FloatField(default=0.0)
+    quality_rating_count = models.PositiveIntegerField(default=0)
+    response_time_sum = models.FloatField(default=0.0)
+    response_time_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.vendor}"
+
+    @classmethod
+    def zero_totals(cls):
+        return dict.fromkeys(cls.COUNTER_FIELDS, 0)
+
+    @property
+    def performance_metrics(self):
+        return {
+            metric: getattr(self, metric)
+            for metric in Vendor.PERFORMANCE_METRICS
+        }
+
+    @property
+    def on_time_delivery_rate(self):
+        if self.completed_count == 0:
+            return 0
+        return self.on_time_count / self.completed_count
+
+    @property
+    def quality_rating_avg(self):
+        if self.quality_rating_count == 0:
+            return 0.0
+        return self.quality_rating_sum / self.quality_rating_count
+
+    @property
+    def average_response_time(self):
+        if self.response_time_count == 0:
+            return 0
+        return self.response_time_sum / self.response_time_count
+
+    @property
+    def fulfillment_rate(self):
+        if self.total_count == 0:
+            return 0
+        return self.completed_count / self.total_count
+
+    @classmethod
+    def contribution(cls, values):
+        '''
+            Counter values a single purchase order adds to its vendor, given
+            its `status`, `delivery_date`, `quality_rating`, `issue_date`,
+            `acknowledgment_date` and `completed_at`. It depends on nothing
+            else, so the contribution subtracted when the purchase order
+            changes is the one that was added.
+        '''
+        is_completed = values["status"] == PurchaseOrder.COMPLETED
+        is_rated = is_completed and values["quality_rating"] is not None
+        is_acknowledged = (
+            values["acknowledgment_date"] is not None
+            and values["issue_date"] is not None
+        )
+        return {
+            "total_count": 1,
+            "completed_count": int(is_completed),
+            "on_time_count": int(
+                is_completed
+                and values["delivery_date"] <= values["completed_at"]
+            ),
+            "quality_rating_sum": (
+                values["quality_rating"] if is_rated else 0.0
+            ),
+            "quality_rating_count": int(is_rated),
+            "response_time_sum": (
+                (
+                    values["acknowledgment_date"] - values["issue_date"]
+                ).total_seconds() if is_acknowledged else 0.0
+            ),
+            "response_time_count": int(is_acknowledged),
+        }
+
+    @classmethod
+    def delta(cls, old_values, new_values):
+        old = cls.contribution(old_values) if old_values else {}
+        new = cls.contribution(new_values) if new_values else {}
+        delta = {
+            field: new.get(field, 0) - old.get(field, 0)
+            for field in cls.COUNTER_FIELDS
+        }
+        return {field: value for field, value in delta.items() if value}
+
+    @classmethod
+    def changed_metrics(cls, delta):
+        return [
+            metric for metric, fields in cls.METRIC_COUNTER_FIELDS.items()
+            if any(field in delta for field in fields)
+        ]
+
+    def get_changed_metrics(self, delta):
+        '''
+            Returns the metrics whose value changed when `delta` was applied
+            to the counter.
+        '''
+        previous = VendorPerformanceCounter(**{
+            field: getattr(self, field) - delta.get(field, 0)
+            for field in self.COUNTER_FIELDS
+        })
+        return [
+            metric for metric in self.changed_metrics(delta)
+            if getattr(previous, metric) != getattr(self, metric)
+        ]
+
+    @classmethod
+    @profiled
+    def apply_delta(cls, vendor: Vendor, delta):
+        '''
+            Adds `delta` to the vendor's counters in a single UPDATE. A
+            vendor without counters yet gets them rebuilt instead, which
+            already accounts for the change being applied.
+        '''
+        if not delta:
+            return vendor.get_performance_counter()
+
+        updated = cls.objects.filter(vendor=vendor).update(**{
+            field: F(field) + value for field, value in delta.items()
+        })
+        if not updated:
+            return cls.rebuild(vendor)
+
+        counter = cls.objects.get(vendor=vendor)
+        vendor.performance_counter = counter
+        return counter
+
+    @classmethod
+    @profiled
+    def rebuild(cls, vendor: Vendor):
+        counter, _ = cls.objects.update_or_create(
+            vendor=vendor,
+            defaults=vendor.purchase_orders.performance_totals()
+        )
+        vendor.performance_counter = counter
+        return counter
+
+
+class VendorMetricsJob(models.Model):
+    '''
+        Marks a vendor whose performance metrics need to be recalculated by
+        the `process_vendor_metrics` worker. There is at most one job per
+        vendor, so repeated marks collapse into a single recalculation.
+    '''
+    vendor = models.OneToOneField(
+        Vendor,
+        related_name="metrics_job",
+        on_delete=models.CASCADE
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    marked_at = models.DateTimeField()
+    mark_count = models.PositiveIntegerField(default=1)
+
+    def __str__(self) -> str:
+        return f"{self.vendor} - {self.marked_at}"
+
+    @classmethod
+    def mark_dirty(cls, vendor: Vendor):
+        current_time = timezone.now()
+        updated = cls.objects.filter(vendor=vendor).update(
+            marked_at=current_time,
+            mark_count=F("mark_count") + 1
+        )
+        if updated:
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(vendor=vendor, marked_at=current_time)
+        except IntegrityError:
+            cls.objects.filter(vendor=vendor).update(
+                marked_at=current_time,
+                mark_count=F("mark_count") + 1
+            )
+
+    @classmethod
+    def overdue(cls, max_delay_seconds=None):
+        '''
+            Jobs first marked more than `max_delay_seconds` ago, which are
+            processed even if the vendor is still being marked.
+        '''
+        if max_delay_seconds is None:
+            return Q(pk__in=[])
+        return Q(created_at__lte=(
+            timezone.now() - timezone.timedelta(seconds=max_delay_seconds)
+        ))
+
+    @classmethod
+    def pending(cls, debounce_seconds=0, max_delay_seconds=None):
+        settled_before = (
+            timezone.now() - timezone.timedelta(seconds=debounce_seconds)
+        )
+        return cls.objects.filter(
+            Q(marked_at__lte=settled_before)
+            | cls.overdue(max_delay_seconds)
+        ).order_by("created_at")
+
+    def process(self, max_delay_seconds=None):
+        '''
+            Claims the job by deleting it and recalculates the vendor metrics.
+            Returns False when another worker claimed it first, or when the
+            vendor was marked again since the job was read and the job is not
+            overdue, in which case it is left for a later run.
+        '''
+        with transaction.atomic():
+            claimed, _ = VendorMetricsJob.objects.filter(
+                Q(marked_at=self.marked_at)
+                | VendorMetricsJob.overdue(max_delay_seconds),
+                pk=self.pk,
+            ).delete()
+            if not claimed:
+                return False
+            self.vendor.recalculate_performance_metrics()
+        return True
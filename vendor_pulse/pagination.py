@@ -0,0 +1,34 @@
+from asgiref.sync import sync_to_async
+
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class IdCursorPagination(CursorPagination):
+    '''
+        Cursor pagination over the primary key, so each page is an indexed
+        range scan no matter how deep into the table it is.
+    '''
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        '''
+            `paginate_queryset` for async views. Its page query runs in the
+            thread the async ORM runs queries in.
+        '''
+        return await sync_to_async(self.paginate_queryset)(
+            queryset, request, view
+        )
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
@@ -0,0 +1,107 @@
+import functools
+import threading
+import time
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .conf import get_setting
+
+_frames = ContextVar("hot_path_frames", default=())
+
+
+class Frame:
+    '''
+        Queries and historical performance snapshots of a profiled call
+        still running.
+    '''
+    def __init__(self):
+        self.queries = 0
+        self.snapshots = 0
+
+
+def count_query(execute, sql, params, many, context):
+    '''
+        Database execute wrapper counting each query in every profiled call
+        running, so the counts of a call include the calls it makes.
+    '''
+    for frame in _frames.get():
+        frame.queries += 1
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_counter(connection, **kwargs):
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+def record_snapshots(count=1):
+    for frame in _frames.get():
+        frame.snapshots += count
+
+
+class HotPathProfiler:
+    '''
+        In-process call count, cumulative seconds, queries and snapshots
+        written of each profiled function, by name.
+    '''
+    FIELDS = ("calls", "seconds", "queries", "snapshots")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, seconds, frame):
+        with self._lock:
+            stats = self._stats.setdefault(name, dict.fromkeys(self.FIELDS, 0))
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["queries"] += frame.queries
+            stats["snapshots"] += frame.snapshots
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: dict(stats)
+                for name, stats in sorted(self._stats.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+_profiler = HotPathProfiler()
+
+
+def get_profiler():
+    return _profiler
+
+
+def profiled(func):
+    '''
+        Records the calls of `func` in the HotPathProfiler while the
+        HOT_PATH_PROFILING setting is on. Time, queries and snapshots are
+        cumulative: those of nested profiled calls are included.
+    '''
+    module = func.__module__.rsplit(".", 1)[-1]
+    name = f"{module}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not get_setting("HOT_PATH_PROFILING"):
+            return func(*args, **kwargs)
+
+        frame = Frame()
+        token = _frames.set((*_frames.get(), frame))
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            _frames.reset(token)
+            _profiler.record(name, seconds, frame)
+
+    return wrapper
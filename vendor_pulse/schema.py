@@ -1,9 +1,20 @@
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from drf_spectacular.openapi import OpenApiTypes, OpenApiParameter
 
+from .exports import CONTENT_TYPES
+
 from .serializers import (
     VendorPerformanceSerializer,
     PurchaseOrderSerializer,
+    PurchaseOrderBulkResultSerializer,
+    PurchaseOrderTransitionSerializer,
+    PurchaseOrderTransitionResultSerializer,
+    PerformanceHistoryQuerySerializer,
+    PerformanceHistoryBucketSerializer,
+    VendorRankingQuerySerializer,
+    VendorRankingSerializer,
+    ResponseCacheStatsSerializer,
+    ExportQuerySerializer,
 )
 
 
@@ -22,6 +33,9 @@ class PurchaseOrderSchema:
             partial_update=cls.partial_update_purchase_order(),
             destroy=cls.destroy_purchase_order(),
             acknowledge=cls.acknowledge_purchase_order(),
+            export=cls.export_purchase_orders(),
+            bulk=cls.bulk_purchase_orders(),
+            bulk_transition=cls.bulk_transition_purchase_orders(),
         )
 
     @classmethod
@@ -42,7 +56,10 @@ class PurchaseOrderSchema:
     def retrieve_purchase_order(cls):
         return extend_schema(
             summary="Retrieve purchase order",
-            description="Get a purchase order by ID."
+            description='''Get a purchase order by ID. Responses are
+            cached and carry an `ETag` header; send it back in
+            `If-None-Match` to get a 304 when the purchase order has not
+            changed.'''
         )
 
     @classmethod
@@ -75,6 +92,44 @@ class PurchaseOrderSchema:
             responses=PurchaseOrderSerializer
         )
 
+    @classmethod
+    def export_purchase_orders(cls):
+        return extend_schema(
+            summary="Export purchase orders",
+            description='''Stream every purchase order matching the list
+            filters as CSV or newline-delimited JSON, ordered by ID.''',
+            parameters=[ExportQuerySerializer],
+            filters=True,
+            responses={
+                (200, content_type): OpenApiTypes.STR
+                for content_type in CONTENT_TYPES.values()
+            }
+        )
+
+    @classmethod
+    def bulk_purchase_orders(cls):
+        return extend_schema(
+            summary="Bulk create or update purchase orders",
+            description='''Create purchase orders in bulk. Purchase orders
+            with an existing `po_number` are updated instead. Invalid rows are
+            reported by their index and skipped, and the performance metrics
+            of each affected vendor are recalculated once.''',
+            request=PurchaseOrderSerializer(many=True),
+            responses=PurchaseOrderBulkResultSerializer
+        )
+
+    @classmethod
+    def bulk_transition_purchase_orders(cls):
+        return extend_schema(
+            summary="Bulk update purchase order status",
+            description='''Update the status, quality rating and/or
+            acknowledgment date of many purchase orders by `po_number` in one
+            transaction. The performance metrics of each affected vendor are
+            recalculated once.''',
+            request=PurchaseOrderTransitionSerializer(many=True),
+            responses=PurchaseOrderTransitionResultSerializer
+        )
+
 
 class VendorSchema:
     @classmethod
@@ -91,6 +146,9 @@ class VendorSchema:
             partial_update=cls.partial_update_vendor(),
             destroy=cls.destroy_vendor(),
             performance=cls.vendor_performance(),
+            performance_history=cls.vendor_performance_history(),
+            performance_history_export=cls.export_performance_history(),
+            ranking=cls.vendor_ranking(),
         )
 
     @classmethod
@@ -111,7 +169,9 @@ class VendorSchema:
     def retrieve_vendor(cls):
         return extend_schema(
             summary="Retrieve vendor",
-            description="Get a vendor by ID."
+            description='''Get a vendor by ID. Responses are cached and
+            carry an `ETag` header; send it back in `If-None-Match` to get a
+            304 when the vendor has not changed.'''
         )
 
     @classmethod
@@ -139,7 +199,11 @@ class VendorSchema:
     def vendor_performance(cls):
         return extend_schema(
             summary="Vendor performance",
-            description="Get performance metrics for the vendor.",
+            description='''Get performance metrics for the vendor. Metrics
+            are served from a short-lived cache unless `recalculate=1` is
+            passed; `computed_at` is the time they were read from the
+            database. The `ETag` header only changes with the metrics, so
+            `If-None-Match` gets a 304 while they are unchanged.''',
             parameters=[
                 OpenApiParameter(
                     name="recalculate",
@@ -156,3 +220,76 @@ class VendorSchema:
             ],
             responses=VendorPerformanceSerializer
         )
+
+    @classmethod
+    def vendor_performance_history(cls):
+        return extend_schema(
+            summary="Vendor performance history",
+            description='''Get the vendor's historical performance between
+            `start` and `end` (the last 30 days by default), grouped into
+            hour, day, week or month buckets. Each bucket has the number of
+            snapshots and the min, max, average and last value of every
+            metric.''',
+            parameters=[PerformanceHistoryQuerySerializer],
+            responses=PerformanceHistoryBucketSerializer(many=True)
+        )
+
+    @classmethod
+    def export_performance_history(cls):
+        return extend_schema(
+            summary="Export performance history",
+            description='''Stream the performance history of every
+            vendor, or of one vendor with `vendor_code`, as CSV or
+            newline-delimited JSON, ordered by vendor and date. Raw
+            snapshots have the `raw` resolution and a count of 1. Periods
+            already compacted are exported as one `day` or `week` row per
+            roll-up, dated by the start of the period, with the average of
+            each metric over its `count` snapshots.''',
+            parameters=[ExportQuerySerializer],
+            filters=True,
+            responses={
+                (200, content_type): OpenApiTypes.STR
+                for content_type in CONTENT_TYPES.values()
+            }
+        )
+
+    @classmethod
+    def vendor_ranking(cls):
+        return extend_schema(
+            summary="Vendor ranking",
+            description='''Get the top `limit` vendors ordered by a
+            performance metric, e.g. the best on-time delivery rate
+            (`direction=desc`) or the worst average response time
+            (`direction=desc`). `min_orders` leaves out vendors with fewer
+            purchase orders.''',
+            parameters=[VendorRankingQuerySerializer],
+            responses=VendorRankingSerializer(many=True)
+        )
+
+
+class ResponseCacheSchema:
+    @classmethod
+    def schema(cls):
+        return extend_schema(
+            tags=["Cache"],
+            summary="Response cache statistics",
+            description='''Get the response cache hits and misses of this
+            process for each cached endpoint since it started. Only
+            available to staff users.''',
+            responses=ResponseCacheStatsSerializer(many=True)
+        )
+
+
+class RequestMetricsSchema:
+    @classmethod
+    def schema(cls):
+        return extend_schema(
+            tags=["Metrics"],
+            summary="Request metrics",
+            description='''Get the request duration, SQL time and SQL
+            query histograms of this process by view and method, the
+            responses by status code, the response cache hits and misses and
+            the hot path profiling counters, in the Prometheus text format.
+            Only available to staff users.''',
+            responses={(200, "text/plain"): OpenApiTypes.STR}
+        )
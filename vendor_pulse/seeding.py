@@ -0,0 +1,298 @@
+import datetime
+import json
+import random
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Vendor, PurchaseOrder, HistoricalPerformance
+
+
+def bulk_insert(model, objects, chunk_size, batch_size=None):
+    '''
+        Inserts the `objects` generator with `bulk_create`, one transaction
+        per chunk of `chunk_size` objects so memory use stays flat, and
+        returns how many were inserted. `bulk_create` sends no signals, so
+        no metrics are recalculated on the way.
+    '''
+    objects = iter(objects)
+    count = 0
+    while True:
+        chunk = list(islice(objects, chunk_size))
+        if not chunk:
+            return count
+        with transaction.atomic():
+            model.objects.bulk_create(chunk, batch_size=batch_size)
+        count += len(chunk)
+
+
+def insert_rows(model, field_names, rows, chunk_size):
+    '''
+        Same as `bulk_insert` for `rows` of values already adapted for the
+        database, in the order of `field_names`. They skip the per value
+        preparation of `bulk_create`, which costs more than the insert
+        itself on large tables.
+    '''
+    quote_name = connection.ops.quote_name
+    columns = [model._meta.get_field(name).column for name in field_names]
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote_name(model._meta.db_table),
+        ", ".join(quote_name(column) for column in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+    rows = iter(rows)
+    count = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return count
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, chunk)
+        count += len(chunk)
+
+
+@contextmanager
+def deferred_indexes(*models):
+    '''
+        Drops the `Meta.indexes` of `models` and creates them again on exit.
+        Building an index once over the loaded rows is faster than updating
+        it row by row, but queries on those tables meanwhile scan them, so
+        only defer the indexes of tables being filled from empty.
+    '''
+    with connection.schema_editor() as schema_editor:
+        for model in models:
+            for index in model._meta.indexes:
+                schema_editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as schema_editor:
+            for model in models:
+                for index in model._meta.indexes:
+                    schema_editor.add_index(model, index)
+
+
+def get_datetime_adapter(field):
+    '''
+        Returns the function adapting naive UTC datetimes for `field`.
+        SQLite stores them as their ISO text, without the timezone checks of
+        `get_db_prep_value`, which prepares them on other databases.
+    '''
+    if connection.vendor == "sqlite":
+        return str
+    return lambda value: field.get_db_prep_value(
+        value.replace(tzinfo=datetime.timezone.utc), connection
+    )
+
+
+def get_json_adapter(field):
+    '''
+        Returns the function adapting JSON text for `field`. SQLite stores
+        the text as is, other databases get the parsed value prepared by
+        `get_db_prep_value`, such as PostgreSQL's jsonb adapter.
+    '''
+    if connection.vendor == "sqlite":
+        return lambda text: text
+    return lambda text: field.get_db_prep_value(json.loads(text), connection)
+
+
+class Seeder:
+    '''
+        Generates deterministic synthetic vendors, purchase orders and
+        performance history: the same `seed`, `prefix` and `until` always
+        give the same rows. Each vendor gets a profile of on-time, quality,
+        response time and completion rates its purchase orders are drawn
+        from, over the `days` before `until`.
+    '''
+    PURCHASE_ORDER_FIELDS = (
+        "po_number",
+        "vendor",
+        "order_date",
+        "delivery_date",
+        "items",
+        "quantity",
+        "status",
+        "quality_rating",
+        "issue_date",
+        "acknowledgment_date",
+        "completed_at",
+    )
+    HISTORICAL_PERFORMANCE_FIELDS = (
+        "vendor",
+        "date",
+        "on_time_delivery_rate",
+        "quality_rating_avg",
+        "average_response_time",
+        "fulfillment_rate",
+    )
+
+    def __init__(self, seed=0, prefix="SEED", until=None, days=365):
+        self.rng = random.Random(seed)
+        self.prefix = prefix
+        self.until = until or timezone.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.days = days
+        self.profiles = []
+
+    def vendors(self, count):
+        for index in range(count):
+            self.profiles.append((
+                self.rng.betavariate(8, 2),
+                self.rng.uniform(2.5, 4.8),
+                self.rng.expovariate(1 / 24),
+                self.rng.uniform(.6, .95),
+            ))
+            yield Vendor(
+                name=f"Vendor {index}",
+                contact_details=f"+1 555 {index % 10000:04d}",
+                address=f"{index} Seed Street",
+                vendor_code=f"{self.prefix}-V{index}",
+            )
+
+    def purchase_orders(self, vendor_ids, count):
+        '''
+            Rows of `PURCHASE_ORDER_FIELDS`, issued when ordered.
+        '''
+        rng = self.rng
+        random = rng.random
+        get_field = PurchaseOrder._meta.get_field
+        adapt = get_datetime_adapter(get_field("order_date"))
+        adapt_items = get_json_adapter(get_field("items"))
+        until = timezone.make_naive(self.until, datetime.timezone.utc)
+        timedelta = datetime.timedelta
+        window = self.days * 86400
+        vendor_count = len(vendor_ids)
+        for index in range(count):
+            vendor_index = int(random() * vendor_count)
+            on_time, quality, response_hours, completion = (
+                self.profiles[vendor_index]
+            )
+            order_date = until - timedelta(seconds=random() * window)
+            delivery_date = order_date + timedelta(
+                days=2 + int(random() * 13)
+            )
+            acknowledgment_date = order_date + timedelta(
+                hours=rng.expovariate(1 / response_hours)
+            )
+            completed_at = None
+            draw = random()
+            if draw < completion:
+                status = PurchaseOrder.COMPLETED
+                # On time when delivered by the time the order completed,
+                # late when completed up to two days before the delivery.
+                if random() < on_time:
+                    completed_at = delivery_date + timedelta(
+                        hours=random() * 72
+                    )
+                else:
+                    completed_at = delivery_date - timedelta(
+                        hours=1 + random() * 46
+                    )
+                # Completed orders lie wholly in the past.
+                shift = max(completed_at, delivery_date) - until
+                if shift > timedelta():
+                    order_date -= shift
+                    delivery_date -= shift
+                    acknowledgment_date -= shift
+                    completed_at -= shift
+                acknowledgment_date = min(acknowledgment_date, completed_at)
+                quality_rating = round(
+                    min(5.0, max(1.0, rng.gauss(quality, .6))), 1
+                )
+            else:
+                status = (
+                    PurchaseOrder.CANCELLED if draw > .97
+                    else PurchaseOrder.PENDING
+                )
+                quality_rating = None
+            acknowledged = status == PurchaseOrder.COMPLETED or random() < .5
+            quantity = 1 + int(random() * 20)
+            issue_date = adapt(order_date)
+            yield (
+                f"{self.prefix}-PO{index}",
+                vendor_ids[vendor_index],
+                issue_date,
+                adapt(delivery_date),
+                # The JSON of the items, without the cost of `json.dumps`.
+                adapt_items(
+                    f'[{{"name": "Item {int(random() * 1000)}", '
+                    f'"price": {round(1 + random() * 499, 2)}, '
+                    f'"quantity": {quantity}}}]'
+                ),
+                quantity,
+                status,
+                quality_rating,
+                issue_date,
+                adapt(acknowledgment_date) if acknowledged else None,
+                completed_at and adapt(completed_at),
+            )
+
+    def historical_performances(self, vendor_ids, days):
+        '''
+            Rows of `HISTORICAL_PERFORMANCE_FIELDS`: daily snapshots of each
+            vendor's metrics drifting around its profile.
+        '''
+        rng = self.rng
+        adapt = get_datetime_adapter(
+            HistoricalPerformance._meta.get_field("date")
+        )
+        until = timezone.make_naive(self.until, datetime.timezone.utc)
+        dates = [
+            adapt(until - datetime.timedelta(days=day))
+            for day in range(days, 0, -1)
+        ]
+        for vendor_id, profile in zip(vendor_ids, self.profiles):
+            on_time, quality, response_hours, completion = profile
+            for date in dates:
+                yield (
+                    vendor_id,
+                    date,
+                    min(1.0, max(0.0, rng.gauss(on_time, .05))),
+                    min(5.0, max(1.0, rng.gauss(quality, .2))),
+                    max(0.0, rng.gauss(response_hours, 2) * 3600),
+                    min(1.0, max(0.0, rng.gauss(completion, .05))),
+                )
+
+    def seed(
+        self, vendors, purchase_orders, history_days=0, chunk_size=50000,
+        defer_indexes=False
+    ):
+        '''
+            Inserts the generated rows, with the purchase order and history
+            indexes dropped until the end if `defer_indexes` is true, then
+            recalculates the metrics of the new vendors with one set-based
+            pass. Returns how many vendors, purchase orders and
+            snapshots were inserted.
+        '''
+        bulk_insert(Vendor, self.vendors(vendors), chunk_size)
+        new_vendors = Vendor.objects.filter(
+            vendor_code__startswith=f"{self.prefix}-V"
+        )
+        # Primary keys ascend in insertion order, the order of the profiles.
+        vendor_ids = list(
+            new_vendors.order_by("pk").values_list("pk", flat=True)
+        )
+        with (
+            deferred_indexes(PurchaseOrder, HistoricalPerformance)
+            if defer_indexes else nullcontext()
+        ):
+            counts = (
+                len(vendor_ids),
+                insert_rows(
+                    PurchaseOrder,
+                    self.PURCHASE_ORDER_FIELDS,
+                    self.purchase_orders(vendor_ids, purchase_orders),
+                    chunk_size,
+                ),
+                insert_rows(
+                    HistoricalPerformance,
+                    self.HISTORICAL_PERFORMANCE_FIELDS,
+                    self.historical_performances(vendor_ids, history_days),
+                    chunk_size,
+                ),
+            )
+        new_vendors.recalculate_performance_metrics(snapshots=False)
+        return counts
@@ -1,8 +1,15 @@
+from django.utils import timezone
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+
 from rest_framework import serializers
 
+from .exports import EXPORT_FORMATS, CSV
 from .models import (
     Vendor,
     PurchaseOrder,
+    HistoricalPerformance,
 )
 
 
@@ -22,15 +29,151 @@ class PurchaseOrderSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PurchaseOrder
-        exclude = ("id", )
+        exclude = ("id", "completed_at")
+
+
+class BulkVendorField(serializers.PrimaryKeyRelatedField):
+    '''
+        Resolves vendors from the `vendors` dict in the serializer context so
+        a bulk request looks them up in one query instead of once per row.
+    '''
+    def to_internal_value(self, data):
+        vendors = self.context["vendors"]
+        try:
+            return vendors[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class PurchaseOrderBulkSerializer(PurchaseOrderSerializer):
+    vendor = BulkVendorField(queryset=Vendor.objects.all())
+
+    class Meta(PurchaseOrderSerializer.Meta):
+        extra_kwargs = {
+            "po_number": {"validators": []},
+        }
+
+
+class PurchaseOrderBulkErrorSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    po_number = serializers.CharField(allow_null=True)
+    errors = serializers.DictField()
+
+
+class PurchaseOrderBulkResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    errors = PurchaseOrderBulkErrorSerializer(many=True)
+
+
+class PurchaseOrderTransitionSerializer(serializers.Serializer):
+    po_number = serializers.CharField(max_length=50)
+    status = serializers.ChoiceField(
+        choices=PurchaseOrder.status_choices, required=False
+    )
+    quality_rating = serializers.FloatField(required=False, allow_null=True)
+    acknowledgment_date = serializers.DateTimeField(
+        required=False, allow_null=True
+    )
+
+
+class PurchaseOrderTransitionResultSerializer(serializers.Serializer):
+    updated = serializers.IntegerField()
+    errors = PurchaseOrderBulkErrorSerializer(many=True)
 
 
 class VendorPerformanceSerializer(serializers.ModelSerializer):
+    computed_at = serializers.SerializerMethodField()
+
     class Meta:
         model = Vendor
         fields = (
+            "on_time_delivery_rate",
+            "quality_rating_avg",
+            "average_response_time",
+            "fulfillment_rate",
+            "computed_at"
+        )
+
+    @extend_schema_field(OpenApiTypes.DATETIME)
+    def get_computed_at(self, vendor):
+        computed_at = self.context.get("computed_at") or timezone.now()
+        return serializers.DateTimeField().to_representation(computed_at)
+
+
+class PerformanceHistoryQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    bucket = serializers.ChoiceField(
+        choices=HistoricalPerformance.BUCKETS, default="day"
+    )
+
+    def validate(self, attrs):
+        attrs.setdefault("end", timezone.now())
+        attrs.setdefault("start", attrs["end"] - timezone.timedelta(days=30))
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError(
+                {"start": ["Must not be after end."]}
+            )
+        return attrs
+
+
+class MetricSummarySerializer(serializers.Serializer):
+    min = serializers.FloatField()
+    max = serializers.FloatField()
+    avg = serializers.FloatField()
+    last = serializers.FloatField()
+
+
+class PerformanceHistoryBucketSerializer(serializers.Serializer):
+    bucket = serializers.DateTimeField()
+    count = serializers.IntegerField()
+    on_time_delivery_rate = MetricSummarySerializer()
+    quality_rating_avg = MetricSummarySerializer()
+    average_response_time = MetricSummarySerializer()
+    fulfillment_rate = MetricSummarySerializer()
+
+
+class VendorRankingQuerySerializer(serializers.Serializer):
+    metric = serializers.ChoiceField(choices=Vendor.PERFORMANCE_METRICS)
+    direction = serializers.ChoiceField(
+        choices=("asc", "desc"), default="desc"
+    )
+    limit = serializers.IntegerField(default=50, min_value=1, max_value=1000)
+    min_orders = serializers.IntegerField(default=0, min_value=0)
+
+
+class VendorRankingSerializer(serializers.ModelSerializer):
+    rank = serializers.SerializerMethodField()
+    total_orders = serializers.IntegerField()
+
+    class Meta:
+        model = Vendor
+        fields = (
+            "rank",
+            "vendor_code",
+            "name",
+            "total_orders",
             "on_time_delivery_rate",
             "quality_rating_avg",
             "average_response_time",
             "fulfillment_rate"
         )
+
+    def get_rank(self, vendor) -> int:
+        return self.context["ranks"][vendor.pk]
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    export_format = serializers.ChoiceField(
+        choices=EXPORT_FORMATS, default=CSV
+    )
+
+
+class ResponseCacheStatsSerializer(serializers.Serializer):
+    namespace = serializers.CharField()
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+    hit_rate = serializers.FloatField()
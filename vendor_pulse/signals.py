@@ -1,13 +1,30 @@
+from django.conf import settings
 from django.dispatch import receiver
-from django.db.models.signals import pre_save, post_save
-
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from rest_framework.authtoken.models import Token
+
+from .cache import (
+    get_response_cache,
+    get_token_cache,
+    invalidate_cached_performance,
+    VENDOR,
+    PURCHASE_ORDER,
+)
+from .conf import get_setting, METRICS_MODE_DEFERRED
 from .models import (
     Vendor,
     PurchaseOrder,
+    VendorPerformanceCounter,
+    VendorMetricsJob,
 )
+from .profiling import profiled
 
 
 @receiver(pre_save, sender=Vendor)
+@profiled
 def create_performance_history(sender, instance: Vendor, **kwargs):
     if instance.pk is None:
         return
@@ -16,11 +33,8 @@ def create_performance_history(sender, instance: Vendor, **kwargs):
     if not update_fields:
         return
 
-    should_create_historical_performance = (
-        "on_time_delivery_rate" in update_fields or
-        "quality_rating_avg" in update_fields or
-        "average_response_time" in update_fields or
-        "fulfillment_rate" in update_fields
+    should_create_historical_performance = any(
+        metric in update_fields for metric in Vendor.PERFORMANCE_METRICS
     )
     if not should_create_historical_performance:
         return
@@ -28,45 +42,151 @@ def create_performance_history(sender, instance: Vendor, **kwargs):
     instance.create_historical_performance()
 
 
-@receiver(pre_save, sender=PurchaseOrder)
-def save_updated_fields(sender, instance: PurchaseOrder, **kwargs):
-    if instance.pk is None:
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+@profiled
+def invalidate_performance_cache(sender, instance: Vendor, **kwargs):
+    '''
+        Purchase order edits save the vendor's metrics even when their values
+        stay the same, e.g. a new order completed on time for a vendor only
+        ever on time. Such saves keep the cached performance response.
+    '''
+    update_fields = kwargs.get("update_fields")
+    if (
+        update_fields
+        and set(update_fields) <= set(Vendor.PERFORMANCE_METRICS)
+        and getattr(instance, "_changed_metrics", None) == []
+    ):
+        return
+
+    invalidate_cached_performance(instance.pk)
+
+
+@receiver(post_save, sender=Vendor)
+@profiled
+def invalidate_vendor_cache(sender, instance: Vendor, **kwargs):
+    '''
+        Saving only the performance metrics changes neither the vendor nor
+        its purchase orders as serialized, so their cached responses are
+        kept. The cached purchase orders depend on the vendor, so they are
+        invalidated with it.
+    '''
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= set(Vendor.PERFORMANCE_METRICS):
+        return
+
+    get_response_cache().invalidate(VENDOR, instance.pk)
+
+
+@receiver(post_delete, sender=Vendor)
+@profiled
+def invalidate_deleted_vendor_cache(sender, instance: Vendor, **kwargs):
+    get_response_cache().invalidate(VENDOR, instance.pk)
+
+
+@receiver(post_save, sender=PurchaseOrder)
+@receiver(post_delete, sender=PurchaseOrder)
+@profiled
+def invalidate_purchase_order_cache(
+    sender, instance: PurchaseOrder, **kwargs
+):
+    get_response_cache().invalidate(PURCHASE_ORDER, instance.pk)
+
+
+def get_performance_values(instance: PurchaseOrder, update_fields=None):
+    return {
+        field: getattr(instance, field)
+        for field in instance.get_saved_fields(update_fields)
+    }
+
+
+def apply_performance_delta(vendor: Vendor, old_values, new_values):
+    delta = VendorPerformanceCounter.delta(old_values, new_values)
+    if not delta:
+        return
+
+    if get_setting("METRICS_MODE") == METRICS_MODE_DEFERRED:
+        VendorMetricsJob.mark_dirty(vendor)
         return
 
-    old_instance = PurchaseOrder.objects.get(pk=instance.pk)
-    instance._status = old_instance.status
-    instance._acknowledgment_date = old_instance.acknowledgment_date
-    instance._quality_rating = old_instance.quality_rating
+    counter = VendorPerformanceCounter.apply_delta(vendor, delta)
+    vendor.update_performance_metrics(
+        VendorPerformanceCounter.changed_metrics(delta),
+        changed_metrics=counter.get_changed_metrics(delta),
+    )
 
 
 @receiver(post_save, sender=PurchaseOrder)
+@profiled
 def update_vendor_performance_metrics(
-    sender, instance: PurchaseOrder, created, **kwargs
+    sender, instance: PurchaseOrder, created, update_fields=None, **kwargs
 ):
     if created:
+        old_values = None
+        new_values = get_performance_values(instance)
+    else:
+        # Fields the save did not write keep their stored values, whatever
+        # the instance holds.
+        dirty_fields = instance.get_dirty_fields(update_fields)
+        if not dirty_fields:
+            return
+        new_values = {
+            **instance.get_original_values(),
+            **get_performance_values(instance, update_fields),
+        }
+        old_values = {**new_values, **dirty_fields}
+
+    if old_values and old_values["vendor_id"] != instance.vendor_id:
+        old_vendor = Vendor.objects.get(pk=old_values["vendor_id"])
+        apply_performance_delta(old_vendor, old_values, None)
+        old_values = None
+
+    apply_performance_delta(instance.vendor, old_values, new_values)
+
+
+def is_vendor_deletion(origin):
+    '''
+        Purchase orders deleted by a vendor cascade must not touch the vendor
+        being deleted.
+    '''
+    if isinstance(origin, QuerySet):
+        return origin.model is Vendor
+    return isinstance(origin, Vendor)
+
+
+@receiver(post_delete, sender=PurchaseOrder)
+@profiled
+def revert_vendor_performance_metrics(
+    sender, instance: PurchaseOrder, origin=None, **kwargs
+):
+    if is_vendor_deletion(origin):
         return
 
-    vendor = instance.vendor
-    should_update_on_time_delivery_rate = (
-        instance._status != instance.status
-        and instance.status == PurchaseOrder.COMPLETED
-    )
-    should_quality_rating_avg = (
-        instance._quality_rating != instance.quality_rating
-    )
-    should_update_average_response_time = (
-        instance._acknowledgment_date != instance.acknowledgment_date
+    apply_performance_delta(
+        instance.vendor, get_performance_values(instance), None
     )
-    should_update_fulfillment_rate = instance._status != instance.status
 
-    if should_update_on_time_delivery_rate:
-        vendor.update_on_time_delivery_rate()
 
-    if should_quality_rating_avg:
-        vendor.update_quality_rating_avg()
+@receiver(post_delete, sender=Token)
+@profiled
+def invalidate_token_cache(sender, instance: Token, **kwargs):
+    keys = [instance.key]
+    transaction.on_commit(lambda: get_token_cache().delete_many(keys))
 
-    if should_update_average_response_time:
-        vendor.update_average_response_time()
 
-    if should_update_fulfillment_rate:
-        vendor.update_fulfillment_rate()
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@profiled
+def invalidate_user_token_cache(sender, instance, **kwargs):
+    '''
+        Any change to the user, e.g. deactivation, must apply to their next
+        request, so their cached token is dropped. Logins only update
+        `last_login` and keep it.
+    '''
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+
+    keys = list(
+        Token.objects.filter(user=instance).values_list("key", flat=True)
+    )
+    transaction.on_commit(lambda: get_token_cache().delete_many(keys))
@@ -1,23 +1,98 @@
-from django.test import TestCase
+import csv
+import datetime
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, transaction
+from django.db.models import F, Q
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse
+from django.test import (
+    AsyncClient,
+    Client,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
 from django.utils import timezone
 
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory, force_authenticate
 
+from vms.db_routers import (
+    ReplicaRouter,
+    ReplicaRouting,
+    ReplicaRoutingMiddleware,
+)
+
+from .authentication import CustomTokenAuthentication
+from .filters import PurchaseOrderFilterBackend
 from .factories import (
     VendorFactory,
     PurchaseOrderFactory,
     AdminFactory,
+    UserFactory,
+)
+from .models import (
+    Vendor,
+    PurchaseOrder,
+    HistoricalPerformance,
+    HistoricalPerformanceRollup,
+    VendorPerformanceCounter,
+    VendorMetricsJob,
+    truncate_date,
+)
+from .cache import get_response_cache, get_token_cache
+from .management.commands.benchmark_api import (
+    Command as BenchmarkApiCommand,
+    Scenarios as BenchmarkScenarios,
+    Worker as BenchmarkWorker,
+    get_percentiles,
+    scratch_database,
+)
+from .management.commands.profile_hot_paths import (
+    Command as ProfileHotPathsCommand,
+    Edits as ProfiledEdits,
 )
-from .models import PurchaseOrder
+from .management.commands.recompute_vendor_metrics import map_bounded
+from .management.commands.sync_replica import copy_database
+from .instrumentation import Histogram, get_request_metrics
+from .profiling import get_profiler
+from .seeding import Seeder, deferred_indexes
 from .serializers import VendorSerializer, PurchaseOrderSerializer
-from .views import VendorModelViewSet, PurchaseOrderModelViewSet
+from .views import (
+    VendorModelViewSet,
+    PurchaseOrderModelViewSet,
+    ResponseCacheStatsView,
+)
 
 
 class VendorPerformanceMetricsTests(TestCase):
     def setUp(self):
         self.vendor = VendorFactory()
-        self.purchase_order_1 = PurchaseOrderFactory(vendor=self.vendor)
-        self.purchase_order_2 = PurchaseOrderFactory(vendor=self.vendor)
+        # Issued at the same instant, as the expected average response time
+        # takes either order's issue date for both.
+        with mock.patch(
+            "django.utils.timezone.now", return_value=timezone.now()
+        ):
+            self.purchase_order_1 = PurchaseOrderFactory(vendor=self.vendor)
+            self.purchase_order_2 = PurchaseOrderFactory(vendor=self.vendor)
 
     def test_calculate_on_time_delivery_rate(self):
         self.assertEqual(self.vendor.calculate_on_time_delivery_rate(), 0.0)
@@ -114,8 +189,622 @@ class VendorPerformanceMetricsTests(TestCase):
         self.assertEqual(self.vendor.calculate_fulfillment_rate(), 0.5)
 
 
+class VendorPerformanceMetricsQueryTests(TestCase):
+    def setUp(self):
+        self.vendors = [VendorFactory() for _ in range(3)]
+        for index, vendor in enumerate(self.vendors[:2]):
+            for rating in range(index + 2):
+                PurchaseOrderFactory(
+                    vendor=vendor,
+                    status=PurchaseOrder.COMPLETED,
+                    quality_rating=rating + 1,
+                    acknowledgment_date=(
+                        timezone.now() + timezone.timedelta(seconds=rating)
+                    ),
+                )
+            PurchaseOrderFactory(vendor=vendor)
+
+    def assertMetricsEqual(self, metrics, vendor):
+        self.assertEqual(
+            metrics["on_time_delivery_rate"],
+            vendor.calculate_on_time_delivery_rate()
+        )
+        self.assertEqual(
+            metrics["quality_rating_avg"],
+            vendor.calculate_quality_rating_avg()
+        )
+        self.assertAlmostEqual(
+            metrics["average_response_time"],
+            vendor.calculate_average_response_time(),
+            places=4
+        )
+        self.assertEqual(
+            metrics["fulfillment_rate"],
+            vendor.calculate_fulfillment_rate()
+        )
+
+    def test_calculate_performance_metrics(self):
+        for vendor in self.vendors:
+            with self.assertNumQueries(1):
+                metrics = vendor.calculate_performance_metrics()
+            self.assertMetricsEqual(metrics, vendor)
+
+    def test_calculate_performance_metrics_for_many_vendors(self):
+        with self.assertNumQueries(2):
+            metrics = Vendor.objects.calculate_performance_metrics()
+        self.assertEqual(
+            set(metrics), {vendor.pk for vendor in self.vendors}
+        )
+        for vendor in self.vendors:
+            self.assertMetricsEqual(metrics[vendor.pk], vendor)
+
+    def test_recalculate_performance_metrics_for_many_vendors(self):
+        Vendor.objects.update(fulfillment_rate=0.0)
+        VendorPerformanceCounter.objects.all().delete()
+        history_count = HistoricalPerformance.objects.count()
+
+        Vendor.objects.all().recalculate_performance_metrics()
+        self.assertEqual(
+            HistoricalPerformance.objects.count(), history_count + 3
+        )
+        for vendor in self.vendors:
+            vendor.refresh_from_db()
+            self.assertEqual(
+                vendor.fulfillment_rate, vendor.calculate_fulfillment_rate()
+            )
+            self.assertEqual(
+                vendor.performance_counter.performance_metrics,
+                vendor.calculate_performance_metrics()
+            )
+
+
+class RecomputeVendorMetricsCommandTests(TestCase):
+    def setUp(self):
+        self.vendors = [VendorFactory(vendor_code=f"V{i}") for i in range(3)]
+        for vendor in self.vendors:
+            PurchaseOrderFactory(vendor=vendor, status=PurchaseOrder.COMPLETED)
+            PurchaseOrderFactory(vendor=vendor)
+        Vendor.objects.update(fulfillment_rate=0.0)
+
+    def test_dry_run_reports_without_writing(self):
+        stdout = StringIO()
+        call_command("recompute_vendor_metrics", "--dry-run", stdout=stdout)
+        self.assertIn("V0 fulfillment_rate: 0.0 -> 0.5", stdout.getvalue())
+        self.assertIn(
+            "3 vendors recomputed, 3 would change", stdout.getvalue()
+        )
+        self.assertFalse(
+            Vendor.objects.exclude(fulfillment_rate=0.0).exists()
+        )
+
+    def test_recompute_range_in_chunks(self):
+        history_count = HistoricalPerformance.objects.count()
+        call_command(
+            "recompute_vendor_metrics",
+            "--chunk-size", "1",
+            "--vendor-code-from", "V1",
+            stdout=StringIO()
+        )
+        fulfillment_rates = dict(
+            Vendor.objects.values_list("vendor_code", "fulfillment_rate")
+        )
+        self.assertEqual(
+            fulfillment_rates, {"V0": 0.0, "V1": 0.5, "V2": 0.5}
+        )
+        self.assertEqual(HistoricalPerformance.objects.count(), history_count)
+
+        call_command(
+            "recompute_vendor_metrics",
+            "--snapshots",
+            "--id-to", str(self.vendors[0].pk),
+            stdout=StringIO()
+        )
+        self.assertEqual(
+            HistoricalPerformance.objects.count(), history_count + 1
+        )
+        self.vendors[0].refresh_from_db()
+        self.assertEqual(self.vendors[0].fulfillment_rate, 0.5)
+
+    def test_map_bounded_submits_a_window_of_chunks(self):
+        read = []
+
+        def chunks():
+            for chunk in range(10):
+                read.append(chunk)
+                yield chunk
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = map_bounded(
+                executor, lambda chunk: chunk * 2, chunks(), 4
+            )
+            self.assertEqual(next(results), 0)
+            self.assertEqual(read, [0, 1, 2, 3, 4])
+            self.assertEqual(list(results), list(range(2, 20, 2)))
+
+
+class CompactPerformanceHistoryCommandTests(TestCase):
+    def setUp(self):
+        self.vendor = VendorFactory()
+        self.today = timezone.now().replace(
+            hour=12, minute=0, second=0, microsecond=0
+        )
+        for days in (1, 40, 40, 41, 300, 301):
+            for hours, fulfillment_rate in ((0, 0.25), (1, 0.75)):
+                HistoricalPerformance.objects.create(
+                    vendor=self.vendor,
+                    date=self.today - timezone.timedelta(
+                        days=days, hours=hours
+                    ),
+                    on_time_delivery_rate=1.0,
+                    quality_rating_avg=4.0,
+                    average_response_time=10.0,
+                    fulfillment_rate=fulfillment_rate,
+                )
+
+    def get_history(self):
+        return self.vendor.get_performance_history(
+            start=self.today - timezone.timedelta(days=400),
+            end=self.today,
+            bucket="month"
+        )
+
+    def test_compact(self):
+        history = self.get_history()
+        stdout = StringIO()
+        call_command(
+            "compact_performance_history",
+            "--raw-days", "30",
+            "--daily-days", "180",
+            stdout=stdout
+        )
+        self.assertIn("Removed", stdout.getvalue())
+        self.assertIn("Reclaimed", stdout.getvalue())
+
+        self.assertEqual(
+            HistoricalPerformance.objects.filter(vendor=self.vendor).count(),
+            2
+        )
+        rollups = HistoricalPerformanceRollup.objects.filter(
+            vendor=self.vendor
+        )
+        self.assertEqual(
+            rollups.filter(resolution=HistoricalPerformanceRollup.DAY).count(),
+            2
+        )
+        self.assertLessEqual(
+            rollups.filter(
+                resolution=HistoricalPerformanceRollup.WEEK
+            ).count(),
+            2
+        )
+        daily_rollup = rollups.filter(
+            resolution=HistoricalPerformanceRollup.DAY
+        ).earliest("period_start")
+        self.assertEqual(daily_rollup.metrics["fulfillment_rate"], {
+            "min": 0.25, "max": 0.75, "avg": 0.5, "last": 0.25
+        })
+
+        compacted_history = self.get_history()
+        self.assertEqual(
+            sum(bucket["count"] for bucket in compacted_history),
+            sum(bucket["count"] for bucket in history)
+        )
+        for bucket in compacted_history:
+            self.assertEqual(bucket["fulfillment_rate"]["avg"], 0.5)
+            self.assertEqual(bucket["fulfillment_rate"]["min"], 0.25)
+            self.assertEqual(bucket["fulfillment_rate"]["max"], 0.75)
+
+        call_command(
+            "compact_performance_history",
+            "--raw-days", "0",
+            stdout=StringIO()
+        )
+        self.assertFalse(
+            HistoricalPerformance.objects.filter(vendor=self.vendor).exists()
+        )
+        self.assertEqual(
+            sum(bucket["count"] for bucket in self.get_history()),
+            sum(bucket["count"] for bucket in history)
+        )
+
+    def test_compact_one_period_per_call(self):
+        raw_before = truncate_date(self.today, "day")
+        daily_before = truncate_date(
+            self.today - timezone.timedelta(days=180), "week"
+        )
+        removed = []
+        while True:
+            with CaptureQueriesContext(connection) as context:
+                counts = HistoricalPerformanceRollup.compact(
+                    [self.vendor.pk], raw_before, daily_before
+                )
+            if not counts[0]:
+                break
+            removed.append(counts)
+            self.assertLessEqual(
+                sum(
+                    query["sql"].startswith("SAVEPOINT")
+                    for query in context.captured_queries
+                ),
+                1
+            )
+
+        # One day of raw snapshots per call, oldest first, then one week of
+        # the two daily rows older than `daily_before` per call.
+        self.assertEqual(removed[:5], [(2, 1), (2, 1), (2, 1), (4, 1), (2, 1)])
+        self.assertEqual(sum(count for count, _ in removed[5:]), 2)
+        self.assertEqual(
+            HistoricalPerformanceRollup.objects.filter(
+                resolution=HistoricalPerformanceRollup.DAY
+            ).count(),
+            3
+        )
+
+
+class VendorPerformanceCounterTests(TestCase):
+    def setUp(self):
+        self.vendor = VendorFactory()
+        self.purchase_order_1 = PurchaseOrderFactory(vendor=self.vendor)
+        self.purchase_order_2 = PurchaseOrderFactory(vendor=self.vendor)
+
+    def assertCounterMatchesFullRecompute(self, vendor):
+        counter = VendorPerformanceCounter.objects.get(vendor=vendor)
+        self.assertEqual(
+            counter.on_time_delivery_rate,
+            vendor.calculate_on_time_delivery_rate()
+        )
+        self.assertEqual(
+            counter.quality_rating_avg,
+            vendor.calculate_quality_rating_avg()
+        )
+        self.assertAlmostEqual(
+            counter.average_response_time,
+            vendor.calculate_average_response_time(),
+            places=4
+        )
+        self.assertEqual(
+            counter.fulfillment_rate,
+            vendor.calculate_fulfillment_rate()
+        )
+
+    def test_counter_tracks_create_update_and_delete(self):
+        counter = VendorPerformanceCounter.objects.get(vendor=self.vendor)
+        self.assertEqual(counter.total_count, 2)
+        self.assertEqual(counter.completed_count, 0)
+
+        self.purchase_order_1.status = PurchaseOrder.COMPLETED
+        self.purchase_order_1.quality_rating = 4
+        self.purchase_order_1.acknowledgment_date = (
+            timezone.now() + timezone.timedelta(seconds=5)
+        )
+        self.purchase_order_1.save()
+        self.assertCounterMatchesFullRecompute(self.vendor)
+
+        self.purchase_order_2.status = PurchaseOrder.COMPLETED
+        self.purchase_order_2.quality_rating = 2
+        self.purchase_order_2.save()
+        self.assertCounterMatchesFullRecompute(self.vendor)
+
+        self.purchase_order_2.status = PurchaseOrder.CANCELLED
+        self.purchase_order_2.save()
+        self.assertCounterMatchesFullRecompute(self.vendor)
+
+        self.purchase_order_1.delete()
+        self.assertCounterMatchesFullRecompute(self.vendor)
+
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.fulfillment_rate, 0.0)
+        self.assertEqual(self.vendor.quality_rating_avg, 0.0)
+        self.assertEqual(self.vendor.average_response_time, 0.0)
+
+    def test_counter_follows_vendor_change(self):
+        other_vendor = VendorFactory()
+        self.purchase_order_1.status = PurchaseOrder.COMPLETED
+        self.purchase_order_1.save()
+
+        self.purchase_order_1.vendor = other_vendor
+        self.purchase_order_1.save()
+        self.assertCounterMatchesFullRecompute(self.vendor)
+        self.assertCounterMatchesFullRecompute(other_vendor)
+
+        other_vendor.refresh_from_db()
+        self.assertEqual(other_vendor.fulfillment_rate, 1.0)
+
+    def test_rebuild_repairs_counter(self):
+        self.purchase_order_1.status = PurchaseOrder.COMPLETED
+        self.purchase_order_1.save()
+        VendorPerformanceCounter.objects.filter(vendor=self.vendor).update(
+            total_count=0, completed_count=0
+        )
+
+        counter = VendorPerformanceCounter.rebuild(self.vendor)
+        self.assertEqual(counter.total_count, 2)
+        self.assertEqual(counter.completed_count, 1)
+        self.assertCounterMatchesFullRecompute(self.vendor)
+
+    def test_counter_after_delivery_date_passes(self):
+        current_time = timezone.now()
+        for purchase_order in (self.purchase_order_1, self.purchase_order_2):
+            purchase_order.delivery_date = (
+                current_time + timezone.timedelta(days=1)
+            )
+            purchase_order.status = PurchaseOrder.COMPLETED
+            purchase_order.save()
+        counter = VendorPerformanceCounter.objects.get(vendor=self.vendor)
+        self.assertEqual(counter.on_time_count, 0)
+
+        later = current_time + timezone.timedelta(days=2)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            self.purchase_order_1.status = PurchaseOrder.CANCELLED
+            self.purchase_order_1.save()
+            self.purchase_order_2.delete()
+
+        counter = VendorPerformanceCounter.objects.get(vendor=self.vendor)
+        self.assertEqual(counter.completed_count, 0)
+        self.assertEqual(counter.on_time_count, 0)
+        self.assertEqual(
+            counter.on_time_count,
+            VendorPerformanceCounter.rebuild(self.vendor).on_time_count
+        )
+
+    def test_single_write_per_purchase_order_save(self):
+        history_count = HistoricalPerformance.objects.count()
+        self.purchase_order_1.status = PurchaseOrder.COMPLETED
+        self.purchase_order_1.quality_rating = 4
+        self.purchase_order_1.acknowledgment_date = (
+            timezone.now() + timezone.timedelta(seconds=5)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.purchase_order_1.save()
+
+        vendor_updates = [
+            query for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "vendor_pulse_vendor"')
+        ]
+        self.assertEqual(len(vendor_updates), 1)
+        self.assertEqual(
+            HistoricalPerformance.objects.count(), history_count + 1
+        )
+
+        snapshot = HistoricalPerformance.objects.latest("id")
+        self.vendor.refresh_from_db()
+        self.assertEqual(snapshot.fulfillment_rate, 0.5)
+        self.assertEqual(snapshot.quality_rating_avg, 4.0)
+        self.assertEqual(self.vendor.on_time_delivery_rate, 1.0)
+        self.assertGreater(self.vendor.average_response_time, 0.0)
+
+    def test_purchase_order_save_does_not_refetch(self):
+        purchase_order = PurchaseOrder.objects.get(pk=self.purchase_order_1.pk)
+        self.assertEqual(purchase_order.get_dirty_fields(), {})
+
+        purchase_order.status = PurchaseOrder.COMPLETED
+        self.assertEqual(
+            purchase_order.get_dirty_fields(),
+            {"status": PurchaseOrder.PENDING}
+        )
+        self.assertTrue(purchase_order.has_changed("status"))
+        with CaptureQueriesContext(connection) as queries:
+            purchase_order.save()
+
+        purchase_order_selects = [
+            query for query in queries.captured_queries
+            if 'FROM "vendor_pulse_purchaseorder"' in query["sql"]
+            and query["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(purchase_order_selects, [])
+        self.assertEqual(purchase_order.get_dirty_fields(), {})
+
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.fulfillment_rate, 0.5)
+
+    def test_save_with_update_fields_keeps_other_changes(self):
+        purchase_order = PurchaseOrder.objects.get(pk=self.purchase_order_1.pk)
+        purchase_order.status = PurchaseOrder.COMPLETED
+        purchase_order.acknowledge()
+
+        counter = VendorPerformanceCounter.objects.get(vendor=self.vendor)
+        self.assertEqual(counter.completed_count, 0)
+        self.assertEqual(counter.response_time_count, 1)
+        self.assertEqual(
+            purchase_order.get_dirty_fields(),
+            {"status": PurchaseOrder.PENDING}
+        )
+
+        purchase_order.save()
+        counter.refresh_from_db()
+        self.assertEqual(counter.completed_count, 1)
+        self.assertCounterMatchesFullRecompute(self.vendor)
+
+    def test_assigned_deferred_field_is_tracked(self):
+        self.purchase_order_1.status = PurchaseOrder.COMPLETED
+        self.purchase_order_1.save()
+
+        purchase_order = PurchaseOrder.objects.defer("quality_rating").get(
+            pk=self.purchase_order_1.pk
+        )
+        purchase_order.quality_rating = 3.0
+        purchase_order.save()
+
+        counter = VendorPerformanceCounter.objects.get(vendor=self.vendor)
+        self.assertEqual(counter.quality_rating_count, 1)
+        self.assertEqual(counter.quality_rating_sum, 3.0)
+        self.assertCounterMatchesFullRecompute(self.vendor)
+
+    def test_deferred_field_load_keeps_other_changes(self):
+        purchase_order = PurchaseOrder.objects.defer("quality_rating").get(
+            pk=self.purchase_order_1.pk
+        )
+        purchase_order.status = PurchaseOrder.COMPLETED
+        self.assertIsNone(purchase_order.quality_rating)
+        self.assertEqual(
+            purchase_order.get_dirty_fields(),
+            {"status": PurchaseOrder.PENDING}
+        )
+
+        purchase_order.save()
+        counter = VendorPerformanceCounter.objects.get(vendor=self.vendor)
+        self.assertEqual(counter.completed_count, 1)
+        self.assertCounterMatchesFullRecompute(self.vendor)
+
+    def test_unchanged_save_skips_metrics(self):
+        history_count = HistoricalPerformance.objects.count()
+        self.purchase_order_1.quantity = 10
+        self.purchase_order_1.save()
+        self.assertEqual(HistoricalPerformance.objects.count(), history_count)
+
+    def test_vendor_delete_cascades(self):
+        self.vendor.delete()
+        self.assertFalse(Vendor.objects.exists())
+        self.assertFalse(VendorPerformanceCounter.objects.exists())
+
+
+@override_settings(VENDOR_PULSE={"METRICS_MODE": "deferred"})
+class VendorMetricsJobTests(TestCase):
+    def setUp(self):
+        self.vendor = VendorFactory()
+        self.purchase_orders = [
+            PurchaseOrderFactory(vendor=self.vendor) for _ in range(5)
+        ]
+
+    def test_marks_collapse_into_one_job(self):
+        history_count = HistoricalPerformance.objects.count()
+        for purchase_order in self.purchase_orders:
+            purchase_order.status = PurchaseOrder.COMPLETED
+            purchase_order.save()
+
+        job = VendorMetricsJob.objects.get(vendor=self.vendor)
+        self.assertEqual(job.mark_count, 10)
+        self.assertEqual(HistoricalPerformance.objects.count(), history_count)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.fulfillment_rate, 0.0)
+
+        call_command(
+            "process_vendor_metrics", "--once", "--debounce", "0",
+            stdout=StringIO()
+        )
+        self.assertFalse(VendorMetricsJob.objects.exists())
+        self.assertEqual(
+            HistoricalPerformance.objects.count(), history_count + 1
+        )
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.fulfillment_rate, 1.0)
+        self.assertEqual(self.vendor.on_time_delivery_rate, 1.0)
+
+    def test_debounce_leaves_recent_marks(self):
+        call_command(
+            "process_vendor_metrics", "--once", "--debounce", "60",
+            stdout=StringIO()
+        )
+        self.assertTrue(
+            VendorMetricsJob.objects.filter(vendor=self.vendor).exists()
+        )
+
+    def test_remarked_job_is_not_claimed(self):
+        job = VendorMetricsJob.objects.get(vendor=self.vendor)
+        VendorMetricsJob.mark_dirty(self.vendor)
+        self.assertFalse(job.process())
+        self.assertTrue(VendorMetricsJob.objects.filter(pk=job.pk).exists())
+
+    def test_max_delay_bounds_debounce(self):
+        VendorMetricsJob.objects.filter(vendor=self.vendor).update(
+            created_at=timezone.now() - timezone.timedelta(seconds=120)
+        )
+        job = VendorMetricsJob.objects.get(vendor=self.vendor)
+        VendorMetricsJob.mark_dirty(self.vendor)
+        self.assertFalse(job.process(max_delay_seconds=300))
+        self.assertTrue(job.process(max_delay_seconds=60))
+
+        VendorMetricsJob.mark_dirty(self.vendor)
+        VendorMetricsJob.objects.filter(vendor=self.vendor).update(
+            created_at=timezone.now() - timezone.timedelta(seconds=120)
+        )
+        call_command(
+            "process_vendor_metrics", "--once", "--debounce", "60",
+            "--max-delay", "60", stdout=StringIO()
+        )
+        self.assertFalse(
+            VendorMetricsJob.objects.filter(vendor=self.vendor).exists()
+        )
+
+
+class CustomTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        get_token_cache().clear()
+        self.authentication = CustomTokenAuthentication()
+        self.user = UserFactory()
+        self.token = Token.objects.create(user=self.user)
+
+    def test_cached_token_lookup(self):
+        with self.assertNumQueries(1):
+            user, token = self.authentication.authenticate_credentials(
+                self.token.key
+            )
+        self.assertEqual(user, self.user)
+        self.assertEqual(token, self.token)
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(
+                self.token.key
+            )
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.username, self.user.username)
+        self.assertIs(token.user, user)
+        self.assertFalse(user._state.adding)
+
+    def test_cached_credentials_are_not_shared(self):
+        user, token = self.authentication.authenticate_credentials(
+            self.token.key
+        )
+        user.first_name = "Changed"
+        user._perm_cache = {"vendor_pulse.delete_vendor"}
+
+        cached_user, cached_token = (
+            self.authentication.authenticate_credentials(self.token.key)
+        )
+        self.assertIsNot(cached_user, user)
+        self.assertIsNot(cached_token, token)
+        self.assertEqual(cached_user.first_name, self.user.first_name)
+        self.assertFalse(hasattr(cached_user, "_perm_cache"))
+
+    def test_authenticate_request(self):
+        request = APIRequestFactory().get(
+            "/vendors/", HTTP_AUTHORIZATION=f"Bearer {self.token.key}"
+        )
+        view = VendorModelViewSet.as_view({"get": "list"})
+        self.assertEqual(view(request).status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(view(request).status_code, 200)
+
+    def test_invalid_token_is_not_cached(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials("invalid")
+        self.assertIsNone(get_token_cache().get("invalid"))
+
+    def test_deleted_token(self):
+        key = self.token.key
+        self.authentication.authenticate_credentials(key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(key)
+
+    def test_deactivated_user(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_expired_token_cache_entry(self):
+        with override_settings(VENDOR_PULSE={"TOKEN_CACHE_TIMEOUT": 0}):
+            self.authentication.authenticate_credentials(self.token.key)
+            with self.assertNumQueries(1):
+                self.authentication.authenticate_credentials(self.token.key)
+
+
 class VendorModelViewSetTests(TestCase):
     def setUp(self):
+        get_response_cache().clear()
         self.api_factory = APIRequestFactory()
         self.admin_user = AdminFactory()
         self.vendor_1 = VendorFactory()
@@ -126,14 +815,48 @@ class VendorModelViewSetTests(TestCase):
         view = VendorModelViewSet.as_view({"get": "list"})
         force_authenticate(request, user=self.admin_user)
         response = view(request)
-        current_response = response.data
+        current_response = response.data["results"]
         expected_response = VendorSerializer(
             [self.vendor_1, self.vendor_2], many=True
         ).data
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(current_response), 2)
         self.assertEqual(current_response, expected_response)
 
+    def test_vendor_list_filter(self):
+        request = self.api_factory.get(
+            "/vendors/", {"vendor_code": self.vendor_2.vendor_code}
+        )
+        view = VendorModelViewSet.as_view({"get": "list"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"],
+            VendorSerializer([self.vendor_2], many=True).data
+        )
+
+    def test_vendor_list_pagination(self):
+        view = VendorModelViewSet.as_view({"get": "list"})
+        request = self.api_factory.get("/vendors/", {"page_size": 1})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"],
+            VendorSerializer([self.vendor_1], many=True).data
+        )
+        self.assertIsNotNone(response.data["next"])
+
+        request = self.api_factory.get(response.data["next"])
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(
+            response.data["results"],
+            VendorSerializer([self.vendor_2], many=True).data
+        )
+        self.assertIsNone(response.data["next"])
+
     def test_vendor_retrieve(self):
         request = self.api_factory.get("/vendors/")
         view = VendorModelViewSet.as_view({"get": "retrieve"})
@@ -144,6 +867,144 @@ class VendorModelViewSetTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(current_response, expected_response)
 
+    def test_vendor_retrieve_cache(self):
+        view = VendorModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get("/vendors/")
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            cached_response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(cached_response["X-Cache"], "HIT")
+        self.assertEqual(cached_response.data, response.data)
+        self.assertEqual(cached_response["ETag"], response["ETag"])
+
+        request = self.api_factory.get(
+            "/vendors/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        force_authenticate(request, user=self.admin_user)
+        self.assertEqual(view(request, pk=self.vendor_1.pk).status_code, 304)
+
+        self.assertNotIn("Last-Modified", response)
+
+        self.vendor_1.name = "Renamed Vendor"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vendor_1.save()
+        request = self.api_factory.get(
+            "/vendors/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["name"], "Renamed Vendor")
+
+    def test_vendor_retrieve_cache_invalidated_on_commit(self):
+        view = VendorModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get("/vendors/")
+        force_authenticate(request, user=self.admin_user)
+        view(request, pk=self.vendor_1.pk)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.vendor_1.name = "Renamed Vendor"
+            self.vendor_1.save()
+        self.assertEqual(view(request, pk=self.vendor_1.pk)["X-Cache"], "HIT")
+
+        for callback in callbacks:
+            callback()
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["name"], "Renamed Vendor")
+
+    def test_vendor_retrieve_racing_a_write_is_not_cached(self):
+        view = VendorModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get("/vendors/")
+        force_authenticate(request, user=self.admin_user)
+        get_object = VendorModelViewSet.get_object
+
+        def get_object_before_write(viewset):
+            vendor = get_object(viewset)
+            with self.captureOnCommitCallbacks(execute=True):
+                Vendor.objects.filter(pk=vendor.pk).update(name="Renamed")
+                get_response_cache().invalidate("vendor", vendor.pk)
+            return vendor
+
+        with mock.patch.object(
+            VendorModelViewSet, "get_object", get_object_before_write
+        ):
+            response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.data["name"], self.vendor_1.name)
+        self.assertIsNone(
+            get_response_cache().get("vendor", self.vendor_1.pk)
+        )
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.data["name"], "Renamed")
+
+    def test_vendor_retrieve_from_replica_is_not_cached(self):
+        view = VendorModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get("/vendors/")
+        request.replica_routing = ReplicaRouting()
+        request.replica_routing.read_from_replica = True
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["name"], self.vendor_1.name)
+        self.assertIsNone(
+            get_response_cache().get("vendor", self.vendor_1.pk)
+        )
+
+    def test_vendor_retrieve_cache_kept_by_metric_updates(self):
+        view = VendorModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get("/vendors/")
+        force_authenticate(request, user=self.admin_user)
+        view(request, pk=self.vendor_1.pk)
+        PurchaseOrderFactory(vendor=self.vendor_1)
+        self.assertEqual(view(request, pk=self.vendor_1.pk)["X-Cache"], "HIT")
+
+    def test_vendor_retrieve_with_query_params_is_not_cached(self):
+        view = VendorModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get(
+            "/vendors/", {"vendor_code": self.vendor_2.vendor_code}
+        )
+        force_authenticate(request, user=self.admin_user)
+        self.assertEqual(view(request, pk=self.vendor_1.pk).status_code, 404)
+        self.assertEqual(view(request, pk=self.vendor_2.pk).status_code, 200)
+        self.assertIsNone(
+            get_response_cache().get("vendor", self.vendor_2.pk)
+        )
+
+    @override_settings(VENDOR_PULSE={
+        "RESPONSE_CACHE_BACKEND": "vendor_pulse.cache.DjangoCacheBackend",
+    })
+    def test_vendor_retrieve_django_cache_backend(self):
+        view = VendorModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get("/vendors/")
+        force_authenticate(request, user=self.admin_user)
+        self.assertEqual(view(request, pk=self.vendor_1.pk)["X-Cache"], "MISS")
+        self.assertEqual(view(request, pk=self.vendor_1.pk)["X-Cache"], "HIT")
+        self.vendor_1.delete()
+        self.assertEqual(view(request, pk=self.vendor_1.pk).status_code, 404)
+        get_response_cache().clear()
+
+    def test_response_cache_stats(self):
+        retrieve_view = VendorModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get("/vendors/")
+        force_authenticate(request, user=self.admin_user)
+        get_response_cache().reset_stats()
+        retrieve_view(request, pk=self.vendor_1.pk)
+        retrieve_view(request, pk=self.vendor_1.pk)
+        retrieve_view(request, pk=self.vendor_1.pk)
+
+        view = ResponseCacheStatsView.as_view()
+        request = self.api_factory.get("/cache/stats/")
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            {"namespace": "vendor", "hits": 2, "misses": 1, "hit_rate": 2 / 3},
+            response.data
+        )
+
     def test_vendor_create(self):
         request = self.api_factory.post(
             "/vendors/",
@@ -200,24 +1061,334 @@ class VendorModelViewSetTests(TestCase):
         self.assertEqual(response.data["name"], "Updated Vendor")
         self.assertEqual(response.data["contact_details"], "0987654321")
 
-    def test_vendor_performance(self):
-        request = self.api_factory.get("/vendors/")
+    def test_vendor_performance_cache(self):
         view = VendorModelViewSet.as_view({"get": "performance"})
+        request = self.api_factory.get("/vendors/")
         force_authenticate(request, user=self.admin_user)
         response = view(request, pk=self.vendor_1.pk)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data["on_time_delivery_rate"], 0.0)
-        self.assertEqual(response.data["quality_rating_avg"], 0.0)
-        self.assertEqual(response.data["average_response_time"], 0.0)
+        self.assertIsNotNone(response.data["computed_at"])
+
+        PurchaseOrderFactory(
+            vendor=self.vendor_1, status=PurchaseOrder.COMPLETED
+        )
+        Vendor.objects.filter(pk=self.vendor_1.pk).update(fulfillment_rate=0.0)
+        cached_response_data = view(request, pk=self.vendor_1.pk).data
+        with self.assertNumQueries(0):
+            cached_response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(cached_response.data, cached_response_data)
+
+        request = self.api_factory.get("/vendors/", {"recalculate": 1})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["fulfillment_rate"], 1.0)
+        self.assertGreater(
+            response.data["computed_at"], cached_response_data["computed_at"]
+        )
+        self.vendor_1.refresh_from_db()
+        self.assertEqual(self.vendor_1.fulfillment_rate, 1.0)
+
+        request = self.api_factory.get("/vendors/")
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.data["fulfillment_rate"], 1.0)
+
+    def test_vendor_performance_cache_kept_by_unchanged_metrics(self):
+        view = VendorModelViewSet.as_view({"get": "performance"})
+        request = self.api_factory.get("/vendors/")
+        force_authenticate(request, user=self.admin_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            PurchaseOrderFactory(
+                vendor=self.vendor_1,
+                status=PurchaseOrder.COMPLETED,
+                quality_rating=4.0,
+            )
+        view(request, pk=self.vendor_1.pk)
+
+        history_count = HistoricalPerformance.objects.count()
+        with self.captureOnCommitCallbacks(execute=True):
+            PurchaseOrderFactory(
+                vendor=self.vendor_1,
+                status=PurchaseOrder.COMPLETED,
+                quality_rating=4.0,
+            )
+        self.assertEqual(
+            HistoricalPerformance.objects.count(), history_count + 1
+        )
+        self.assertEqual(view(request, pk=self.vendor_1.pk)["X-Cache"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PurchaseOrderFactory(
+                vendor=self.vendor_1,
+                status=PurchaseOrder.COMPLETED,
+                quality_rating=2.0,
+            )
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["quality_rating_avg"], 10 / 3)
+
+    def test_vendor_performance_not_modified(self):
+        view = VendorModelViewSet.as_view({"get": "performance"})
+        request = self.api_factory.get("/vendors/", {"recalculate": 1})
+        force_authenticate(request, user=self.admin_user)
+        etag = view(request, pk=self.vendor_1.pk)["ETag"]
+
+        request = self.api_factory.get(
+            "/vendors/", {"recalculate": 1}, HTTP_IF_NONE_MATCH=etag
+        )
+        force_authenticate(request, user=self.admin_user)
+        self.assertEqual(view(request, pk=self.vendor_1.pk).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PurchaseOrderFactory(
+                vendor=self.vendor_1, status=PurchaseOrder.COMPLETED
+            )
+        request = self.api_factory.get("/vendors/", HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_vendor_performance_history(self):
+        day = timezone.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - timezone.timedelta(days=2)
+        snapshots = ((1, 0.25), (5, 0.75), (3, 0.5), (30, 1.0))
+        for hours, fulfillment_rate in snapshots:
+            HistoricalPerformance.objects.create(
+                vendor=self.vendor_1,
+                date=day + timezone.timedelta(hours=hours),
+                on_time_delivery_rate=0.0,
+                quality_rating_avg=0.0,
+                average_response_time=0.0,
+                fulfillment_rate=fulfillment_rate,
+            )
+        HistoricalPerformance.objects.create(
+            vendor=self.vendor_2,
+            date=day,
+            on_time_delivery_rate=0.0,
+            quality_rating_avg=0.0,
+            average_response_time=0.0,
+            fulfillment_rate=0.0,
+        )
+
+        request = self.api_factory.get("/vendors/", {
+            "start": (day - timezone.timedelta(days=1)).isoformat(),
+            "bucket": "day",
+        })
+        view = VendorModelViewSet.as_view({"get": "performance_history"})
+        force_authenticate(request, user=self.admin_user)
+        with self.assertNumQueries(4):
+            response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual([
+            bucket["count"] for bucket in response.data
+        ], [3, 1])
+        self.assertEqual(response.data[0]["fulfillment_rate"], {
+            "min": 0.25, "max": 0.75, "avg": 0.5, "last": 0.75
+        })
+        self.assertEqual(response.data[1]["fulfillment_rate"]["last"], 1.0)
+
+        request = self.api_factory.get("/vendors/", {
+            "start": day.isoformat(), "bucket": "hour"
+        })
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(len(response.data), 4)
+
+    def test_vendor_performance_history_invalid_query(self):
+        request = self.api_factory.get("/vendors/", {
+            "bucket": "year",
+            "start": timezone.now().isoformat(),
+            "end": (timezone.now() - timezone.timedelta(days=1)).isoformat(),
+        })
+        view = VendorModelViewSet.as_view({"get": "performance_history"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("bucket", response.data)
+
+    def test_vendor_performance_history_export(self):
+        self.vendor_1.create_historical_performance()
+        self.vendor_2.create_historical_performance()
+        view = VendorModelViewSet.as_view(
+            {"get": "performance_history_export"},
+            **VendorModelViewSet.performance_history_export.kwargs
+        )
+        request = self.api_factory.get(
+            "/vendors/performance/history/export/",
+            {"vendor_code": self.vendor_2.vendor_code}
+        )
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.DictReader(StringIO(
+            b"".join(response.streaming_content).decode()
+        )))
+        history = self.vendor_2.historical_performances.get()
+        self.assertEqual(rows, [{
+            "vendor": str(self.vendor_2.pk),
+            "vendor_code": self.vendor_2.vendor_code,
+            "date": history.date.isoformat().replace("+00:00", "Z"),
+            "on_time_delivery_rate": "0.0",
+            "quality_rating_avg": "0.0",
+            "average_response_time": "0.0",
+            "fulfillment_rate": "0.0",
+            "resolution": "raw",
+            "count": "1",
+        }])
+
+    def test_vendor_performance_history_export_includes_rollups(self):
+        current_time = timezone.now()
+        for days, fulfillment_rate in ((40, 0.25), (40, 0.75), (1, 0.5)):
+            HistoricalPerformance.objects.create(
+                vendor=self.vendor_1,
+                date=current_time - timezone.timedelta(days=days),
+                on_time_delivery_rate=0.0,
+                quality_rating_avg=0.0,
+                average_response_time=0.0,
+                fulfillment_rate=fulfillment_rate,
+            )
+        call_command("compact_performance_history", stdout=StringIO())
+
+        view = VendorModelViewSet.as_view(
+            {"get": "performance_history_export"},
+            **VendorModelViewSet.performance_history_export.kwargs
+        )
+        request = self.api_factory.get(
+            "/vendors/performance/history/export/",
+            {
+                "vendor_code": self.vendor_1.vendor_code,
+                "export_format": "ndjson",
+            }
+        )
+        force_authenticate(request, user=self.admin_user)
+        rows = [
+            json.loads(line) for line in b"".join(
+                view(request).streaming_content
+            ).decode().splitlines()
+        ]
+        self.assertEqual(
+            [
+                (row["resolution"], row["count"], row["fulfillment_rate"])
+                for row in rows
+            ],
+            [("day", 2, 0.5), ("raw", 1, 0.5)]
+        )
+
+        request = self.api_factory.get(
+            "/vendors/performance/history/export/", {
+                "vendor_code": self.vendor_1.vendor_code,
+                "date_after": (
+                    current_time - timezone.timedelta(days=10)
+                ).isoformat(),
+            }
+        )
+        force_authenticate(request, user=self.admin_user)
+        rows = list(csv.DictReader(StringIO(
+            b"".join(view(request).streaming_content).decode()
+        )))
+        self.assertEqual([row["resolution"] for row in rows], ["raw"])
+
+    def test_vendor_ranking(self):
+        Vendor.objects.filter(pk=self.vendor_1.pk).update(
+            on_time_delivery_rate=0.5
+        )
+        Vendor.objects.filter(pk=self.vendor_2.pk).update(
+            on_time_delivery_rate=0.9
+        )
+        vendor_3 = VendorFactory()
+        PurchaseOrderFactory(vendor=vendor_3, status=PurchaseOrder.COMPLETED)
+        PurchaseOrderFactory(vendor=vendor_3)
+        vendor_3.refresh_from_db()
+        view = VendorModelViewSet.as_view({"get": "ranking"})
+
+        request = self.api_factory.get(
+            "/vendors/ranking/", {"metric": "on_time_delivery_rate"}
+        )
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                (vendor["rank"], vendor["vendor_code"])
+                for vendor in response.data
+            ],
+            [
+                (1, vendor_3.vendor_code),
+                (2, self.vendor_2.vendor_code),
+                (3, self.vendor_1.vendor_code),
+            ]
+        )
+        self.assertEqual(response.data[0]["total_orders"], 2)
+        self.assertEqual(response.data[1]["total_orders"], 0)
+
+        request = self.api_factory.get("/vendors/ranking/", {
+            "metric": "on_time_delivery_rate",
+            "direction": "asc",
+            "limit": 1,
+        })
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(
+            [vendor["vendor_code"] for vendor in response.data],
+            [self.vendor_1.vendor_code]
+        )
+
+        request = self.api_factory.get("/vendors/ranking/", {
+            "metric": "fulfillment_rate", "min_orders": 2
+        })
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(
+            [vendor["vendor_code"] for vendor in response.data],
+            [vendor_3.vendor_code]
+        )
+        self.assertEqual(response.data[0]["fulfillment_rate"], 0.5)
+
+    def test_vendor_ranking_uses_metric_index(self):
+        plan = str(Vendor.objects.ranked("quality_rating_avg")[:50].explain())
+        self.assertIn("vendor_quality_rating_idx", plan)
+
+    def test_vendor_ranking_invalid_metric(self):
+        request = self.api_factory.get("/vendors/ranking/", {"metric": "x"})
+        view = VendorModelViewSet.as_view({"get": "ranking"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_vendor_performance_invalid_recalculate(self):
+        request = self.api_factory.get("/vendors/", {"recalculate": 2})
+        view = VendorModelViewSet.as_view({"get": "performance"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.status_code, 400)
+
+    def test_vendor_performance(self):
+        request = self.api_factory.get("/vendors/")
+        view = VendorModelViewSet.as_view({"get": "performance"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.vendor_1.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["on_time_delivery_rate"], 0.0)
+        self.assertEqual(response.data["quality_rating_avg"], 0.0)
+        self.assertEqual(response.data["average_response_time"], 0.0)
         self.assertEqual(response.data["fulfillment_rate"], 0.0)
 
-        self.purchase_order_1_1 = PurchaseOrderFactory(vendor=self.vendor_1)
-        self.purchase_order_1_1.status = PurchaseOrder.COMPLETED
-        self.purchase_order_1_1.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.purchase_order_1_1 = PurchaseOrderFactory(
+                vendor=self.vendor_1
+            )
+            self.purchase_order_1_1.status = PurchaseOrder.COMPLETED
+            self.purchase_order_1_1.save()
 
-        self.purchase_order_1_2 = PurchaseOrderFactory(vendor=self.vendor_1)
-        self.purchase_order_1_2.status = PurchaseOrder.COMPLETED
-        self.purchase_order_1_2.save()
+            self.purchase_order_1_2 = PurchaseOrderFactory(
+                vendor=self.vendor_1
+            )
+            self.purchase_order_1_2.status = PurchaseOrder.COMPLETED
+            self.purchase_order_1_2.save()
 
         request = self.api_factory.get("/vendors/")
         view = VendorModelViewSet.as_view({"get": "performance"})
@@ -229,11 +1400,12 @@ class VendorModelViewSetTests(TestCase):
         self.assertEqual(response.data["average_response_time"], 0.0)
         self.assertEqual(response.data["fulfillment_rate"], 1.0)
 
-        self.purchase_order_1_1.quality_rating = 3
-        self.purchase_order_1_1.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.purchase_order_1_1.quality_rating = 3
+            self.purchase_order_1_1.save()
 
-        self.purchase_order_1_2.quality_rating = 5
-        self.purchase_order_1_2.save()
+            self.purchase_order_1_2.quality_rating = 5
+            self.purchase_order_1_2.save()
 
         request = self.api_factory.get("/vendors/")
         view = VendorModelViewSet.as_view({"get": "performance"})
@@ -245,19 +1417,20 @@ class VendorModelViewSetTests(TestCase):
         self.assertEqual(response.data["average_response_time"], 0.0)
         self.assertEqual(response.data["fulfillment_rate"], 1.0)
 
-        self.purchase_order_1_1.issue_date = timezone.now()
-        self.purchase_order_1_1.acknowledgment_date = (
-            timezone.now() +
-            timezone.timedelta(seconds=5)
-        )
-        self.purchase_order_1_1.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.purchase_order_1_1.issue_date = timezone.now()
+            self.purchase_order_1_1.acknowledgment_date = (
+                timezone.now() +
+                timezone.timedelta(seconds=5)
+            )
+            self.purchase_order_1_1.save()
 
-        self.purchase_order_1_2.issue_date = timezone.now()
-        self.purchase_order_1_2.acknowledgment_date = (
-            timezone.now() +
-            timezone.timedelta(seconds=10)
-        )
-        self.purchase_order_1_2.save()
+            self.purchase_order_1_2.issue_date = timezone.now()
+            self.purchase_order_1_2.acknowledgment_date = (
+                timezone.now() +
+                timezone.timedelta(seconds=10)
+            )
+            self.purchase_order_1_2.save()
 
         request = self.api_factory.get("/vendors/")
         view = VendorModelViewSet.as_view({"get": "performance"})
@@ -272,6 +1445,7 @@ class VendorModelViewSetTests(TestCase):
 
 class PurchaseOrderModelViewSetTests(TestCase):
     def setUp(self):
+        get_response_cache().clear()
         self.api_factory = APIRequestFactory()
         self.admin_user = AdminFactory()
         self.vendor = VendorFactory()
@@ -283,14 +1457,154 @@ class PurchaseOrderModelViewSetTests(TestCase):
         view = PurchaseOrderModelViewSet.as_view({"get": "list"})
         force_authenticate(request, user=self.admin_user)
         response = view(request)
-        current_response = response.data
+        current_response = response.data["results"]
         expected_response = PurchaseOrderSerializer(
             [self.purchase_order_1, self.purchase_order_2], many=True
         ).data
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(current_response), 2)
         self.assertEqual(current_response, expected_response)
 
+    def test_purchase_order_list_filters_avoid_sorting(self):
+        # Under a date range the status and vendor filters should still read
+        # the rows in id order from an index, not collect and sort them all.
+        filters = [
+            {"status": "completed"},
+            {"vendor_code": self.vendor.vendor_code},
+            {"vendor_code": self.vendor.vendor_code, "status": "pending"},
+        ]
+        for params in filters:
+            for date in ["order_date", "delivery_date", "issue_date"]:
+                with self.subTest(params=params, date=date):
+                    request = Request(self.api_factory.get(
+                        "/purchase-orders/", {
+                            **params,
+                            f"{date}_after": "2024-01-01T00:00:00Z",
+                            f"{date}_before": "2024-04-01T00:00:00Z",
+                        }
+                    ))
+                    queryset = PurchaseOrderFilterBackend().filter_queryset(
+                        request, PurchaseOrder.objects.all(), None
+                    )
+                    plan = str(queryset.order_by("id")[:101].explain())
+                    self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_purchase_order_export_csv(self):
+        PurchaseOrderFactory(vendor=VendorFactory())
+        self.purchase_order_1.items = [{"name": "Item", "price": 10}]
+        self.purchase_order_1.save()
+        view = PurchaseOrderModelViewSet.as_view({"get": "export"})
+        request = self.api_factory.get(
+            "/purchase-orders/export/",
+            {"vendor_code": self.vendor.vendor_code}
+        )
+        force_authenticate(request, user=self.admin_user)
+        with override_settings(VENDOR_PULSE={"EXPORT_CHUNK_SIZE": 1}):
+            response = view(request)
+            self.assertTrue(response.streaming)
+            self.assertEqual(response["Content-Type"], "text/csv")
+            chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 3)
+
+        rows = list(csv.DictReader(StringIO(b"".join(chunks).decode())))
+        expected_rows = PurchaseOrderSerializer(
+            [self.purchase_order_1, self.purchase_order_2], many=True
+        ).data
+        self.assertEqual(len(rows), 2)
+        for row, expected_row in zip(rows, expected_rows):
+            self.assertEqual(row["po_number"], expected_row["po_number"])
+            self.assertEqual(row["vendor_code"], self.vendor.vendor_code)
+            self.assertEqual(row["order_date"], expected_row["order_date"])
+            self.assertEqual(row["quality_rating"], "")
+        self.assertEqual(
+            json.loads(rows[0]["items"]), [{"name": "Item", "price": 10}]
+        )
+
+    def test_purchase_order_export_ndjson(self):
+        self.purchase_order_2.status = PurchaseOrder.COMPLETED
+        self.purchase_order_2.save()
+        view = PurchaseOrderModelViewSet.as_view({"get": "export"})
+        request = self.api_factory.get(
+            "/purchase-orders/export/",
+            {"export_format": "ndjson", "status": PurchaseOrder.COMPLETED}
+        )
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        with self.assertNumQueries(1):
+            content = b"".join(response.streaming_content).decode()
+        rows = [json.loads(line) for line in content.splitlines()]
+        expected_row = PurchaseOrderSerializer(self.purchase_order_2).data
+        self.assertEqual(rows, [{
+            "id": self.purchase_order_2.pk,
+            **expected_row,
+        }])
+
+    def test_purchase_order_export_invalid_params(self):
+        view = PurchaseOrderModelViewSet.as_view({"get": "export"})
+        request = self.api_factory.get(
+            "/purchase-orders/export/",
+            {"export_format": "xml", "status": "unknown"}
+        )
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_purchase_order_list_filter(self):
+        other_purchase_order = PurchaseOrderFactory(
+            vendor=VendorFactory(), status=PurchaseOrder.COMPLETED
+        )
+        self.purchase_order_2.status = PurchaseOrder.COMPLETED
+        self.purchase_order_2.save()
+        view = PurchaseOrderModelViewSet.as_view({"get": "list"})
+        filters = [
+            ({"vendor_code": self.vendor.vendor_code}, [
+                self.purchase_order_1, self.purchase_order_2
+            ]),
+            ({"status": PurchaseOrder.COMPLETED}, [
+                self.purchase_order_2, other_purchase_order
+            ]),
+            ({
+                "vendor_code": self.vendor.vendor_code,
+                "status": PurchaseOrder.COMPLETED,
+            }, [self.purchase_order_2]),
+            ({
+                "delivery_date_after": (
+                    timezone.now() - timezone.timedelta(days=1)
+                ).isoformat(),
+            }, []),
+            ({
+                "order_date_before": timezone.now().isoformat(),
+                "issue_date_after": (
+                    timezone.now() - timezone.timedelta(days=1)
+                ).isoformat(),
+            }, [
+                self.purchase_order_1,
+                self.purchase_order_2,
+                other_purchase_order
+            ]),
+        ]
+        for query_params, purchase_orders in filters:
+            request = self.api_factory.get("/purchase-orders/", query_params)
+            force_authenticate(request, user=self.admin_user)
+            response = view(request)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.data["results"],
+                PurchaseOrderSerializer(purchase_orders, many=True).data
+            )
+
+    def test_purchase_order_list_invalid_filter(self):
+        request = self.api_factory.get(
+            "/purchase-orders/", {"status": "lost", "order_date_after": "x"}
+        )
+        view = PurchaseOrderModelViewSet.as_view({"get": "list"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.data)
+        self.assertIn("order_date_after", response.data)
+
     def test_purchase_order_retrieve(self):
         request = self.api_factory.get("/purchase-orders/")
         view = PurchaseOrderModelViewSet.as_view({"get": "retrieve"})
@@ -301,6 +1615,62 @@ class PurchaseOrderModelViewSetTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(current_response, expected_response)
 
+    def test_purchase_order_retrieve_cache(self):
+        view = PurchaseOrderModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get("/purchase-orders/")
+        force_authenticate(request, user=self.admin_user)
+        response = view(request, pk=self.purchase_order_1.pk)
+        with self.assertNumQueries(0):
+            cached_response = view(request, pk=self.purchase_order_1.pk)
+        self.assertEqual(cached_response.data, response.data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.purchase_order_1.acknowledge()
+        response = view(request, pk=self.purchase_order_1.pk)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIsNotNone(response.data["acknowledgment_date"])
+
+        self.vendor.vendor_code = "RENAMED"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vendor.save()
+        response = view(request, pk=self.purchase_order_1.pk)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["vendor_code"], "RENAMED")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PurchaseOrder.objects.bulk_transition({
+                self.purchase_order_1.po_number: {
+                    "status": PurchaseOrder.CANCELLED
+                },
+            })
+        response = view(request, pk=self.purchase_order_1.pk)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["status"], PurchaseOrder.CANCELLED)
+
+    def test_purchase_order_retrieve_racing_a_vendor_write(self):
+        view = PurchaseOrderModelViewSet.as_view({"get": "retrieve"})
+        request = self.api_factory.get("/purchase-orders/")
+        force_authenticate(request, user=self.admin_user)
+        get_object = PurchaseOrderModelViewSet.get_object
+
+        def get_object_before_vendor_write(viewset):
+            purchase_order = get_object(viewset)
+            self.vendor.vendor_code = "RENAMED"
+            with self.captureOnCommitCallbacks(execute=True):
+                self.vendor.save()
+            return purchase_order
+
+        with mock.patch.object(
+            PurchaseOrderModelViewSet,
+            "get_object",
+            get_object_before_vendor_write,
+        ):
+            response = view(request, pk=self.purchase_order_1.pk)
+        self.assertNotEqual(response.data["vendor_code"], "RENAMED")
+        response = view(request, pk=self.purchase_order_1.pk)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["vendor_code"], "RENAMED")
+
     def test_purchase_order_create(self):
         request = self.api_factory.post(
             "/purchase-orders/",
@@ -372,3 +1742,1190 @@ class PurchaseOrderModelViewSetTests(TestCase):
 
         self.vendor.refresh_from_db()
         self.assertGreater(self.vendor.average_response_time, 0.0)
+
+    def test_purchase_order_bulk(self):
+        other_vendor = VendorFactory()
+        history_count = HistoricalPerformance.objects.count()
+        purchase_order = {
+            "vendor": self.vendor.pk,
+            "order_date": timezone.now(),
+            "delivery_date": timezone.now() - timezone.timedelta(days=1),
+            "items": [],
+            "quantity": 1,
+            "status": PurchaseOrder.COMPLETED,
+            "quality_rating": 4,
+        }
+        request = self.api_factory.post(
+            "/purchase-orders/bulk/",
+            [
+                {**purchase_order, "po_number": "bulk-1"},
+                {**purchase_order, "po_number": "bulk-2"},
+                {
+                    **purchase_order,
+                    "po_number": self.purchase_order_1.po_number,
+                    "vendor": other_vendor.pk,
+                },
+                {**purchase_order, "po_number": "bulk-3", "status": "lost"},
+                {**purchase_order, "po_number": "bulk-1"},
+                {**purchase_order, "po_number": "bulk-4", "vendor": 0},
+            ],
+            format="json"
+        )
+        view = PurchaseOrderModelViewSet.as_view({"post": "bulk"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(
+            [error["index"] for error in response.data["errors"]], [3, 4, 5]
+        )
+        self.assertIn("status", response.data["errors"][0]["errors"])
+
+        created = PurchaseOrder.objects.get(po_number="bulk-1")
+        self.assertIsNotNone(created.issue_date)
+        self.purchase_order_1.refresh_from_db()
+        self.assertEqual(self.purchase_order_1.vendor, other_vendor)
+
+        self.assertEqual(
+            HistoricalPerformance.objects.count(), history_count + 2
+        )
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.fulfillment_rate, 2 / 3)
+        self.assertEqual(self.vendor.quality_rating_avg, 4.0)
+        other_vendor.refresh_from_db()
+        self.assertEqual(other_vendor.fulfillment_rate, 1.0)
+
+    def test_purchase_order_bulk_cleaned_duplicates(self):
+        purchase_order = {
+            "vendor": self.vendor.pk,
+            "order_date": timezone.now(),
+            "delivery_date": timezone.now() + timezone.timedelta(days=1),
+            "items": [],
+            "quantity": 1,
+            "status": PurchaseOrder.PENDING,
+        }
+        request = self.api_factory.post(
+            "/purchase-orders/bulk/",
+            [
+                {**purchase_order, "po_number": "DUP1"},
+                {**purchase_order, "po_number": " DUP1 "},
+            ],
+            format="json"
+        )
+        view = PurchaseOrderModelViewSet.as_view({"post": "bulk"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(
+            [
+                (error["index"], error["po_number"])
+                for error in response.data["errors"]
+            ],
+            [(1, "DUP1")]
+        )
+        self.assertEqual(
+            PurchaseOrder.objects.filter(po_number="DUP1").count(), 1
+        )
+
+    def test_purchase_order_bulk_requires_list(self):
+        request = self.api_factory.post(
+            "/purchase-orders/bulk/", {"po_number": "1"}, format="json"
+        )
+        view = PurchaseOrderModelViewSet.as_view({"post": "bulk"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_purchase_order_bulk_transition(self):
+        signal_vendor = VendorFactory()
+        signal_purchase_orders = [
+            PurchaseOrderFactory(vendor=signal_vendor) for _ in range(3)
+        ]
+        bulk_purchase_orders = [
+            self.purchase_order_1,
+            self.purchase_order_2,
+            PurchaseOrderFactory(vendor=self.vendor),
+        ]
+        acknowledgment_date = timezone.now() + timezone.timedelta(seconds=5)
+        changes = [
+            {"status": PurchaseOrder.COMPLETED, "quality_rating": 5},
+            {
+                "status": PurchaseOrder.COMPLETED,
+                "quality_rating": 2,
+                "acknowledgment_date": acknowledgment_date,
+            },
+            {"status": PurchaseOrder.CANCELLED},
+        ]
+        for purchase_order, change in zip(signal_purchase_orders, changes):
+            for field, value in change.items():
+                setattr(purchase_order, field, value)
+            purchase_order.save()
+
+        history_count = HistoricalPerformance.objects.count()
+        request = self.api_factory.post(
+            "/purchase-orders/bulk_transition/",
+            [
+                {"po_number": purchase_order.po_number, **change}
+                for purchase_order, change in zip(
+                    bulk_purchase_orders, changes
+                )
+            ] + [
+                {"po_number": "missing", "status": PurchaseOrder.COMPLETED},
+                {"po_number": "invalid", "status": "lost"},
+            ],
+            format="json"
+        )
+        view = PurchaseOrderModelViewSet.as_view({"post": "bulk_transition"})
+        force_authenticate(request, user=self.admin_user)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 3)
+        self.assertEqual(
+            [error["po_number"] for error in response.data["errors"]],
+            ["missing", "invalid"]
+        )
+        self.assertEqual(
+            HistoricalPerformance.objects.count(), history_count + 1
+        )
+
+        self.vendor.refresh_from_db()
+        signal_vendor.refresh_from_db()
+        for metric in Vendor.PERFORMANCE_METRICS:
+            self.assertAlmostEqual(
+                getattr(self.vendor, metric),
+                getattr(signal_vendor, metric),
+                delta=0.5
+            )
+
+
+class FastReadSerializerTests(TestCase):
+    def setUp(self):
+        self.api_factory = APIRequestFactory()
+        self.admin_user = AdminFactory()
+        self.vendor = VendorFactory(name="Vendör")
+        self.purchase_orders = [
+            PurchaseOrderFactory(
+                vendor=self.vendor,
+                items=[{"name": "Item", "price": 9.5}],
+                status=PurchaseOrder.COMPLETED,
+                quality_rating=4.5,
+                acknowledgment_date=timezone.now(),
+            ),
+            PurchaseOrderFactory(vendor=self.vendor),
+        ]
+
+    def get_response(self, viewset, actions, data=None, **kwargs):
+        get_response_cache().clear()
+        request = self.api_factory.get("/", data)
+        force_authenticate(request, user=self.admin_user)
+        response = viewset.as_view(actions)(request, **kwargs)
+        response.render()
+        return response
+
+    def assertSameResponse(self, viewset, actions, data=None, **kwargs):
+        response = self.get_response(viewset, actions, data, **kwargs)
+        with override_settings(VENDOR_PULSE={"FAST_READ_SERIALIZERS": True}):
+            with self.assertNumQueries(1):
+                fast_response = self.get_response(
+                    viewset, actions, data, **kwargs
+                )
+        self.assertEqual(fast_response.status_code, response.status_code)
+        self.assertEqual(fast_response.content, response.content)
+
+    def test_purchase_order_list(self):
+        self.assertSameResponse(PurchaseOrderModelViewSet, {"get": "list"})
+        self.assertSameResponse(
+            PurchaseOrderModelViewSet, {"get": "list"}, {"page_size": 1}
+        )
+        self.assertSameResponse(
+            PurchaseOrderModelViewSet,
+            {"get": "list"},
+            {"status": PurchaseOrder.COMPLETED}
+        )
+
+    def test_purchase_order_retrieve(self):
+        for purchase_order in self.purchase_orders:
+            self.assertSameResponse(
+                PurchaseOrderModelViewSet,
+                {"get": "retrieve"},
+                pk=purchase_order.pk
+            )
+        self.assertSameResponse(
+            PurchaseOrderModelViewSet, {"get": "retrieve"}, pk=0
+        )
+        with timezone.override("Asia/Kolkata"):
+            self.assertSameResponse(
+                PurchaseOrderModelViewSet,
+                {"get": "retrieve"},
+                pk=self.purchase_orders[0].pk
+            )
+
+    def test_vendor_list_and_retrieve(self):
+        self.assertSameResponse(VendorModelViewSet, {"get": "list"})
+        self.assertSameResponse(
+            VendorModelViewSet, {"get": "retrieve"}, pk=self.vendor.pk
+        )
+
+    def test_vendor_performance(self):
+        response = self.get_response(
+            VendorModelViewSet, {"get": "performance"}, pk=self.vendor.pk
+        )
+        with override_settings(VENDOR_PULSE={"FAST_READ_SERIALIZERS": True}):
+            fast_response = self.get_response(
+                VendorModelViewSet, {"get": "performance"}, pk=self.vendor.pk
+            )
+        self.assertEqual(fast_response["ETag"], response["ETag"])
+        self.assertEqual(
+            list(json.loads(fast_response.content)), list(response.data)
+        )
+        self.assertEqual(
+            {**fast_response.data, "computed_at": None},
+            {**response.data, "computed_at": None}
+        )
+
+    def test_benchmark_serializers_command(self):
+        stdout = StringIO()
+        call_command(
+            "benchmark_serializers", "--rows", "20", "--repeat", "1",
+            stdout=stdout
+        )
+        output = stdout.getvalue()
+        self.assertIn("PurchaseOrderSerializer", output)
+        self.assertIn("rows/s", output)
+        self.assertEqual(PurchaseOrder.objects.count(), 2)
+
+
+class BenchmarkApiCommandTests(TestCase):
+    def setUp(self):
+        self.command = BenchmarkApiCommand()
+        self.options = {"vendors": 3, "purchase_orders": 30, "seed": 1}
+
+    def test_seed_is_deterministic(self):
+        vendor_ids, pending_ids = self.command.seed(self.options)
+        self.assertEqual(len(vendor_ids), 3)
+        self.assertEqual(PurchaseOrder.objects.count(), 30)
+        self.assertEqual(
+            len(pending_ids),
+            PurchaseOrder.objects.filter(status=PurchaseOrder.PENDING).count()
+        )
+        statuses = list(
+            PurchaseOrder.objects.order_by("po_number").values_list(
+                "po_number", "status", "quality_rating"
+            )
+        )
+
+        PurchaseOrder.objects.all().delete()
+        Vendor.objects.all().delete()
+        self.command.seed(self.options)
+        self.assertEqual(
+            list(
+                PurchaseOrder.objects.order_by("po_number").values_list(
+                    "po_number", "status", "quality_rating"
+                )
+            ),
+            statuses
+        )
+
+    def test_scenarios(self):
+        vendor_ids, pending_ids = self.command.seed(self.options)
+        scenarios = BenchmarkScenarios(vendor_ids, pending_ids)
+        token = Token.objects.create(user=UserFactory()).key
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+        for name in BenchmarkScenarios.names:
+            worker = BenchmarkWorker(getattr(scenarios, name), None, token)
+            worker.request(client, connection, 0)
+            self.assertEqual(worker.errors, 0, name)
+            self.assertGreater(worker.rows, 0, name)
+            self.assertGreater(worker.queries[0], 0, name)
+
+    def test_scratch_database_restores_test_name(self):
+        module = "vendor_pulse.management.commands.benchmark_api"
+        test_settings = connection.settings_dict["TEST"]
+        test_name = test_settings["NAME"]
+        with mock.patch(f"{module}.setup_test_environment"), \
+                mock.patch(f"{module}.teardown_test_environment"), \
+                mock.patch.object(
+                    connection.creation,
+                    "create_test_db",
+                    side_effect=OperationalError("unavailable"),
+                ):
+            with self.assertRaises(OperationalError):
+                with scratch_database(tempfile.gettempdir()):
+                    pass
+        self.assertEqual(test_settings["NAME"], test_name)
+
+    def test_percentiles(self):
+        self.assertEqual(get_percentiles([5.0]), [5.0, 5.0, 5.0])
+        self.assertEqual(
+            get_percentiles([float(value) for value in range(1, 102)]),
+            [51.0, 96.0, 100.0]
+        )
+
+
+class SeedVmsCommandTests(TestCase):
+    def setUp(self):
+        self.until = datetime.datetime(
+            2024, 3, 1, tzinfo=datetime.timezone.utc
+        )
+
+    def seed(self, prefix, seed=7):
+        return Seeder(seed=seed, prefix=prefix, until=self.until).seed(
+            4, 200, history_days=3
+        )
+
+    def get_rows(self, prefix):
+        return [
+            (po_number.removeprefix(prefix), *row)
+            for po_number, *row in PurchaseOrder.objects.filter(
+                po_number__startswith=f"{prefix}-"
+            ).order_by("pk").values_list(
+                "po_number",
+                "status",
+                "quality_rating",
+                "order_date",
+                "delivery_date",
+                "acknowledgment_date",
+                "items",
+            )
+        ]
+
+    def test_seed_is_deterministic(self):
+        self.assertEqual(self.seed("A"), (4, 200, 12))
+        self.seed("B")
+        self.assertEqual(self.get_rows("A"), self.get_rows("B"))
+        self.seed("C", seed=8)
+        self.assertNotEqual(self.get_rows("A"), self.get_rows("C"))
+
+    def test_seed_prepares_values_on_other_databases(self):
+        self.seed("A")
+        with mock.patch.object(connection, "vendor", "other"):
+            self.seed("B")
+        self.assertEqual(connection.vendor, "sqlite")
+        self.assertEqual(self.get_rows("A"), self.get_rows("B"))
+
+    def test_seed_rows(self):
+        self.seed("A")
+        self.assertEqual(HistoricalPerformance.objects.count(), 12)
+        statuses = set(
+            PurchaseOrder.objects.values_list("status", flat=True)
+        )
+        self.assertIn(PurchaseOrder.COMPLETED, statuses)
+        self.assertIn(PurchaseOrder.PENDING, statuses)
+        self.assertFalse(PurchaseOrder.objects.filter(
+            status=PurchaseOrder.COMPLETED, acknowledgment_date=None
+        ).exists())
+        self.assertFalse(PurchaseOrder.objects.exclude(
+            issue_date=F("order_date")
+        ).exists())
+
+        completed = PurchaseOrder.objects.filter(
+            status=PurchaseOrder.COMPLETED
+        )
+        self.assertFalse(completed.filter(
+            Q(delivery_date__gt=self.until) | Q(completed_at__gt=self.until)
+            | Q(acknowledgment_date__gt=F("completed_at"))
+        ).exists())
+        self.assertTrue(
+            completed.filter(delivery_date__lte=F("completed_at")).exists()
+        )
+        self.assertTrue(
+            completed.filter(delivery_date__gt=F("completed_at")).exists()
+        )
+        self.assertFalse(PurchaseOrder.objects.exclude(
+            status=PurchaseOrder.COMPLETED
+        ).exclude(completed_at=None).exists())
+
+        for vendor in Vendor.objects.all():
+            purchase_orders = vendor.purchase_orders.all()
+            self.assertAlmostEqual(
+                vendor.fulfillment_rate,
+                purchase_orders.filter(
+                    status=PurchaseOrder.COMPLETED
+                ).count() / purchase_orders.count()
+            )
+            self.assertAlmostEqual(
+                vendor.on_time_delivery_rate,
+                purchase_orders.filter(
+                    status=PurchaseOrder.COMPLETED,
+                    delivery_date__lte=F("completed_at"),
+                ).count() / purchase_orders.filter(
+                    status=PurchaseOrder.COMPLETED
+                ).count()
+            )
+            self.assertGreater(vendor.quality_rating_avg, 0)
+            self.assertGreater(vendor.average_response_time, 0)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command(
+            "seed_vms",
+            vendors=2,
+            purchase_orders=20,
+            history_days=0,
+            until="2024-03-01",
+            stdout=stdout,
+        )
+        self.assertIn(
+            "Seeded 2 vendors, 20 purchase orders", stdout.getvalue()
+        )
+        self.assertEqual(PurchaseOrder.objects.count(), 20)
+
+        with self.assertRaises(CommandError):
+            call_command("seed_vms", vendors=2, purchase_orders=20)
+        with self.assertRaises(CommandError):
+            call_command(
+                "seed_vms",
+                vendors=2,
+                purchase_orders=20,
+                prefix="OTHER",
+                defer_indexes=True,
+            )
+        self.assertFalse(
+            Vendor.objects.filter(vendor_code__startswith="OTHER-").exists()
+        )
+
+
+class DeferredIndexesTests(TransactionTestCase):
+    def get_indexes(self):
+        with connection.cursor() as cursor:
+            return connection.introspection.get_constraints(
+                cursor, PurchaseOrder._meta.db_table
+            ).keys()
+
+    def test_deferred_indexes(self):
+        names = [index.name for index in PurchaseOrder._meta.indexes]
+        with deferred_indexes(PurchaseOrder):
+            self.assertFalse(set(names) & set(self.get_indexes()))
+        self.assertLessEqual(set(names), set(self.get_indexes()))
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        get_response_cache().reset_stats()
+        get_request_metrics().reset()
+        self.vendor = VendorFactory()
+        PurchaseOrderFactory.create_batch(2, vendor=self.vendor)
+        self.token = Token.objects.create(user=UserFactory()).key
+        self.admin_token = Token.objects.create(user=AdminFactory()).key
+        self.client = Client(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def get_metrics(self):
+        response = self.client.get(
+            "/api/metrics/", HTTP_AUTHORIZATION=f"Bearer {self.admin_token}"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode().splitlines()
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/vendors/{self.vendor.pk}/")
+        self.assertEqual(response.status_code, 200)
+        db, app, total = response["Server-Timing"].split(", ")
+        self.assertRegex(
+            db, rf'^db;dur=[0-9.]+;desc="{len(queries)} queries"$'
+        )
+        self.assertRegex(app, r"^app;dur=-?[0-9.]+$")
+        self.assertRegex(total, r"^total;dur=[0-9.]+$")
+
+        with override_settings(
+            VENDOR_PULSE={"SERVER_TIMING_HEADER": False}
+        ):
+            response = self.client.get(f"/api/vendors/{self.vendor.pk}/")
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_metrics(self):
+        self.client.get("/api/purchase_orders/")
+        self.client.get("/api/purchase_orders/")
+        self.client.get(f"/api/vendors/{self.vendor.pk}/")
+        self.client.get(f"/api/vendors/{self.vendor.pk}/")
+        self.client.get("/api/vendors/0/")
+        self.client.get("/api/missing/")
+
+        metrics = self.get_metrics()
+        labels = 'view="purchaseorder-list",method="GET"'
+        self.assertIn(
+            f'vms_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} '
+            "2",
+            metrics
+        )
+        self.assertIn(
+            f"vms_http_request_db_queries_count{{{labels}}} 2", metrics
+        )
+        self.assertIn(
+            f'vms_http_responses_total{{{labels},status="200"}} 2', metrics
+        )
+        self.assertIn(
+            'vms_http_responses_total{view="vendor-detail",method="GET",'
+            'status="404"} 1',
+            metrics
+        )
+        self.assertIn(
+            'vms_http_responses_total{view="unmatched",method="GET",'
+            'status="404"} 1',
+            metrics
+        )
+        self.assertIn(
+            'vms_response_cache_hits_total{namespace="vendor"} 1', metrics
+        )
+        self.assertIn("# TYPE vms_http_request_db_queries histogram", metrics)
+
+    def test_unknown_methods(self):
+        self.client.generic("FOO", "/api/vendors/")
+        self.client.generic("BAR", "/api/vendors/")
+
+        metrics = self.get_metrics()
+        self.assertIn(
+            'vms_http_responses_total{view="vendor-list",method="other",'
+            'status="405"} 2',
+            metrics
+        )
+        self.assertNotIn('method="FOO"', metrics)
+
+    def test_async_view_metrics(self):
+        async def get():
+            return await AsyncClient().get(
+                "/api/async/vendors/",
+                headers={"Authorization": f"Bearer {self.token}"}
+            )
+
+        response = async_to_sync(get)()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('desc="0 queries"', response["Server-Timing"])
+        labels = 'view="async-vendor-list",method="GET"'
+        self.assertIn(
+            f"vms_http_request_db_queries_count{{{labels}}} 1",
+            self.get_metrics()
+        )
+
+    def test_metrics_are_for_admins(self):
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 403)
+
+    def test_histogram(self):
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+        self.assertEqual(
+            list(histogram.samples()), [(1, 2), (5, 3), ("+Inf", 4)]
+        )
+        self.assertEqual((histogram.sum, histogram.count), (14.5, 4))
+
+
+@override_settings(VENDOR_PULSE={"HOT_PATH_PROFILING": True})
+class HotPathProfilingTests(TestCase):
+    def setUp(self):
+        self.vendors = VendorFactory.create_batch(2)
+        get_profiler().reset()
+
+    def test_purchase_order_edit(self):
+        PurchaseOrderFactory(vendor=self.vendors[0])
+        stats = get_profiler().stats()
+        receiver_stats = stats["signals.update_vendor_performance_metrics"]
+        self.assertEqual(receiver_stats["calls"], 1)
+        self.assertEqual(receiver_stats["snapshots"], 1)
+        self.assertGreater(receiver_stats["queries"], 0)
+        self.assertGreater(receiver_stats["seconds"], 0)
+        self.assertEqual(
+            stats["models.Vendor.update_performance_metrics"]["snapshots"], 1
+        )
+        # Nested calls are included in the receiver's totals.
+        self.assertLessEqual(
+            stats["models.VendorPerformanceCounter.apply_delta"]["queries"],
+            receiver_stats["queries"]
+        )
+
+    def test_bulk_recalculation(self):
+        Vendor.objects.all().recalculate_performance_metrics()
+        self.assertEqual(
+            get_profiler().stats()[
+                "models.VendorQuerySet.recalculate_performance_metrics"
+            ]["snapshots"],
+            2
+        )
+
+    def test_disabled(self):
+        with override_settings(VENDOR_PULSE={}):
+            PurchaseOrderFactory(vendor=self.vendors[0])
+        self.assertEqual(get_profiler().stats(), {})
+
+    def test_metrics(self):
+        self.vendors[0].recalculate_performance_metrics()
+        self.assertIn(
+            'vms_hot_path_calls_total{path="models.Vendor.'
+            'recalculate_performance_metrics"} 1',
+            get_request_metrics().render().splitlines()
+        )
+
+    def test_profile_edits(self):
+        edits = ProfiledEdits(self.vendors)
+        purchase_orders = [None, None]
+        command = ProfileHotPathsCommand()
+        for name in ProfiledEdits.names:
+            result = command.profile(getattr(edits, name), purchase_orders)
+            self.assertGreater(result["queries_per_edit"], 0, name)
+            self.assertIn("signals.invalidate_purchase_order_cache", result[
+                "hot_paths"
+            ], name)
+        self.assertEqual(
+            result["hot_paths"][
+                "signals.revert_vendor_performance_metrics"
+            ]["calls"],
+            1
+        )
+        self.assertFalse(PurchaseOrder.objects.exists())
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        get_token_cache().clear()
+        self.api_factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.token = Token.objects.create(user=self.user)
+        self.async_client = AsyncClient()
+        self.vendor = VendorFactory(name="Vendör")
+        self.purchase_orders = [
+            PurchaseOrderFactory(
+                vendor=self.vendor,
+                items=[{"name": "Item", "price": 9.5}],
+                status=PurchaseOrder.COMPLETED,
+                quality_rating=4.5,
+                acknowledgment_date=timezone.now(),
+            ),
+            PurchaseOrderFactory(vendor=self.vendor),
+        ]
+
+    def get(self, path, data=None, **headers):
+        return self.async_client.get(path, data, headers={
+            "Authorization": f"Bearer {self.token.key}", **headers
+        })
+
+    def get_sync_data(self, viewset, actions, data=None, **kwargs):
+        get_response_cache().clear()
+        request = self.api_factory.get("/", data)
+        force_authenticate(request, user=self.user)
+        response = viewset.as_view(actions)(request, **kwargs)
+        response.render()
+        return json.loads(response.content)
+
+    async def test_vendor_list(self):
+        response = await self.get("/api/async/vendors/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"],
+            (await sync_to_async(self.get_sync_data)(
+                VendorModelViewSet, {"get": "list"}
+            ))["results"]
+        )
+
+    async def test_purchase_order_list_pagination(self):
+        response = await self.get(
+            "/api/async/purchase_orders/", {"page_size": 1}
+        )
+        self.assertEqual(response.status_code, 200)
+        first_page = response.json()
+        self.assertIn("/api/async/purchase_orders/", first_page["next"])
+
+        response = await self.get(first_page["next"])
+        second_page = response.json()
+        self.assertIsNone(second_page["next"])
+        self.assertEqual(
+            first_page["results"] + second_page["results"],
+            (await sync_to_async(self.get_sync_data)(
+                PurchaseOrderModelViewSet, {"get": "list"}
+            ))["results"]
+        )
+
+    async def test_purchase_order_list_filter(self):
+        response = await self.get(
+            "/api/async/purchase_orders/",
+            {"status": PurchaseOrder.COMPLETED}
+        )
+        self.assertEqual(
+            [row["po_number"] for row in response.json()["results"]],
+            [self.purchase_orders[0].po_number]
+        )
+
+        response = await self.get(
+            "/api/async/purchase_orders/", {"status": "unknown"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.json())
+
+    async def test_purchase_order_retrieve_cache(self):
+        purchase_order = self.purchase_orders[0]
+        url = f"/api/async/purchase_orders/{purchase_order.pk}/"
+        response = await self.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(
+            response.json(),
+            await sync_to_async(self.get_sync_data)(
+                PurchaseOrderModelViewSet,
+                {"get": "retrieve"},
+                pk=purchase_order.pk,
+            )
+        )
+
+        response = await self.get(url)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        response = await self.get(
+            url, **{"If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_vendor_retrieve_not_found(self):
+        for pk in (0, "abc"):
+            response = await self.get(f"/api/async/vendors/{pk}/")
+            self.assertEqual(response.status_code, 404)
+
+    async def test_vendor_performance(self):
+        url = f"/api/async/vendors/{self.vendor.pk}/performance/"
+        response = await self.get(url, {"recalculate": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["fulfillment_rate"], 0.5)
+        self.assertEqual(response.json()["quality_rating_avg"], 4.5)
+
+        response = await self.get(url)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        response = await self.get(url, {"recalculate": 2})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_authentication(self):
+        client = AsyncClient()
+        response = await client.get("/api/async/vendors/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Bearer")
+
+        response = await client.get(
+            "/api/async/vendors/", headers={"Authorization": "Bearer bad"}
+        )
+        self.assertEqual(response.status_code, 401)
+
+        for header in ("Bearer", "Bearer a b"):
+            response = await client.get(
+                "/api/async/vendors/", headers={"Authorization": header}
+            )
+            self.assertEqual(response.status_code, 401)
+            self.assertIn("Invalid token header", response.json()["detail"])
+
+    async def test_method_not_allowed(self):
+        response = await self.async_client.post(
+            "/api/async/vendors/",
+            headers={"Authorization": f"Bearer {self.token.key}"}
+        )
+        self.assertEqual(response.status_code, 405)
+
+
+class QueryBudgetTests(TestCase):
+    '''
+        Pins the number of SQL queries of each endpoint with several vendors
+        and purchase orders in the database, so an N+1 query fails here.
+    '''
+    def setUp(self):
+        get_response_cache().clear()
+        self.api_factory = APIRequestFactory()
+        self.admin_user = AdminFactory()
+        self.vendors = VendorFactory.create_batch(3)
+        self.purchase_orders = [
+            PurchaseOrderFactory(
+                vendor=vendor,
+                status=PurchaseOrder.COMPLETED,
+                quality_rating=4.0,
+                acknowledgment_date=timezone.now(),
+            )
+            for vendor in self.vendors
+            for _ in range(3)
+        ]
+        self.vendor = self.vendors[0]
+        self.purchase_order = self.purchase_orders[0]
+
+    def assertQueryBudget(
+        self, budget, viewset, actions, method="get", data=None, **kwargs
+    ):
+        if method == "get":
+            request = self.api_factory.get("/", data)
+        else:
+            request = getattr(self.api_factory, method)(
+                "/", data, format="json"
+            )
+        force_authenticate(request, user=self.admin_user)
+        view = viewset.as_view(
+            actions, **getattr(getattr(viewset, actions[method]), "kwargs", {})
+        )
+        with self.assertNumQueries(budget):
+            response = view(request, **kwargs)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertLess(response.status_code, 300)
+        return response
+
+    def get_purchase_order_data(self, **data):
+        return {
+            "po_number": "QB-1",
+            "vendor": self.vendor.pk,
+            "order_date": timezone.now(),
+            "delivery_date": timezone.now(),
+            "items": [],
+            "quantity": 1,
+            "status": PurchaseOrder.PENDING,
+            **data,
+        }
+
+    def test_vendor_list(self):
+        self.assertQueryBudget(1, VendorModelViewSet, {"get": "list"})
+
+    def test_vendor_retrieve(self):
+        self.assertQueryBudget(
+            1, VendorModelViewSet, {"get": "retrieve"}, pk=self.vendor.pk
+        )
+        self.assertQueryBudget(
+            0, VendorModelViewSet, {"get": "retrieve"}, pk=self.vendor.pk
+        )
+
+    def test_vendor_create(self):
+        self.assertQueryBudget(
+            2, VendorModelViewSet, {"post": "create"}, "post", {
+                "name": "Vendor",
+                "contact_details": "1234567890",
+                "address": "Address",
+                "vendor_code": "QB-VENDOR",
+            }
+        )
+
+    def test_vendor_update(self):
+        self.assertQueryBudget(
+            3, VendorModelViewSet, {"put": "update"}, "put", {
+                "name": "Vendor",
+                "contact_details": "1234567890",
+                "address": "Address",
+                "vendor_code": "QB-VENDOR",
+            },
+            pk=self.vendor.pk
+        )
+
+    def test_vendor_partial_update(self):
+        self.assertQueryBudget(
+            2, VendorModelViewSet, {"patch": "partial_update"}, "patch",
+            {"name": "Vendor"}, pk=self.vendor.pk
+        )
+
+    def test_vendor_destroy(self):
+        self.assertQueryBudget(
+            8, VendorModelViewSet, {"delete": "destroy"}, "delete",
+            pk=self.vendor.pk
+        )
+
+    def test_vendor_performance(self):
+        self.assertQueryBudget(
+            1, VendorModelViewSet, {"get": "performance"},
+            pk=self.vendor.pk
+        )
+        self.assertQueryBudget(
+            0, VendorModelViewSet, {"get": "performance"},
+            pk=self.vendor.pk
+        )
+        self.assertQueryBudget(
+            10, VendorModelViewSet, {"get": "performance"},
+            data={"recalculate": 1}, pk=self.vendor.pk
+        )
+
+    def test_vendor_performance_history(self):
+        self.assertQueryBudget(
+            4, VendorModelViewSet, {"get": "performance_history"},
+            pk=self.vendor.pk
+        )
+
+    def test_vendor_performance_history_export(self):
+        self.assertQueryBudget(
+            2, VendorModelViewSet, {"get": "performance_history_export"}
+        )
+
+    def test_vendor_ranking(self):
+        self.assertQueryBudget(
+            1, VendorModelViewSet, {"get": "ranking"},
+            data={"metric": "fulfillment_rate"}
+        )
+
+    def test_purchase_order_list(self):
+        self.assertQueryBudget(1, PurchaseOrderModelViewSet, {"get": "list"})
+
+    def test_purchase_order_retrieve(self):
+        self.assertQueryBudget(
+            1, PurchaseOrderModelViewSet, {"get": "retrieve"},
+            pk=self.purchase_order.pk
+        )
+        self.assertQueryBudget(
+            0, PurchaseOrderModelViewSet, {"get": "retrieve"},
+            pk=self.purchase_order.pk
+        )
+
+    def test_purchase_order_create(self):
+        self.assertQueryBudget(
+            7, PurchaseOrderModelViewSet, {"post": "create"}, "post",
+            self.get_purchase_order_data()
+        )
+
+    def test_purchase_order_update(self):
+        self.assertQueryBudget(
+            4, PurchaseOrderModelViewSet, {"put": "update"}, "put",
+            self.get_purchase_order_data(
+                po_number=self.purchase_order.po_number,
+                delivery_date=self.purchase_order.delivery_date,
+                status=PurchaseOrder.COMPLETED,
+            ),
+            pk=self.purchase_order.pk
+        )
+
+    def test_purchase_order_partial_update(self):
+        self.assertQueryBudget(
+            6, PurchaseOrderModelViewSet, {"patch": "partial_update"},
+            "patch", {"quality_rating": 2.0}, pk=self.purchase_order.pk
+        )
+
+    def test_purchase_order_destroy(self):
+        self.assertQueryBudget(
+            6, PurchaseOrderModelViewSet, {"delete": "destroy"}, "delete",
+            pk=self.purchase_order.pk
+        )
+
+    def test_purchase_order_acknowledge(self):
+        self.assertQueryBudget(
+            6, PurchaseOrderModelViewSet, {"post": "acknowledge"}, "post",
+            pk=self.purchase_order.pk
+        )
+
+    def test_purchase_order_export(self):
+        self.assertQueryBudget(
+            1, PurchaseOrderModelViewSet, {"get": "export"}
+        )
+
+    def test_purchase_order_bulk(self):
+        self.assertQueryBudget(
+            13, PurchaseOrderModelViewSet, {"post": "bulk"}, "post", [
+                self.get_purchase_order_data(po_number=f"QB-{index}")
+                for index in range(5)
+            ]
+        )
+
+    def test_purchase_order_bulk_transition(self):
+        self.assertQueryBudget(
+            12, PurchaseOrderModelViewSet, {"post": "bulk_transition"},
+            "post", [
+                {
+                    "po_number": purchase_order.po_number,
+                    "status": PurchaseOrder.CANCELLED,
+                }
+                for purchase_order in self.purchase_orders
+            ]
+        )
+
+
+class SQLiteProductionProfileTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = str(Path(directory.name) / "db.sqlite3")
+
+    def create_connection(self, **options):
+        connection = ConnectionHandler({
+            "default": {
+                "ENGINE": "vms.sqlite3",
+                "NAME": self.path,
+                "OPTIONS": options,
+            }
+        }).create_connection("default")
+        self.addCleanup(connection.close)
+        return connection
+
+    def test_pragmas(self):
+        connection = self.create_connection(
+            **settings.SQLITE_PRODUCTION_OPTIONS
+        )
+        with connection.cursor() as cursor:
+            pragmas = {}
+            for pragma in ("journal_mode", "synchronous", "busy_timeout"):
+                cursor.execute(f"PRAGMA {pragma}")
+                pragmas[pragma] = cursor.fetchone()[0]
+        self.assertEqual(
+            pragmas,
+            {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000}
+        )
+
+    def test_invalid_pragma(self):
+        connection = self.create_connection(
+            pragmas={"journal_mode": "wal; DROP TABLE vendor"}
+        )
+        with self.assertRaises(ImproperlyConfigured):
+            connection.ensure_connection()
+
+    def test_immediate_transaction_takes_write_lock(self):
+        connection = self.create_connection(
+            pragmas={"busy_timeout": 0}, transaction_mode="immediate"
+        )
+        other_connection = self.create_connection(pragmas={"busy_timeout": 0})
+        connection._start_transaction_under_autocommit()
+        with self.assertRaises(OperationalError):
+            other_connection.cursor().execute("BEGIN IMMEDIATE")
+        connection.cursor().execute("COMMIT")
+
+    def test_stress_sqlite_command(self):
+        stdout = StringIO()
+        call_command(
+            "stress_sqlite",
+            duration=0.2,
+            readers=1,
+            writers=1,
+            vendors=2,
+            purchase_orders=10,
+            stdout=stdout,
+        )
+        output = stdout.getvalue()
+        self.assertIn("development:", output)
+        self.assertIn("production: ", output)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(SimpleTestCase):
+    # Outside TestCase's transaction, which keeps reads on the primary.
+    databases = {"default"}
+
+    def setUp(self):
+        self.request_factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def get_read_databases(self, request, *reads):
+        '''
+            Runs `request` through ReplicaRoutingMiddleware and returns the
+            response and the database each of `reads` was routed to.
+        '''
+        databases = []
+        request.resolver_match = resolve(request.path_info)
+
+        def get_response(request):
+            middleware.process_view(request, None, (), {})
+            for read in reads:
+                databases.append(read())
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request), databases
+
+    def read_vendor(self):
+        return self.router.db_for_read(Vendor)
+
+    def test_configured_endpoint_reads_from_replica(self):
+        _, databases = self.get_read_databases(
+            self.request_factory.get("/api/vendors/"),
+            self.read_vendor,
+            lambda: self.router.db_for_read(Token),
+        )
+        self.assertEqual(databases, ["replica", "default"])
+
+    def test_other_endpoint_reads_from_primary(self):
+        _, databases = self.get_read_databases(
+            self.request_factory.get("/api/cache/stats/"), self.read_vendor
+        )
+        self.assertEqual(databases, ["default"])
+
+    def test_read_after_write_reads_from_primary(self):
+        _, databases = self.get_read_databases(
+            self.request_factory.get("/api/vendors/"),
+            self.read_vendor,
+            lambda: self.router.db_for_write(Vendor),
+            self.read_vendor,
+        )
+        self.assertEqual(databases, ["replica", "default", "default"])
+
+    def test_transaction_reads_from_primary(self):
+        def read_in_transaction():
+            with transaction.atomic():
+                return self.read_vendor()
+
+        _, databases = self.get_read_databases(
+            self.request_factory.get("/api/vendors/"), read_in_transaction
+        )
+        self.assertEqual(databases, ["default"])
+
+    def test_write_pins_client_to_primary(self):
+        response, databases = self.get_read_databases(
+            self.request_factory.post("/api/vendors/"), self.read_vendor
+        )
+        self.assertEqual(databases, ["default"])
+        cookie_name = ReplicaRoutingMiddleware.cookie_name
+        self.assertIn(cookie_name, response.cookies)
+
+        request = self.request_factory.get("/api/vendors/")
+        request.COOKIES[cookie_name] = "1"
+        _, databases = self.get_read_databases(request, self.read_vendor)
+        self.assertEqual(databases, ["default"])
+
+    def test_write_pins_api_client_to_primary(self):
+        caches["default"].clear()
+        self.addCleanup(caches["default"].clear)
+        self.get_read_databases(self.request_factory.post(
+            "/api/vendors/", HTTP_AUTHORIZATION="Bearer writer"
+        ))
+
+        _, databases = self.get_read_databases(
+            self.request_factory.get(
+                "/api/vendors/", HTTP_AUTHORIZATION="Bearer writer"
+            ),
+            self.read_vendor
+        )
+        self.assertEqual(databases, ["default"])
+
+        _, databases = self.get_read_databases(
+            self.request_factory.get(
+                "/api/vendors/", HTTP_AUTHORIZATION="Bearer reader"
+            ),
+            self.read_vendor
+        )
+        self.assertEqual(databases, ["replica"])
+
+    def test_replica_reads_are_flagged(self):
+        request = self.request_factory.get("/api/vendors/")
+        self.get_read_databases(request, self.read_vendor)
+        self.assertTrue(request.replica_routing.read_from_replica)
+
+        request = self.request_factory.get("/api/cache/stats/")
+        self.get_read_databases(request, self.read_vendor)
+        self.assertFalse(request.replica_routing.read_from_replica)
+
+    def test_outside_request_reads_from_primary(self):
+        self.assertEqual(self.read_vendor(), "default")
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "vendor_pulse"))
+        self.assertIsNone(self.router.allow_migrate("default", "vendor_pulse"))
+
+    def test_copy_database(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        handler = ConnectionHandler({
+            alias: {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": str(Path(directory.name) / f"{alias}.sqlite3"),
+            }
+            for alias in ("default", "replica")
+        })
+        primary, replica = handler["default"], handler["replica"]
+        self.addCleanup(handler.close_all)
+        with primary.cursor() as cursor:
+            cursor.execute("CREATE TABLE vendor (name TEXT)")
+            cursor.execute("INSERT INTO vendor VALUES ('Vendor')")
+
+        copy_database(primary, replica, pages=1)
+        with replica.cursor() as cursor:
+            cursor.execute("SELECT name FROM vendor")
+            self.assertEqual(cursor.fetchall(), [("Vendor",)])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_sync_replica_without_replicas(self):
+        with self.assertRaises(CommandError):
+            call_command("sync_replica")
@@ -1,7 +1,54 @@
 from django.urls import path, include
 
+from .async_views import (
+    AsyncVendorListView,
+    AsyncVendorRetrieveView,
+    AsyncVendorPerformanceView,
+    AsyncPurchaseOrderListView,
+    AsyncPurchaseOrderRetrieveView,
+)
 from .routers import vp_api_router
+from .views import ResponseCacheStatsView, RequestMetricsView
+
+async_urlpatterns = [
+    path(
+        "vendors/",
+        AsyncVendorListView.as_view(),
+        name="async-vendor-list"
+    ),
+    path(
+        "vendors/<str:pk>/",
+        AsyncVendorRetrieveView.as_view(),
+        name="async-vendor-detail"
+    ),
+    path(
+        "vendors/<str:pk>/performance/",
+        AsyncVendorPerformanceView.as_view(),
+        name="async-vendor-performance"
+    ),
+    path(
+        "purchase_orders/",
+        AsyncPurchaseOrderListView.as_view(),
+        name="async-purchaseorder-list"
+    ),
+    path(
+        "purchase_orders/<str:pk>/",
+        AsyncPurchaseOrderRetrieveView.as_view(),
+        name="async-purchaseorder-detail"
+    ),
+]
 
 urlpatterns = [
+    path(
+        "cache/stats/",
+        ResponseCacheStatsView.as_view(),
+        name="response-cache-stats"
+    ),
+    path(
+        "metrics/",
+        RequestMetricsView.as_view(),
+        name="request-metrics"
+    ),
+    path("async/", include(async_urlpatterns)),
     path("", include(vp_api_router.urls)),
 ]
@@ -1,46 +1,401 @@
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import DateTimeField
+from rest_framework.generics import get_object_or_404
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 
 from .models import (
     Vendor,
     PurchaseOrder,
+    HistoricalPerformance,
+    HistoricalPerformanceRollup,
 )
 from .serializers import (
     VendorSerializer,
     PurchaseOrderSerializer,
+    PurchaseOrderBulkSerializer,
+    PurchaseOrderBulkResultSerializer,
+    PurchaseOrderTransitionSerializer,
+    PurchaseOrderTransitionResultSerializer,
     VendorPerformanceSerializer,
+    PerformanceHistoryQuerySerializer,
+    PerformanceHistoryBucketSerializer,
+    VendorRankingQuerySerializer,
+    VendorRankingSerializer,
+    ResponseCacheStatsSerializer,
+    ExportQuerySerializer,
 )
 from .authentication import CustomTokenAuthentication
+from .cache import (
+    get_etag,
+    get_response_cache,
+    VENDOR,
+    PURCHASE_ORDER,
+    PERFORMANCE,
+)
+from .conf import get_setting
+from .fast_serializers import FastJSONRenderer, get_field_plan
+from .exports import (
+    export_response,
+    export_rows,
+    iter_performance_history,
+    PURCHASE_ORDER_COLUMNS,
+    PERFORMANCE_HISTORY_COLUMNS,
+)
+from .filters import (
+    VendorFilterBackend,
+    PurchaseOrderFilterBackend,
+    HistoricalPerformanceFilterBackend,
+    HistoricalPerformanceRollupFilterBackend,
+)
+from .instrumentation import get_request_metrics, PROMETHEUS_CONTENT_TYPE
+from .pagination import IdCursorPagination
 from .schema import (
     VendorSchema as vendor_schema,
     PurchaseOrderSchema as purchase_order_schema,
+    ResponseCacheSchema as response_cache_schema,
+    RequestMetricsSchema as request_metrics_schema,
 )
 
 
+def get_cache_headers(entry, hit):
+    return {
+        "ETag": entry["etag"],
+        "X-Cache": "HIT" if hit else "MISS",
+    }
+
+
+def get_conditional_cached_response(request, entry, response):
+    return get_conditional_response(
+        request,
+        etag=entry["etag"],
+        response=response,
+    )
+
+
+def get_cache_pk(pk, query_params, cache_query_params=()):
+    '''
+        Returns `pk` as the integer the response is cached under, or None
+        if it is not in canonical form or `query_params` has parameters
+        other than `cache_query_params`.
+    '''
+    if set(query_params) - set(cache_query_params):
+        return None
+
+    pk = str(pk)
+    if not pk.isdigit() or pk != str(int(pk)):
+        return None
+    return int(pk)
+
+
+def read_from_replica(request):
+    '''
+        Whether `request` read from a read replica, set by
+        `vms.db_routers.ReplicaRoutingMiddleware`. Such reads may lag behind
+        the primary, so they are not cached.
+    '''
+    routing = getattr(request, "replica_routing", None)
+    return routing is not None and routing.read_from_replica
+
+
+def get_cache_dependencies(cache_dependencies, data):
+    '''
+        Returns the `(namespace, pk)` of each object the cached `data`
+        depends on, given `(namespace, field)` pairs naming the field of
+        `data` holding its pk.
+    '''
+    return [
+        (namespace, data[field]) for namespace, field in cache_dependencies
+    ]
+
+
+def get_performance_etag(performance):
+    '''
+        The ETag of a performance response covers the metrics only, so it
+        does not change with `computed_at` while the metrics stay the same.
+    '''
+    return get_etag({
+        metric: value for metric, value in performance.items()
+        if metric != "computed_at"
+    })
+
+
+def get_cached_response(request, entry, hit):
+    '''
+        Returns the cached `entry` with its ETag header, or a 304 if the
+        request's `If-None-Match` header matches it.
+    '''
+    response = Response(entry["data"], headers=get_cache_headers(entry, hit))
+    return get_conditional_cached_response(request, entry, response)
+
+
+class SerializerQuerySetMixin:
+    '''
+        Builds the queryset from what the serializer reads: relations it
+        follows are fetched with `select_related`, and `only_actions` load
+        only the fields it outputs. If a serializer field reads something
+        other than a model field the queryset loads every field.
+        `SerializerMethodField`s must only read fields the serializer
+        already reads.
+    '''
+    only_actions = ("list", "retrieve")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        plan = get_field_plan(
+            self.queryset.model, self.get_serializer_class()
+        )
+        if plan is None:
+            return queryset
+
+        paths = plan.paths
+
+        related = {
+            path.rpartition("__")[0] for path in paths if "__" in path
+        }
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        if self.action in self.only_actions:
+            queryset = queryset.only(queryset.model._meta.pk.name, *paths)
+        return queryset
+
+
+class FastReadMixin:
+    '''
+        With the `FAST_READ_SERIALIZERS` setting, `list` and `retrieve` read
+        rows with `.values()` and build the response data with the
+        serializer's FieldPlan instead of serializing model instances, and
+        JSON is rendered with FastJSONRenderer. Serializers whose fields are
+        not all model fields keep the regular path.
+    '''
+    def get_fast_read_plan(self, serializer_class=None):
+        if not get_setting("FAST_READ_SERIALIZERS"):
+            return None
+        return get_field_plan(
+            self.queryset.model,
+            serializer_class or self.get_serializer_class()
+        )
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if not get_setting("FAST_READ_SERIALIZERS"):
+            return renderers
+        return [
+            FastJSONRenderer() if type(renderer) is JSONRenderer else renderer
+            for renderer in renderers
+        ]
+
+    def get_fast_read_row(self, plan):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            plan.values(self.filter_queryset(self.get_queryset())),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(self.request, row)
+        return row
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_fast_read_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(plan.many(rows))
+        return self.get_paginated_response(plan.many(page))
+
+    def retrieve(self, request, *args, **kwargs):
+        plan = self.get_fast_read_plan()
+        if plan is None:
+            return super().retrieve(request, *args, **kwargs)
+        return Response(plan.to_representation(self.get_fast_read_row(plan)))
+
+
+class CachedRetrieveMixin:
+    '''
+        Serves `retrieve` from the response cache under `cache_namespace`.
+        Requests with query parameters other than `cache_query_params` are
+        not cached, as filters may change the response. Cached responses
+        are also invalidated with the objects in `cache_dependencies`.
+    '''
+    cache_namespace = None
+    cache_dependencies = ()
+
+    def get_cache_pk(self, cache_query_params=()):
+        return get_cache_pk(
+            self.kwargs[self.lookup_url_kwarg or self.lookup_field],
+            self.request.query_params,
+            cache_query_params,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = self.get_cache_pk()
+        if pk is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        response_cache = get_response_cache()
+        entry = response_cache.get(self.cache_namespace, pk)
+        if entry is not None:
+            return get_cached_response(request, entry, hit=True)
+
+        read_versions = response_cache.read_versions(
+            self.cache_namespace,
+            pk,
+            [namespace for namespace, _ in self.cache_dependencies],
+        )
+        response = super().retrieve(request, *args, **kwargs)
+        entry = response_cache.set(
+            self.cache_namespace,
+            pk,
+            response.data,
+            read_versions,
+            depends_on=get_cache_dependencies(
+                self.cache_dependencies, response.data
+            ),
+            store=not read_from_replica(request),
+        )
+        return get_cached_response(request, entry, hit=False)
+
+
 @vendor_schema.schema()
 @vendor_schema.docs()
-class VendorModelViewSet(ModelViewSet):
+class VendorModelViewSet(
+    CachedRetrieveMixin, FastReadMixin, SerializerQuerySetMixin, ModelViewSet
+):
     authentication_classes = [CustomTokenAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
+    pagination_class = IdCursorPagination
+    filter_backends = [VendorFilterBackend]
+    cache_namespace = VENDOR
 
     @action(detail=True, methods=["get"])
     def performance(self, request, pk=None):
+        recalculate = request.query_params.get("recalculate", "0")
+        if recalculate not in ("0", "1"):
+            raise ValidationError({"recalculate": ["Must be 0 or 1."]})
+
+        response_cache = get_response_cache()
+        pk = self.get_cache_pk(cache_query_params=["recalculate"])
+        if recalculate == "0" and pk is not None:
+            entry = response_cache.get(PERFORMANCE, pk)
+            if entry is not None:
+                return get_cached_response(request, entry, hit=True)
+
+        # A recalculation invalidates the versions read here, so its
+        # response is not stored; the next read fills the cache.
+        read_versions = (
+            response_cache.read_versions(PERFORMANCE, pk) if pk is not None
+            else None
+        )
+        computed_at = timezone.now()
+        plan = self.get_fast_read_plan(VendorPerformanceSerializer)
+        if plan is not None and recalculate == "0":
+            row = self.get_fast_read_row(plan)
+            vendor_pk = row["id"]
+            performance = plan.to_representation(
+                row,
+                computed_at=DateTimeField().to_representation(computed_at)
+            )
+        else:
+            vendor: Vendor = self.get_object()
+            if recalculate == "1":
+                # Inside a transaction the router reads from the primary.
+                with transaction.atomic():
+                    vendor.recalculate_performance_metrics()
+
+            vendor_pk = vendor.pk
+            performance = VendorPerformanceSerializer(
+                vendor, context={"computed_at": computed_at}
+            ).data
+
+        entry = response_cache.set(
+            PERFORMANCE,
+            vendor_pk,
+            performance,
+            read_versions,
+            timeout=get_setting("PERFORMANCE_CACHE_TIMEOUT"),
+            etag=get_performance_etag(performance),
+            store=pk is not None and not read_from_replica(request),
+        )
+        return get_cached_response(request, entry, hit=False)
+
+    @action(detail=True, methods=["get"], url_path="performance/history")
+    def performance_history(self, request, pk=None):
         vendor: Vendor = self.get_object()
-        vender_performance = VendorPerformanceSerializer(vendor)
-        return Response(vender_performance.data)
+        query = PerformanceHistoryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        buckets = vendor.get_performance_history(**query.validated_data)
+        return Response(
+            PerformanceHistoryBucketSerializer(buckets, many=True).data
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="performance/history/export",
+        filter_backends=[HistoricalPerformanceFilterBackend],
+    )
+    def performance_history_export(self, request):
+        query = ExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        snapshots = self.filter_queryset(
+            HistoricalPerformance.objects.order_by("vendor_id", "date")
+        )
+        rollups = HistoricalPerformanceRollupFilterBackend().filter_queryset(
+            request,
+            HistoricalPerformanceRollup.objects.order_by(
+                "vendor_id", "period_start"
+            ),
+            self
+        )
+        return export_rows(
+            iter_performance_history(snapshots, rollups),
+            PERFORMANCE_HISTORY_COLUMNS,
+            query.validated_data["export_format"],
+            "performance_history",
+        )
+
+    @action(detail=False, methods=["get"])
+    def ranking(self, request):
+        query = VendorRankingQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        vendors = list(self.filter_queryset(self.get_queryset()).ranked(
+            query.validated_data["metric"],
+            descending=query.validated_data["direction"] == "desc",
+            min_orders=query.validated_data["min_orders"],
+        )[:query.validated_data["limit"]])
+        ranks = {vendor.pk: rank for rank, vendor in enumerate(vendors, 1)}
+        return Response(VendorRankingSerializer(
+            vendors, many=True, context={"ranks": ranks}
+        ).data)
 
 
 @purchase_order_schema.schema()
 @purchase_order_schema.docs()
-class PurchaseOrderModelViewSet(ModelViewSet):
+class PurchaseOrderModelViewSet(
+    CachedRetrieveMixin, FastReadMixin, SerializerQuerySetMixin, ModelViewSet
+):
     authentication_classes = [CustomTokenAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = PurchaseOrder.objects.all()
     serializer_class = PurchaseOrderSerializer
+    pagination_class = IdCursorPagination
+    filter_backends = [PurchaseOrderFilterBackend]
+    cache_namespace = PURCHASE_ORDER
+    # The vendor code is serialized with each purchase order.
+    cache_dependencies = ((VENDOR, "vendor"), )
 
     @action(detail=True, methods=["post"])
     def acknowledge(self, request, pk=None):
@@ -48,3 +403,154 @@ class PurchaseOrderModelViewSet(ModelViewSet):
         purchase_order.acknowledge()
         purchase_order_serializer = PurchaseOrderSerializer(purchase_order)
         return Response(purchase_order_serializer.data)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        query = ExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        return export_response(
+            self.filter_queryset(self.get_queryset()).order_by("id"),
+            PURCHASE_ORDER_COLUMNS,
+            query.validated_data["export_format"],
+            "purchase_orders",
+        )
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {"non_field_errors": ["Expected a list of purchase orders."]}
+            )
+
+        rows = [row if isinstance(row, dict) else {} for row in request.data]
+        vendor_ids = {
+            str(row.get("vendor")) for row in rows
+            if str(row.get("vendor")).isdigit()
+        }
+        context = {
+            **self.get_serializer_context(),
+            "vendors": Vendor.objects.in_bulk(vendor_ids),
+        }
+
+        purchase_orders = []
+        po_numbers = set()
+        errors = []
+        for index, data in enumerate(request.data):
+            serializer = PurchaseOrderBulkSerializer(
+                data=data, context=context
+            )
+            if not serializer.is_valid():
+                errors.append({
+                    "index": index,
+                    "po_number": rows[index].get("po_number"),
+                    "errors": serializer.errors,
+                })
+                continue
+
+            # Compared once cleaned, as the upsert matches on that value.
+            po_number = serializer.validated_data["po_number"]
+            if po_number in po_numbers:
+                errors.append({
+                    "index": index,
+                    "po_number": po_number,
+                    "errors": {
+                        "po_number": [
+                            "Duplicate purchase order number in request."
+                        ]
+                    },
+                })
+                continue
+
+            po_numbers.add(po_number)
+            purchase_orders.append(PurchaseOrder(**serializer.validated_data))
+
+        created, updated = PurchaseOrder.objects.bulk_upsert(purchase_orders)
+        bulk_result = PurchaseOrderBulkResultSerializer({
+            "created": created,
+            "updated": updated,
+            "errors": errors,
+        })
+        return Response(bulk_result.data)
+
+    @action(detail=False, methods=["post"])
+    def bulk_transition(self, request):
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {"non_field_errors": ["Expected a list of changes."]}
+            )
+
+        changes = {}
+        indexes = {}
+        errors = []
+        for index, data in enumerate(request.data):
+            serializer = PurchaseOrderTransitionSerializer(data=data)
+            if not serializer.is_valid():
+                errors.append({
+                    "index": index,
+                    "po_number": (
+                        data.get("po_number") if isinstance(data, dict)
+                        else None
+                    ),
+                    "errors": serializer.errors,
+                })
+                continue
+
+            change = dict(serializer.validated_data)
+            po_number = change.pop("po_number")
+            if po_number in changes:
+                errors.append({
+                    "index": index,
+                    "po_number": po_number,
+                    "errors": {
+                        "po_number": [
+                            "Duplicate purchase order number in request."
+                        ]
+                    },
+                })
+                continue
+
+            changes[po_number] = change
+            indexes[po_number] = index
+
+        purchase_orders = PurchaseOrder.objects.bulk_transition(changes)
+        missing_po_numbers = set(changes) - {
+            purchase_order.po_number for purchase_order in purchase_orders
+        }
+        errors.extend(
+            {
+                "index": indexes[po_number],
+                "po_number": po_number,
+                "errors": {"po_number": ["Purchase order not found."]},
+            }
+            for po_number in missing_po_numbers
+        )
+        errors.sort(key=lambda error: error["index"])
+
+        transition_result = PurchaseOrderTransitionResultSerializer({
+            "updated": len(purchase_orders),
+            "errors": errors,
+        })
+        return Response(transition_result.data)
+
+
+@response_cache_schema.schema()
+class ResponseCacheStatsView(APIView):
+    authentication_classes = [CustomTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(ResponseCacheStatsSerializer(
+            get_response_cache().stats(), many=True
+        ).data)
+
+
+@request_metrics_schema.schema()
+class RequestMetricsView(APIView):
+    authentication_classes = [CustomTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            get_request_metrics().render(),
+            content_type=PROMETHEUS_CONTENT_TYPE
+        )
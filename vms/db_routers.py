@@ -0,0 +1,178 @@
+import hashlib
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_routing = ContextVar("replica_routing", default=None)
+
+
+class ReplicaRouting:
+    '''
+        Routing state of the current request. Reads go to a replica only
+        while `use_replica` is set; it is cleared by the first write.
+        `read_from_replica` is set once a read went to a replica, so data
+        that may lag behind the primary is not cached.
+    '''
+    def __init__(self):
+        self.use_replica = False
+        self.read_from_replica = False
+
+
+def get_replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def get_pin_cache():
+    return caches[getattr(settings, "REPLICA_PIN_CACHE", "default")]
+
+
+def get_pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 10)
+
+
+class ReplicaRouter:
+    '''
+        Sends reads of the `REPLICA_APP_LABELS` models to a random alias in
+        `DATABASE_REPLICAS` during requests that ReplicaRoutingMiddleware
+        marked as replica reads. Everything else, including writes, reads
+        after a write, reads inside a transaction on the primary and
+        queries outside requests such as signal receivers run from
+        management commands, stays on the primary.
+    '''
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        replicas = get_replicas()
+        if (
+            routing is None
+            or not routing.use_replica
+            or not replicas
+            or model._meta.app_label not in getattr(
+                settings, "REPLICA_APP_LABELS", []
+            )
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        routing.read_from_replica = True
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.use_replica = False
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        '''
+            Replicas are copies of the primary made by
+            `python manage.py sync_replica`, so they are never migrated.
+        '''
+        if db in get_replicas():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    '''
+        Marks safe requests to the URL names in `REPLICA_READ_URL_NAMES` as
+        replica reads, and exposes the routing state as
+        `request.replica_routing`. A client that made an unsafe request is
+        kept on the primary for `REPLICA_PIN_SECONDS`, so it reads its own
+        writes while the replicas catch up. Browsers are pinned with a
+        cookie; API clients, which usually drop cookies, by their
+        Authorization header in the `REPLICA_PIN_CACHE` cache.
+    '''
+    sync_capable = True
+    async_capable = True
+
+    cookie_name = "vms_use_primary"
+    cache_key = "vms:use_primary:{}"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request.replica_routing = ReplicaRouting()
+        token = _routing.set(request.replica_routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if self.pins_primary(request):
+            key = self.get_pin_key(request)
+            if key is not None:
+                get_pin_cache().set(key, True, get_pin_seconds())
+            self.set_pin_cookie(response)
+        return response
+
+    async def __acall__(self, request):
+        request.replica_routing = ReplicaRouting()
+        token = _routing.set(request.replica_routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if self.pins_primary(request):
+            key = self.get_pin_key(request)
+            if key is not None:
+                await get_pin_cache().aset(key, True, get_pin_seconds())
+            self.set_pin_cookie(response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        routing = _routing.get()
+        if routing is not None:
+            routing.use_replica = (
+                request.method in SAFE_METHODS
+                and self.cookie_name not in request.COOKIES
+                and request.resolver_match.url_name in getattr(
+                    settings, "REPLICA_READ_URL_NAMES", []
+                )
+                and not self.is_pinned(request)
+            )
+
+    def pins_primary(self, request):
+        return request.method not in SAFE_METHODS and bool(get_replicas())
+
+    def get_pin_key(self, request):
+        '''
+            Cache key pinning the client sending the Authorization header
+            of `request`, or None if it sent none. The header is hashed so
+            the token is not stored.
+        '''
+        authorization = request.headers.get("Authorization")
+        if not authorization:
+            return None
+        return self.cache_key.format(
+            hashlib.sha256(authorization.encode()).hexdigest()
+        )
+
+    def is_pinned(self, request):
+        key = self.get_pin_key(request)
+        return key is not None and bool(get_pin_cache().get(key))
+
+    def set_pin_cookie(self, response):
+        response.set_cookie(
+            self.cookie_name,
+            "1",
+            max_age=get_pin_seconds(),
+            httponly=True,
+            samesite="Lax",
+        )
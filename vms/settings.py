@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,7 +45,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "vendor_pulse.instrumentation.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "vms.db_routers.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -84,6 +87,77 @@ DATABASES = {
     }
 }
 
+# Set VMS_DATABASE_PROFILE=production to run SQLite with a write-ahead log,
+# so readers are not blocked by a writer, transactions that take the write
+# lock up front and wait for it, and connections reused across requests.
+# `python manage.py stress_sqlite` compares it with the default profile.
+DATABASE_PROFILE = os.environ.get("VMS_DATABASE_PROFILE", "development")
+
+SQLITE_PRODUCTION_OPTIONS = {
+    "pragmas": {
+        "journal_mode": "wal",
+        # Durable across application crashes; the last transactions may be
+        # lost on power failure, which WAL keeps consistent.
+        "synchronous": "normal",
+        "mmap_size": 256 * 1024 * 1024,
+        # Negative values are in KiB: a 64 MiB page cache per connection.
+        "cache_size": -64 * 1024,
+        # Milliseconds a connection waits for a lock before failing.
+        "busy_timeout": 5000,
+    },
+    "transaction_mode": "IMMEDIATE",
+}
+
+if DATABASE_PROFILE == "production":
+    DATABASES["default"].update({
+        "ENGINE": "vms.sqlite3",
+        "OPTIONS": SQLITE_PRODUCTION_OPTIONS,
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+    })
+
+# Read replicas: safe requests to the URL names in REPLICA_READ_URL_NAMES
+# read the REPLICA_APP_LABELS models from a random alias in
+# DATABASE_REPLICAS. Writes, reads after a write in the same request, and
+# requests from clients that wrote in the last REPLICA_PIN_SECONDS stay on
+# the primary. Set VMS_DATABASE_REPLICA=1 to add a local SQLite replica,
+# refreshed from the primary with `python manage.py sync_replica`.
+DATABASE_ROUTERS = ["vms.db_routers.ReplicaRouter"]
+
+DATABASE_REPLICAS = []
+
+if os.environ.get("VMS_DATABASE_REPLICA") == "1":
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": BASE_DIR / "db.replica.sqlite3",
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS = ["replica"]
+
+REPLICA_APP_LABELS = ["vendor_pulse"]
+
+REPLICA_READ_URL_NAMES = [
+    "vendor-list",
+    "vendor-detail",
+    "vendor-performance",
+    "vendor-performance-history",
+    "vendor-performance-history-export",
+    "vendor-ranking",
+    "purchaseorder-list",
+    "purchaseorder-detail",
+    "purchaseorder-export",
+    "async-vendor-list",
+    "async-vendor-detail",
+    "async-vendor-performance",
+    "async-purchaseorder-list",
+    "async-purchaseorder-detail",
+]
+
+REPLICA_PIN_SECONDS = 10
+# API clients are pinned by their Authorization header in this cache. Use a
+# cache shared by every process, as for the response cache.
+REPLICA_PIN_CACHE = "default"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -130,6 +204,61 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+VENDOR_PULSE = {
+    # "sync" recalculates vendor metrics in the request that changed a
+    # purchase order, "deferred" queues them for
+    # `python manage.py process_vendor_metrics`.
+    "METRICS_MODE": "sync",
+    "METRICS_DEBOUNCE_SECONDS": 5,
+    # A vendor marked continuously is still recalculated once its job is
+    # this many seconds old.
+    "METRICS_MAX_DELAY_SECONDS": 60,
+    # Rows per INSERT/UPDATE statement for the bulk purchase order actions.
+    "BULK_BATCH_SIZE": 500,
+    # Rows fetched from the database, and written to the client, at a time
+    # by the CSV/NDJSON export actions.
+    "EXPORT_CHUNK_SIZE": 2000,
+    # Serve the vendor and purchase order list/retrieve and vendor
+    # performance endpoints from `.values()` rows instead of serializing
+    # model instances, rendered with orjson when it is installed.
+    # `python manage.py benchmark_serializers` compares both paths.
+    "FAST_READ_SERIALIZERS": False,
+    # Seconds the vendor performance endpoint serves metrics from the cache.
+    "PERFORMANCE_CACHE_TIMEOUT": 30,
+    # Vendor and purchase order retrieves are cached for
+    # RESPONSE_CACHE_TIMEOUT seconds. The local memory backend is per
+    # process; use "vendor_pulse.cache.DjangoCacheBackend" with a shared
+    # cache in RESPONSE_CACHE_ALIAS when running several processes.
+    "RESPONSE_CACHE_BACKEND": "vendor_pulse.cache.LocalMemoryBackend",
+    "RESPONSE_CACHE_ALIAS": "default",
+    "RESPONSE_CACHE_TIMEOUT": 300,
+    "RESPONSE_CACHE_MAX_ENTRIES": 10000,
+    # Authenticated tokens are cached in process memory for
+    # TOKEN_CACHE_TIMEOUT seconds. Deleting a token or deactivating a user
+    # clears it in the process that made the change; other processes pick
+    # it up when the entry expires.
+    "TOKEN_CACHE_TIMEOUT": 60,
+    "TOKEN_CACHE_MAX_ENTRIES": 1000,
+    # `python manage.py compact_performance_history` keeps raw performance
+    # snapshots for this many days, then daily roll-ups until they are
+    # HISTORY_DAILY_RETENTION_DAYS old, then weekly roll-ups.
+    "HISTORY_RAW_RETENTION_DAYS": 30,
+    "HISTORY_DAILY_RETENTION_DAYS": 180,
+    # RequestMetricsMiddleware adds the SQL and total time of each request
+    # in a `Server-Timing` header, and records them by view in the
+    # histograms served at /api/metrics/ with these bucket bounds.
+    "SERVER_TIMING_HEADER": True,
+    "REQUEST_METRICS_DURATION_BUCKETS": (
+        .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10
+    ),
+    "REQUEST_METRICS_QUERY_BUCKETS": (1, 2, 5, 10, 20, 50, 100),
+    # Count the calls, time, queries and snapshots of the metric signal
+    # receivers and Vendor calculate/update methods, served at
+    # /api/metrics/. `python manage.py profile_hot_paths` measures them for
+    # a fixed set of purchase order edits.
+    "HOT_PATH_PROFILING": False,
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Vendor Management System",
     "DESCRIPTION": "APIs for Vendor Management System. <br><br> This APIs is used to manage vendors, purchase orders, and vendor performance metrics.",